@@ -0,0 +1,140 @@
+"""Benchmark the memory used per node of the book model.
+
+The slot-based model in ``src.models.book`` is compared with a replica of
+the previous dict-based classes. Both trees are checked to serialize to the
+same ``to_dict`` output.
+
+Usage:
+    python benchmarks/bench_book_memory.py [--chapters N] [--sections N]
+"""
+
+import argparse
+import sys
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.models.book import Book  # noqa: E402
+
+SECTION_TITLES = ["Introduction", "Notes", "Summary", "Exercises", "Further reading"]
+
+
+class DictSection:
+    """Section with an instance dict and an eager metadata dict."""
+
+    def __init__(self, title: str, content: str = "") -> None:
+        self.title = title
+        self.content = content
+        self.metadata: Dict[str, Any] = {}
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert section to dictionary for serialization."""
+        return {"title": self.title, "content": self.content, "metadata": self.metadata}
+
+
+class DictChapter:
+    """Chapter with an instance dict and an eager metadata dict."""
+
+    def __init__(self, title: str, content: str = "") -> None:
+        self.title = title
+        self.content = content
+        self.sections: List[DictSection] = []
+        self.metadata: Dict[str, Any] = {}
+
+    def add_section(self, title: str, content: str = "") -> DictSection:
+        """Add a new section to the chapter."""
+        section = DictSection(title, content)
+        self.sections.append(section)
+        return section
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert chapter to dictionary for serialization."""
+        return {
+            "title": self.title,
+            "content": self.content,
+            "sections": [section.to_dict() for section in self.sections],
+            "metadata": self.metadata,
+        }
+
+
+class DictBook:
+    """Book with an instance dict and an eager metadata dict."""
+
+    def __init__(self, title: str, author: str) -> None:
+        self.title = title
+        self.author = author
+        self.chapters: List[DictChapter] = []
+        self.metadata: Dict[str, Any] = {}
+        self.description = ""
+
+    def add_chapter(self, title: str, content: str = "") -> DictChapter:
+        """Add a new chapter to the book."""
+        chapter = DictChapter(title, content)
+        self.chapters.append(chapter)
+        return chapter
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert book to dictionary for serialization."""
+        return {
+            "title": self.title,
+            "author": self.author,
+            "description": self.description,
+            "chapters": [chapter.to_dict() for chapter in self.chapters],
+            "metadata": self.metadata,
+        }
+
+
+def build(factory: Callable[[str, str], Any], chapters: int, sections: int) -> Any:
+    """Build an anthology with the given model class.
+
+    Titles are built at runtime, as they would be when loaded from disk, so
+    that only interning can make repeated titles share memory.
+    """
+    book = factory("Anthology", "Various")
+    for i in range(chapters):
+        chapter = book.add_chapter(f"Chapter {i + 1}", "")
+        for j in range(sections):
+            title = "".join(SECTION_TITLES[j % len(SECTION_TITLES)])
+            chapter.add_section(title, "")
+    return book
+
+
+def measure(factory: Callable[[str, str], Any], chapters: int, sections: int) -> Any:
+    """Measure the memory allocated for a book.
+
+    Returns:
+        Tuple of the book and the bytes allocated while building it
+    """
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    book = build(factory, chapters, sections)
+    allocated = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return book, allocated
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--chapters", type=int, default=200)
+    parser.add_argument("--sections", type=int, default=100)
+    args = parser.parse_args()
+
+    nodes = 1 + args.chapters * (1 + args.sections)
+    dict_book, dict_bytes = measure(DictBook, args.chapters, args.sections)
+    slot_book, slot_bytes = measure(Book, args.chapters, args.sections)
+    if dict_book.to_dict() != slot_book.to_dict():
+        raise SystemExit("to_dict output differs between the models")
+
+    print(f"{nodes} nodes")
+    print(f"{'model':>8} {'MiB':>8} {'bytes/node':>11}")
+    for name, allocated in (("dict", dict_bytes), ("slots", slot_bytes)):
+        print(f"{name:>8} {allocated / 2**20:>8.1f} {allocated / nodes:>11.0f}")
+    print(f"saved {(dict_bytes - slot_bytes) / nodes:.0f} bytes/node "
+          f"({1 - slot_bytes / dict_bytes:.0%}); to_dict output identical")
+
+
+if __name__ == "__main__":
+    main()
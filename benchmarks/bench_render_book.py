@@ -0,0 +1,62 @@
+"""Benchmark whole-book rendering across worker counts.
+
+Usage:
+    python benchmarks/bench_render_book.py [--chapters N] [--paragraphs N]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.book_editor.core.book_renderer import BookRenderer  # noqa: E402
+from src.book_editor.core.template import Template  # noqa: E402
+from src.models.book import Book  # noqa: E402
+
+PARAGRAPH = (
+    "It was a *bright* cold day in April, and the clocks were striking "
+    "thirteen. Winston Smith, his chin nuzzled into his breast in an effort "
+    "to escape the **vile wind**, slipped quickly through the glass doors.\n\n"
+)
+
+
+def build_book(chapters: int, paragraphs: int) -> Book:
+    """Build a synthetic book for benchmarking."""
+    book = Book("Benchmark", "Bench")
+    for i in range(chapters):
+        chapter = book.add_chapter(f"Chapter {i + 1}", PARAGRAPH * paragraphs)
+        chapter.add_section("Notes", "- one\n- two\n- three\n")
+    return book
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--chapters", type=int, default=400)
+    parser.add_argument("--paragraphs", type=int, default=60)
+    args = parser.parse_args()
+
+    book = build_book(args.chapters, args.paragraphs)
+    template = Template("Benchmark", "general")
+    cpu_count = os.cpu_count() or 1
+    workers = sorted({1, 2, 4, 8, cpu_count} & set(range(1, cpu_count + 1)))
+
+    print(f"{args.chapters} chapters, {cpu_count} CPUs")
+    print(f"{'workers':>8} {'seconds':>10} {'speedup':>8}")
+    baseline = None
+    with tempfile.TemporaryDirectory() as tmp:
+        for count in workers:
+            renderer = BookRenderer(template, max_workers=count)
+            start = time.perf_counter()
+            renderer.render_to_file(book, Path(tmp) / "book.html")
+            elapsed = time.perf_counter() - start
+            baseline = baseline or elapsed
+            print(f"{count:>8} {elapsed:>10.3f} {baseline / elapsed:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Profile the import time of the application entry points.
+
+Each module is imported in a fresh interpreter with ``-X importtime`` and the
+modules with the highest cumulative import cost are reported.
+
+Usage:
+    python benchmarks/profile_imports.py [MODULE ...] [--top N]
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import List, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+ENTRY_POINTS = ["book_editor.app.main", "streamlit_app", "serve_dashboard"]
+
+# "import time: <self us> | <cumulative us> | <indented module name>"
+IMPORTTIME_LINE = re.compile(r"import time:\s*(\d+)\s*\|\s*(\d+)\s*\|(\s*)(\S+)")
+
+
+def profile(module: str) -> Tuple[float, List[Tuple[int, int, int, str]]]:
+    """Import a module in a fresh interpreter.
+
+    Args:
+        module: Module to import
+
+    Returns:
+        Tuple of wall-clock seconds and (cumulative us, self us, depth, name)
+        for every imported module
+    """
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        [str(ROOT), str(ROOT / "src"), env.get("PYTHONPATH", "")]
+    )
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    elapsed = time.perf_counter() - start
+    if result.returncode != 0:
+        raise RuntimeError(f"Failed to import {module}:\n{result.stderr[-2000:]}")
+    rows = []
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            rows.append((int(cumulative_us), int(self_us), len(indent) // 2, name))
+    return elapsed, rows
+
+
+def main() -> None:
+    """Run the profiler."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("modules", nargs="*", default=ENTRY_POINTS)
+    parser.add_argument("--top", type=int, default=20)
+    args = parser.parse_args()
+
+    for module in args.modules:
+        elapsed, rows = profile(module)
+        print(f"{module}: {elapsed:.3f}s wall, {len(rows)} modules imported")
+        print(f"{'cumulative ms':>14} {'self ms':>8}  module")
+        for cumulative_us, self_us, _, name in sorted(rows, reverse=True)[:args.top]:
+            print(f"{cumulative_us / 1000:>14.1f} {self_us / 1000:>8.1f}  {name}")
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -2,12 +2,15 @@
 
 import json
 import time
-from typing import Dict, Any, Optional
+from typing import TYPE_CHECKING, Dict, Any, Optional
 from datetime import datetime
 import streamlit as st
-import plotly.graph_objects as go
 from dashboard.config import DASHBOARD_CONFIG
 
+if TYPE_CHECKING:
+    # plotly is heavy; the chart builders import it on first use
+    import plotly.graph_objects as go
+
 
 # Configure Streamlit page
 st.set_page_config(
@@ -58,8 +61,10 @@ def create_metric_card(title: str, value: str, delta: Optional[str] = None):
         """, unsafe_allow_html=True)
 
 
-def create_test_coverage_chart(status: Dict[str, Any]) -> go.Figure:
+def create_test_coverage_chart(status: Dict[str, Any]) -> "go.Figure":
     """Create test coverage chart."""
+    import plotly.graph_objects as go  # pylint: disable=import-outside-toplevel
+
     if not status:
         return go.Figure()
 
@@ -88,8 +93,10 @@ def create_test_coverage_chart(status: Dict[str, Any]) -> go.Figure:
     return fig
 
 
-def create_system_metrics_chart(metrics: Dict[str, Any]) -> go.Figure:
+def create_system_metrics_chart(metrics: Dict[str, Any]) -> "go.Figure":
     """Create system metrics chart."""
+    import plotly.graph_objects as go  # pylint: disable=import-outside-toplevel
+
     if not metrics:
         return go.Figure()
 
@@ -14,7 +14,7 @@ setup(
         "psutil>=5.9.0",
         "requests>=2.31.0",
         "coverage>=7.4.0",
-        "streamlit>=1.31.0",
+        "streamlit>=1.37.0",
         "markdown>=3.5.0",  # Required by template.py
     ],
     python_requires=">=3.8",
@@ -34,10 +34,14 @@ EDITOR_CONFIG: Dict[str, Union[int, float, str]] = {
 }
 
 # Preview configuration
-PREVIEW_CONFIG: Dict[str, str] = {
+PREVIEW_CONFIG: Dict[str, Union[int, str]] = {
     "width": "100%",
     "height": "600px",
-    "css_theme": "github"
+    "css_theme": "github",
+    # Texts longer than this many characters are previewed page by page
+    "virtualize_threshold": 20000,
+    "page_blocks": 40,
+    "page_margin": 2
 }
 
 # Logging configuration
@@ -0,0 +1,312 @@
+"""Autosave service module.
+
+Document snapshots are handed to a background worker that coalesces them
+per document and writes only the newest one on a schedule, so saving never
+blocks the editor. When writes are slow the worker spaces saves further
+apart instead of queueing more of them. A snapshot whose write fails stays
+pending and is retried with a growing delay, unless a newer snapshot of the
+document replaces it first. Pending snapshots are flushed when the service
+is closed and when the interpreter exits.
+"""
+
+import atexit
+import logging
+import threading
+import time
+import weakref
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, Optional, Union
+
+from src.book_editor.core.revision_store import RevisionStore
+from src.book_editor.core.utils import write_json_atomic
+
+# Seconds between saves of the same document
+DEFAULT_INTERVAL = 60.0
+# A slow save delays the next one by this multiple of its duration
+DEFAULT_SLOWDOWN = 4.0
+# Seconds before the first retry of a failed save; each failure doubles it
+DEFAULT_RETRY_DELAY = 1.0
+# Longest wait in seconds before retrying a failed save
+MAX_RETRY_DELAY = 300.0
+
+_services: "weakref.WeakSet[AutoSaveService]" = weakref.WeakSet()
+
+
+def save_snapshot(
+    path: Union[str, Path], store: Optional[RevisionStore], snapshot: Dict[str, Any]
+) -> None:
+    """Save a document snapshot and record it as a revision.
+
+    Does what ``Editor.save_document`` does, but only reads the snapshot
+    taken with ``Document.to_dict``, so it can run on the autosave worker
+    while the document is being edited.
+
+    Args:
+        path: Path of the document file
+        store: Revision store of the document, or None to skip revisions
+        snapshot: Document snapshot
+
+    Raises:
+        OSError: If the document or the revision cannot be written
+    """
+    write_json_atomic(path, snapshot)
+    if store is None:
+        return
+    content = snapshot["content"]
+    if len(store) and store.content(-1) == content:
+        return
+    metadata = snapshot["metadata"]
+    store.append(
+        content,
+        metadata["version"],
+        metadata["author"],
+        datetime.fromisoformat(metadata["updated_at"]),
+    )
+
+
+class _Slot:
+    """Autosave state of a single document."""
+
+    __slots__ = (
+        "snapshot", "writer", "pending", "saving", "failures", "flushed",
+        "last_attempt", "last_duration", "last_saved", "error",
+    )
+
+    def __init__(self) -> None:
+        self.snapshot: Any = None
+        self.writer: Optional[Callable[[Any], None]] = None
+        self.pending = False
+        self.saving = False
+        # Failed writes since the last successful one
+        self.failures = 0
+        # Flush round in which the current snapshot was last attempted
+        self.flushed = 0
+        self.last_attempt = 0.0
+        self.last_duration = 0.0
+        self.last_saved: Optional[float] = None
+        self.error: Optional[str] = None
+
+
+class AutoSaveService:
+    """Background worker that coalesces and writes document snapshots."""
+
+    def __init__(
+        self,
+        interval: float = DEFAULT_INTERVAL,
+        slowdown: float = DEFAULT_SLOWDOWN,
+        retry_delay: float = DEFAULT_RETRY_DELAY,
+    ):
+        """Initialize autosave service.
+
+        Args:
+            interval: Minimum seconds between saves of the same document
+            slowdown: Multiple of the last save duration to wait before the
+                next save of the same document
+            retry_delay: Seconds before the first retry of a failed save
+
+        Raises:
+            ValueError: If interval, slowdown or retry_delay is negative
+        """
+        if interval < 0:
+            raise ValueError("interval cannot be negative")
+        if slowdown < 0:
+            raise ValueError("slowdown cannot be negative")
+        if retry_delay < 0:
+            raise ValueError("retry_delay cannot be negative")
+        self.interval = interval
+        self.slowdown = slowdown
+        self.retry_delay = retry_delay
+        self._condition = threading.Condition()
+        self._slots: Dict[Hashable, _Slot] = {}
+        self._flushing = False
+        # Incremented by each flush; a flush attempts every pending snapshot
+        # once, then waits for failed ones only until their retry is due
+        self._flush_round = 0
+        self._closed = False
+        self._worker = threading.Thread(
+            target=self._run, name="autosave", daemon=True
+        )
+        self._worker.start()
+        _services.add(self)
+
+    def submit(
+        self, key: Hashable, snapshot: Any, writer: Callable[[Any], None]
+    ) -> None:
+        """Queue the newest snapshot of a document.
+
+        Replaces any snapshot of the same document that has not been written
+        yet. Never blocks on disk.
+
+        Args:
+            key: Document key
+            snapshot: Snapshot to write. It must not be modified afterwards.
+            writer: Callable that writes the snapshot
+
+        Raises:
+            RuntimeError: If the service has been closed
+        """
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("Autosave service is closed")
+            slot = self._slots.get(key)
+            if slot is None:
+                slot = self._slots[key] = _Slot()
+            if not slot.pending and not slot.saving and slot.last_saved is None:
+                # First change of a document: start its interval now
+                slot.last_attempt = time.monotonic()
+            slot.snapshot = snapshot
+            slot.writer = writer
+            slot.pending = True
+            slot.flushed = 0
+            self._condition.notify_all()
+
+    def status(self, key: Hashable) -> Dict[str, Any]:
+        """Get the autosave status of a document without waiting for saves.
+
+        Args:
+            key: Document key
+
+        Returns:
+            Dictionary with the wall-clock time of the last successful save
+            (or None), whether a snapshot is pending or being written, and
+            the last error message (or None)
+        """
+        with self._condition:
+            slot = self._slots.get(key)
+            if slot is None:
+                return {"last_saved": None, "pending": False, "saving": False, "error": None}
+            return {
+                "last_saved": slot.last_saved,
+                "pending": slot.pending,
+                "saving": slot.saving,
+                "error": slot.error,
+            }
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Write all pending snapshots now and wait for them.
+
+        Each pending snapshot is attempted once; one whose write fails is not
+        retried before its retry delay has passed.
+
+        Args:
+            timeout: Maximum number of seconds to wait
+
+        Returns:
+            True if every snapshot was written, False if any write failed or
+            is still pending
+        """
+        with self._condition:
+            self._flush_round += 1
+            self._flushing = True
+            self._condition.notify_all()
+            self._condition.wait_for(self._flushed, timeout)
+            self._flushing = False
+            return self._idle()
+
+    def close(self, timeout: Optional[float] = None) -> bool:
+        """Flush pending snapshots and stop the worker.
+
+        Args:
+            timeout: Maximum number of seconds to wait for the flush
+
+        Returns:
+            True if all snapshots were written, False if any write failed or
+            is still pending
+        """
+        with self._condition:
+            if self._closed:
+                return self._idle()
+        done = self.flush(timeout)
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        if threading.current_thread() is not self._worker:
+            self._worker.join(timeout)
+        return done
+
+    def _idle(self) -> bool:
+        """Check that every snapshot was written without error."""
+        return not any(
+            slot.pending or slot.saving or slot.error is not None
+            for slot in self._slots.values()
+        )
+
+    def _flushed(self) -> bool:
+        """Check that the current flush has attempted every pending snapshot."""
+        return not any(
+            slot.saving or (slot.pending and slot.flushed < self._flush_round)
+            for slot in self._slots.values()
+        )
+
+    def _due(self, slot: _Slot) -> float:
+        """Get the monotonic time at which a document may be saved next."""
+        if slot.failures:
+            delay = self.retry_delay * 2 ** (slot.failures - 1)
+            return slot.last_attempt + min(delay, MAX_RETRY_DELAY)
+        delay = max(self.interval, self.slowdown * slot.last_duration)
+        return slot.last_attempt + delay
+
+    def _forced(self, slot: _Slot) -> bool:
+        """Check whether a flush wants a slot written now."""
+        return self._flushing and slot.flushed < self._flush_round
+
+    def _next_slot(self) -> Optional[_Slot]:
+        """Wait for a document that is due to be saved.
+
+        Returns:
+            Slot to save, or None if the service was closed
+        """
+        with self._condition:
+            while not self._closed:
+                now = time.monotonic()
+                pending = [s for s in self._slots.values() if s.pending and not s.saving]
+                due = [s for s in pending if self._forced(s) or self._due(s) <= now]
+                if due:
+                    slot = min(due, key=self._due)
+                    slot.pending = False
+                    slot.saving = True
+                    slot.flushed = self._flush_round
+                    slot.last_attempt = now
+                    return slot
+                timeout = min((self._due(s) for s in pending), default=now + 3600) - now
+                self._condition.wait(max(timeout, 0.001))
+            return None
+
+    def _run(self) -> None:
+        """Write due snapshots until the service is closed."""
+        while True:
+            slot = self._next_slot()
+            if slot is None:
+                return
+            snapshot, writer = slot.snapshot, slot.writer
+            start = time.monotonic()
+            error = None
+            try:
+                if writer is not None:
+                    writer(snapshot)
+            except Exception as e:  # pylint: disable=broad-except
+                logging.error(f"Autosave failed: {str(e)}")
+                error = str(e)
+            with self._condition:
+                slot.saving = False
+                slot.last_duration = time.monotonic() - start
+                slot.error = error
+                if error is None:
+                    slot.failures = 0
+                    slot.last_saved = time.time()
+                    if slot.snapshot is snapshot:
+                        slot.snapshot = None
+                else:
+                    # Keep the snapshot, or the newer one that replaced it,
+                    # pending so that the edit is not lost
+                    slot.failures += 1
+                    slot.pending = True
+                self._condition.notify_all()
+
+
+@atexit.register
+def _flush_all() -> None:
+    """Flush every open autosave service before the interpreter exits."""
+    for service in list(_services):
+        service.close(timeout=10)
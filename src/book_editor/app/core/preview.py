@@ -1,17 +1,80 @@
 """Preview manager module."""
 
-from typing import Optional
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Iterable, List, Optional, Tuple
 
+from src.book_editor.app.core.preview_diff import (
+    Fragment,
+    FrameDiff,
+    diff_frames,
+    fragment_keys,
+)
+from src.book_editor.app.core.resources import RenderCache
+from src.book_editor.app.core.viewport import group_blocks, reference_definitions
 from src.book_editor.core.document import Document
 from src.book_editor.core.template import Template
 
+# Seconds to wait after the last edit before rendering a preview
+DEFAULT_DEBOUNCE = 0.2
+# Recent frames kept to compute diffs against
+FRAME_HISTORY = 8
+
 
 class PreviewManager:
-    """Manages document preview generation."""
+    """Manages document preview generation.
+
+    Besides the synchronous ``get_preview``, previews can be rendered on a
+    background worker: ``request_preview`` records the newest content and
+    returns immediately, the worker renders once edits have been quiet for
+    the debounce interval, and ``latest_preview`` returns the newest finished
+    HTML without blocking. Renders that were overtaken by a newer request
+    are dropped instead of being published.
+
+    In block mode the worker renders each block of the content separately
+    and publishes a frame of keyed fragments. ``diff_since`` then returns
+    only the fragments that changed since a frame the client already shows,
+    or a full refresh if that frame is no longer known.
+
+    Unstyled preview managers show the template's plain HTML conversion,
+    without its borders and page style.
+    """
+
+    def __init__(
+        self,
+        debounce: float = DEFAULT_DEBOUNCE,
+        render_cache: Optional[RenderCache] = None,
+        block_mode: bool = False,
+        styled: bool = True,
+    ):
+        """Initialize preview manager.
 
-    def __init__(self):
-        """Initialize preview manager."""
+        Args:
+            debounce: Seconds to wait after the last request before rendering
+            render_cache: Optional cache of rendered previews, which may be
+                shared with other preview managers
+            block_mode: Whether background renders produce keyed fragments
+            styled: Whether to apply the template borders and styles
+        """
         self._current_template: Optional[Template] = None
+        self.debounce = debounce
+        self.render_cache = render_cache
+        self._condition = threading.Condition()
+        self._worker: Optional[threading.Thread] = None
+        self._closed = False
+        self._generation = 0
+        self._requested_at = 0.0
+        self._pending: Optional[Tuple[int, str, Optional[Template]]] = None
+        # Content and template of the newest request
+        self._requested: Optional[Tuple[str, Optional[Template]]] = None
+        self._latest: Optional[str] = None
+        self._latest_generation = 0
+        self.block_mode = block_mode
+        self.styled = styled
+        # Generation -> frame, oldest first
+        self._frames: "OrderedDict[int, Tuple[Fragment, ...]]" = OrderedDict()
 
     def set_template(self, template: Optional[Template]) -> None:
         """Set the current template.
@@ -34,7 +97,273 @@ class PreviewManager:
             return ""
 
         content = document.content or ""
-        if not self._current_template:
+        return self._render_cached(content, self._current_template)
+
+    @staticmethod
+    def _render(content: str, template: Optional[Template]) -> str:
+        """Render content with an optional template.
+
+        Args:
+            content: Content to render
+            template: Template to render with, or None for raw content
+
+        Returns:
+            Rendered preview
+        """
+        if not template:
             return content
+        return template.render(content)
+
+    def _render_cached(self, content: str, template: Optional[Template]) -> str:
+        """Render content, reusing a cached render when available.
+
+        Args:
+            content: Content to render
+            template: Template to render with, or None for raw content
+
+        Returns:
+            Rendered preview
+        """
+        if self.render_cache is None or template is None:
+            return self._render_document(content, template)
+        # Kept apart from styled renders of the same text
+        cache_key = template if self.styled else (template, "plain")
+        html = self.render_cache.get(cache_key, content)
+        if html is None:
+            html = self._render_document(content, template)
+            self.render_cache.put(cache_key, content, html)
+        return html
+
+    def _render_document(self, content: str, template: Optional[Template]) -> str:
+        """Render whole content, styled or not as configured.
+
+        Args:
+            content: Content to render
+            template: Template to render with, or None for raw content
+
+        Returns:
+            Rendered preview
+        """
+        if template is not None and not self.styled:
+            return template.convert(content)
+        return self._render(content, template)
+
+    def render_fragments(
+        self, content: str, template: Optional[Template] = None
+    ) -> List[Fragment]:
+        """Render content block by block.
+
+        Blocks are cached individually, so after an edit only the changed
+        blocks are rendered again. Blocks that Markdown reads together, such
+        as the items of a loose list, are rendered as one fragment, and the
+        link reference definitions of the content are converted with every
+        block that may use them. Fragments are not framed; see ``frame``.
+
+        Args:
+            content: Content to render
+            template: Template to render with, or None for raw content
+
+        Returns:
+            Keyed fragments in document order
+        """
+        sources = [content[b.start:b.end] for b in group_blocks(content)]
+        definitions = reference_definitions(content)
+        if definitions:
+            sources = [
+                f"{source}\n\n{definitions}" if "[" in source else source
+                for source in sources
+            ]
+        fragments = []
+        for key, source in zip(fragment_keys(sources), sources):
+            if template is None:
+                html = source
+            elif self.render_cache is None:
+                html = template.convert(source)
+            else:
+                # Kept apart from whole-document renders of the same text
+                cache_key = (template, "block")
+                html = self.render_cache.get(cache_key, source)
+                if html is None:
+                    html = template.convert(source)
+                    self.render_cache.put(cache_key, source, html)
+            fragments.append(Fragment(key, html))
+        return fragments
+
+    def frame(self, fragments: Iterable[Fragment], template: Optional[Template]) -> str:
+        """Join fragments into a whole preview.
+
+        Styled preview managers apply the template borders and page style
+        once, around all fragments.
+
+        Args:
+            fragments: Fragments in document order
+            template: Template the fragments were rendered with
+
+        Returns:
+            Rendered preview
+        """
+        html = "\n".join(fragment.html for fragment in fragments)
+        if template is None or not self.styled:
+            return html
+        return template.frame(html)
+
+    def latest_frame(self) -> Tuple[int, List[Fragment]]:
+        """Get the newest finished frame without blocking.
+
+        Returns:
+            Tuple of the frame generation and its fragments. The generation
+            is 0 if no frame has been rendered yet.
+        """
+        with self._condition:
+            if not self._frames:
+                return 0, []
+            generation = next(reversed(self._frames))
+            return generation, list(self._frames[generation])
+
+    def diff_since(self, base: int) -> FrameDiff:
+        """Get the changes from a frame the client shows to the newest frame.
+
+        Args:
+            base: Generation of the frame the client shows, or 0 for none
+
+        Returns:
+            Diff against the base frame, or a full refresh if the base frame
+            is unknown
+        """
+        with self._condition:
+            if not self._frames:
+                return FrameDiff(base, 0, True, (), ())
+            generation = next(reversed(self._frames))
+            latest = self._frames[generation]
+            old = self._frames.get(base)
+        if old is None:
+            return FrameDiff(base, generation, True, (), latest)
+        return FrameDiff(base, generation, False, tuple(diff_frames(old, latest)), ())
+
+    def request_preview(self, content: str) -> int:
+        """Queue content for background rendering.
+
+        Requesting the same content and template as the newest request again
+        does nothing, so a page that requests its preview on every run only
+        renders after an edit.
+
+        Args:
+            content: Content to render
+
+        Returns:
+            Generation number of the request
+
+        Raises:
+            RuntimeError: If the preview manager has been closed
+        """
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("Preview manager is closed")
+            if self._requested == (content, self._current_template):
+                return self._generation
+            self._requested = (content, self._current_template)
+            self._generation += 1
+            self._requested_at = time.monotonic()
+            self._pending = (self._generation, content, self._current_template)
+            self._ensure_worker()
+            self._condition.notify_all()
+            return self._generation
+
+    def latest_preview(self) -> Optional[str]:
+        """Get the newest finished preview without blocking.
+
+        Returns:
+            Rendered preview or None if nothing has been rendered yet
+        """
+        with self._condition:
+            return self._latest
+
+    def is_current(self) -> bool:
+        """Check whether the latest preview matches the newest request.
+
+        Returns:
+            True if no request is waiting to be rendered
+        """
+        with self._condition:
+            return self._latest_generation == self._generation
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Wait until the newest request has been rendered.
+
+        Args:
+            timeout: Maximum number of seconds to wait
+
+        Returns:
+            True if the latest preview is current
+        """
+        with self._condition:
+            return self._condition.wait_for(
+                lambda: self._latest_generation == self._generation or self._closed,
+                timeout,
+            ) and self._latest_generation == self._generation
+
+    def close(self) -> None:
+        """Stop the background worker."""
+        with self._condition:
+            self._closed = True
+            self._pending = None
+            self._condition.notify_all()
+            worker = self._worker
+        if worker is not None and worker is not threading.current_thread():
+            worker.join()
+
+    def _ensure_worker(self) -> None:
+        """Start the background worker if it is not running."""
+        if self._worker is None or not self._worker.is_alive():
+            self._worker = threading.Thread(
+                target=self._run, name="preview-renderer", daemon=True
+            )
+            self._worker.start()
+
+    def _next_request(self) -> Optional[Tuple[int, str, Optional[Template]]]:
+        """Wait for a request that has been quiet for the debounce interval.
+
+        Returns:
+            The request to render, or None if the manager was closed
+        """
+        with self._condition:
+            while not self._closed:
+                if self._pending is None:
+                    self._condition.wait()
+                    continue
+                remaining = self._requested_at + self.debounce - time.monotonic()
+                if remaining > 0:
+                    self._condition.wait(remaining)
+                    continue
+                request, self._pending = self._pending, None
+                return request
+            return None
 
-        return self._current_template.render(content)
+    def _run(self) -> None:
+        """Render queued previews until the manager is closed."""
+        while True:
+            request = self._next_request()
+            if request is None:
+                return
+            generation, content, template = request
+            frame: Tuple[Fragment, ...] = ()
+            try:
+                if self.block_mode:
+                    frame = tuple(self.render_fragments(content, template))
+                    html = self.frame(frame, template)
+                else:
+                    html = self._render_cached(content, template) if content else ""
+            except ValueError as e:
+                logging.error(f"Failed to render preview: {str(e)}")
+                html = ""
+            with self._condition:
+                # A newer request arrived while rendering; drop this result
+                if generation != self._generation:
+                    continue
+                self._latest = html
+                self._latest_generation = generation
+                if self.block_mode:
+                    self._frames[generation] = frame
+                    while len(self._frames) > FRAME_HISTORY:
+                        self._frames.popitem(last=False)
+                self._condition.notify_all()
@@ -0,0 +1,173 @@
+"""Preview diff module.
+
+A preview frame is the list of rendered blocks of a document. Each block is
+keyed by a hash of its source, so two frames can be compared by key and a
+client that already shows one frame only needs the blocks that were
+inserted, deleted or replaced to show the next one.
+
+Clients that can only redraw whole elements can group a frame into chunks
+with ``chunk_fragments``. Chunk boundaries depend on the keys of the blocks
+around them rather than on absolute positions, so an edit changes only the
+chunks near it and the others stay identical.
+"""
+
+import hashlib
+from difflib import SequenceMatcher
+from typing import Dict, Iterable, List, NamedTuple, Sequence, Tuple
+
+# Characters of HTML after which a chunk may end
+DEFAULT_CHUNK_SIZE = 12_000
+# Characters of HTML after which a chunk always ends
+DEFAULT_MAX_CHUNK_SIZE = 48_000
+# About one in this many fragments can end a chunk
+CHUNK_SPREAD = 4
+
+
+class Fragment(NamedTuple):
+    """Rendered block of a preview frame."""
+
+    key: str
+    html: str
+
+
+class Change(NamedTuple):
+    """Replacement of ``frame[start:end]`` by new fragments.
+
+    Attributes:
+        op: "insert", "delete" or "replace"
+        start: Index of the first replaced fragment in the old frame
+        end: Index after the last replaced fragment in the old frame
+        fragments: Fragments to put in their place
+    """
+
+    op: str
+    start: int
+    end: int
+    fragments: Tuple[Fragment, ...]
+
+
+class FrameDiff(NamedTuple):
+    """Changes between two preview frames.
+
+    Attributes:
+        base: Generation of the frame the changes apply to
+        generation: Generation of the new frame
+        full: Whether this is a full refresh instead of a diff
+        changes: Changes to apply to the base frame
+        fragments: Whole new frame for a full refresh, empty otherwise
+    """
+
+    base: int
+    generation: int
+    full: bool
+    changes: Tuple[Change, ...]
+    fragments: Tuple[Fragment, ...]
+
+
+def fragment_keys(sources: Iterable[str]) -> List[str]:
+    """Compute stable keys for block sources.
+
+    Identical blocks get the same hash and are told apart by the number of
+    earlier blocks with that hash.
+
+    Args:
+        sources: Block sources in document order
+
+    Returns:
+        Key of each block
+    """
+    seen: Dict[str, int] = {}
+    keys = []
+    for source in sources:
+        digest = hashlib.sha1(source.encode("utf-8")).hexdigest()[:16]
+        count = seen.get(digest, 0)
+        seen[digest] = count + 1
+        keys.append(f"{digest}-{count}")
+    return keys
+
+
+def diff_frames(old: Sequence[Fragment], new: Sequence[Fragment]) -> List[Change]:
+    """Compute the changes that turn one frame into another.
+
+    Args:
+        old: Frame shown by the client
+        new: New frame
+
+    Returns:
+        Changes in order of increasing position
+    """
+    matcher = SequenceMatcher(
+        None, [f.key for f in old], [f.key for f in new], autojunk=False
+    )
+    return [
+        Change(tag, i1, i2, tuple(new[j1:j2]))
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes()
+        if tag != "equal"
+    ]
+
+
+def apply_changes(frame: Sequence[Fragment], changes: Iterable[Change]) -> List[Fragment]:
+    """Apply changes computed by ``diff_frames``.
+
+    Args:
+        frame: Frame the changes were computed against
+        changes: Changes to apply
+
+    Returns:
+        New frame
+    """
+    result = list(frame)
+    # Apply from the end so earlier positions stay valid
+    for change in sorted(changes, key=lambda c: c.start, reverse=True):
+        result[change.start:change.end] = change.fragments
+    return result
+
+
+def apply_diff(frame: Sequence[Fragment], diff: FrameDiff) -> List[Fragment]:
+    """Update a frame with a diff or full refresh.
+
+    Args:
+        frame: Frame of generation ``diff.base``
+        diff: Diff to apply
+
+    Returns:
+        Frame of generation ``diff.generation``
+    """
+    if diff.full:
+        return list(diff.fragments)
+    return apply_changes(frame, diff.changes)
+
+
+def chunk_fragments(
+    fragments: Iterable[Fragment],
+    min_size: int = DEFAULT_CHUNK_SIZE,
+    max_size: int = DEFAULT_MAX_CHUNK_SIZE,
+) -> List[str]:
+    """Join a frame into chunks of HTML with content-defined boundaries.
+
+    A chunk ends after a fragment once it holds at least ``min_size``
+    characters and the fragment's key selects it as a boundary, or once it
+    holds ``max_size`` characters.
+
+    Args:
+        fragments: Frame to chunk
+        min_size: Characters after which a chunk may end
+        max_size: Characters after which a chunk always ends
+
+    Returns:
+        HTML of each chunk in document order
+    """
+    chunks: List[str] = []
+    parts: List[str] = []
+    size = 0
+    for fragment in fragments:
+        parts.append(fragment.html)
+        size += len(fragment.html)
+        if size >= max_size or (
+            size >= min_size and int(fragment.key[:4], 16) % CHUNK_SPREAD == 0
+        ):
+            chunks.append("\n".join(parts))
+            parts, size = [], 0
+    if parts:
+        chunks.append("\n".join(parts))
+    return chunks
@@ -0,0 +1,182 @@
+"""Shared resources module.
+
+Streamlit runs every browser session in the same process. Heavy read-only
+resources such as template catalogs and render caches are kept in a
+process-wide registry so that sessions share them instead of rebuilding
+them once per user. Resources are reference counted and closed when the
+last session releases them.
+"""
+
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+# Default memory limit of a render cache
+DEFAULT_CACHE_BYTES = 32 * 1024 * 1024
+
+
+class ResourceRegistry:
+    """Thread-safe, reference-counted registry of shared resources."""
+
+    def __init__(self) -> None:
+        """Initialize resource registry."""
+        self._lock = threading.Lock()
+        # Key -> [resource, reference count]
+        self._resources: Dict[Hashable, List[Any]] = {}
+
+    def acquire(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        """Get a shared resource, creating it on first use.
+
+        Args:
+            key: Resource key
+            factory: Callable that creates the resource
+
+        Returns:
+            Shared resource
+        """
+        with self._lock:
+            entry = self._resources.get(key)
+            if entry is None:
+                entry = self._resources[key] = [factory(), 0]
+            entry[1] += 1
+            return entry[0]
+
+    def release(self, key: Hashable) -> None:
+        """Release a shared resource.
+
+        The resource is dropped, and closed if it has a ``close`` method,
+        when its last user releases it.
+
+        Args:
+            key: Resource key
+        """
+        with self._lock:
+            entry = self._resources.get(key)
+            if entry is None:
+                return
+            entry[1] -= 1
+            if entry[1] > 0:
+                return
+            del self._resources[key]
+        close = getattr(entry[0], "close", None)
+        if callable(close):
+            close()
+
+    def refcount(self, key: Hashable) -> int:
+        """Get the number of users of a resource.
+
+        Args:
+            key: Resource key
+
+        Returns:
+            Reference count, 0 if the resource is not registered
+        """
+        with self._lock:
+            entry = self._resources.get(key)
+            return entry[1] if entry is not None else 0
+
+    def __contains__(self, key: Hashable) -> bool:
+        """Check whether a resource is registered."""
+        with self._lock:
+            return key in self._resources
+
+    def __len__(self) -> int:
+        """Get the number of registered resources."""
+        with self._lock:
+            return len(self._resources)
+
+
+class RenderCache:
+    """Thread-safe LRU cache of rendered previews.
+
+    Entries are keyed by template identity and content, so a template must
+    not be modified while renders made with it are cached. The cache is
+    bounded both by entry count and by the memory held by the cached source
+    and HTML strings; renders larger than the byte limit are not cached.
+    """
+
+    def __init__(self, max_entries: int = 256, max_bytes: int = DEFAULT_CACHE_BYTES):
+        """Initialize render cache.
+
+        Args:
+            max_entries: Maximum number of cached renders
+            max_bytes: Maximum memory held by cached strings, in bytes
+
+        Raises:
+            ValueError: If max_entries or max_bytes is not positive
+        """
+        if max_entries <= 0:
+            raise ValueError("max_entries must be positive")
+        if max_bytes <= 0:
+            raise ValueError("max_bytes must be positive")
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        # (template, content) -> (html, size in bytes)
+        self._entries: "OrderedDict[Tuple[Any, str], Tuple[str, int]]" = (
+            OrderedDict()
+        )
+        self._bytes = 0
+
+    def get(self, template: Any, content: str) -> Optional[str]:
+        """Get a cached render.
+
+        Args:
+            template: Template the content was rendered with
+            content: Rendered content
+
+        Returns:
+            Cached HTML or None if not cached
+        """
+        key = (template, content)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def put(self, template: Any, content: str, html: str) -> None:
+        """Store a render.
+
+        Args:
+            template: Template the content was rendered with
+            content: Rendered content
+            html: Rendered HTML
+        """
+        key = (template, content)
+        size = sys.getsizeof(content) + sys.getsizeof(html)
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            if size > self.max_bytes:
+                return
+            self._entries[key] = (html, size)
+            self._bytes += size
+            while (
+                len(self._entries) > self.max_entries or self._bytes > self.max_bytes
+            ):
+                self._bytes -= self._entries.popitem(last=False)[1][1]
+
+    @property
+    def nbytes(self) -> int:
+        """Get the memory held by cached strings, in bytes."""
+        with self._lock:
+            return self._bytes
+
+    def close(self) -> None:
+        """Drop all cached renders."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def __len__(self) -> int:
+        """Get the number of cached renders."""
+        with self._lock:
+            return len(self._entries)
+
+
+# Registry shared by all sessions in this process
+shared_resources = ResourceRegistry()
@@ -0,0 +1,262 @@
+"""Template upload module.
+
+Uploaded files are streamed in fixed-size chunks into a temporary file next
+to their destination. On the way through, each chunk is hashed and fed to an
+incremental text summary. A finished upload is moved into place atomically.
+An upload whose content matches an earlier upload reuses the stored file, so
+the same data is never written twice. Uploads never replace existing files
+or templates; a name that is taken gets a numbered suffix. Memory use per
+upload does not depend on the file size.
+"""
+
+import codecs
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import BinaryIO, Dict, NamedTuple, Optional, Union
+
+from src.book_editor.app.config.settings import MAX_FILE_SIZE
+from src.book_editor.core.template import Template
+from src.book_editor.core.utils import write_json_atomic
+
+# Bytes read from an upload at a time
+CHUNK_SIZE = 1024 * 1024
+# Maps content hashes to stored file names
+HASH_INDEX_NAME = ".upload_hashes"
+# Longest description taken from the first line of an upload
+MAX_DESCRIPTION = 200
+
+FORMATS = {".md": "markdown", ".markdown": "markdown", ".txt": "text", ".html": "html"}
+
+
+class UploadResult(NamedTuple):
+    """Outcome of an upload.
+
+    Attributes:
+        path: Stored file holding the upload content
+        digest: SHA-256 hex digest of the content
+        size: Size in bytes
+        duplicate: Whether the content was already stored
+        template: Template created for the upload
+    """
+
+    path: Path
+    digest: str
+    size: int
+    duplicate: bool
+    template: Template
+
+
+class TextSummary:
+    """Incremental summary of uploaded text."""
+
+    def __init__(self) -> None:
+        """Initialize text summary."""
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self.line_count = 0
+        self.word_count = 0
+        self.description = ""
+        self._line = ""
+        self._in_word = False
+
+    def feed(self, chunk: bytes, final: bool = False) -> None:
+        """Add a chunk of the upload.
+
+        Args:
+            chunk: Raw bytes
+            final: Whether this is the last chunk
+        """
+        text = self._decoder.decode(chunk, final)
+        if not text:
+            return
+        self.line_count += text.count("\n")
+        # Words split across chunks are only counted once
+        words = text.split()
+        self.word_count += len(words)
+        if words and self._in_word and not text[0].isspace():
+            self.word_count -= 1
+        self._in_word = not text[-1].isspace()
+        if not self.description:
+            self._take_description(text)
+
+    def close(self) -> None:
+        """Finish the summary after the last chunk."""
+        self.feed(b"", final=True)
+        if not self.description:
+            self.description = self._line.strip().lstrip("#").strip()[:MAX_DESCRIPTION]
+        self._line = ""
+
+    def _take_description(self, text: str) -> None:
+        """Use the first non-empty line as the description."""
+        for line in text.splitlines(keepends=True):
+            if line.endswith(("\n", "\r")):
+                complete = (self._line + line).strip().lstrip("#").strip()
+                self._line = ""
+                if complete:
+                    self.description = complete[:MAX_DESCRIPTION]
+                    return
+            else:
+                # Only a bounded prefix of an unfinished line is kept
+                self._line = (self._line + line)[:MAX_DESCRIPTION * 4]
+
+
+class TemplateUploader:
+    """Streams uploaded template files into a template directory."""
+
+    def __init__(
+        self,
+        template_dir: Union[str, Path],
+        chunk_size: int = CHUNK_SIZE,
+        max_size: int = MAX_FILE_SIZE,
+    ):
+        """Initialize template uploader.
+
+        Args:
+            template_dir: Directory to store uploads in
+            chunk_size: Bytes read from an upload at a time
+            max_size: Largest accepted upload in bytes
+
+        Raises:
+            ValueError: If chunk_size or max_size is not positive
+        """
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be positive")
+        if max_size <= 0:
+            raise ValueError("max_size must be positive")
+        self.template_dir = Path(template_dir)
+        self.template_dir.mkdir(parents=True, exist_ok=True)
+        self.chunk_size = chunk_size
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._index_path = self.template_dir / HASH_INDEX_NAME
+        self._hashes = self._load_index()
+
+    def ingest(
+        self, stream: BinaryIO, file_name: str, category: str = "general"
+    ) -> UploadResult:
+        """Store an upload and create its template.
+
+        Args:
+            stream: Binary stream of the upload
+            file_name: Original file name
+            category: Template category
+
+        Returns:
+            Upload result
+
+        Raises:
+            ValueError: If the file name or type is invalid or the upload is
+                too large
+            OSError: If the upload cannot be stored
+        """
+        name = Path(file_name).name
+        if not name or name.startswith("."):
+            raise ValueError(f"Invalid file name: {file_name}")
+        suffix = Path(name).suffix.lower()
+        if suffix not in FORMATS:
+            raise ValueError(f"Unsupported template file type: {suffix or name}")
+        if hasattr(stream, "seek"):
+            stream.seek(0)
+
+        digest = hashlib.sha256()
+        summary = TextSummary()
+        size = 0
+        fd, tmp_name = tempfile.mkstemp(prefix=".upload-", dir=self.template_dir)
+        tmp_path = Path(tmp_name)
+        try:
+            with os.fdopen(fd, "wb") as tmp:
+                while True:
+                    chunk = stream.read(self.chunk_size)
+                    if not chunk:
+                        break
+                    size += len(chunk)
+                    if size > self.max_size:
+                        raise ValueError(
+                            f"Upload exceeds the maximum size of {self.max_size} bytes"
+                        )
+                    digest.update(chunk)
+                    summary.feed(chunk)
+                    tmp.write(chunk)
+            summary.close()
+            hex_digest = digest.hexdigest()
+
+            with self._lock:
+                existing = self._stored_file(hex_digest)
+                # The same file uploaded again keeps its name and template
+                if existing is None or existing.name != name:
+                    name = self._free_name(name)
+                if existing is None:
+                    path = self.template_dir / name
+                    os.replace(tmp_path, path)
+                    self._hashes[hex_digest] = name
+                    self._save_index()
+                else:
+                    path = existing
+        finally:
+            if tmp_path.exists():
+                tmp_path.unlink()
+
+        template = Template(name.split(".")[0], category)
+        template.metadata["description"] = summary.description or "Uploaded template"
+        template.metadata["format"] = FORMATS[suffix]
+        template.metadata["source"] = path.name
+        template.metadata["sha256"] = hex_digest
+        template.metadata["size"] = size
+        template.metadata["line_count"] = summary.line_count
+        template.metadata["word_count"] = summary.word_count
+        return UploadResult(path, hex_digest, size, existing is not None, template)
+
+    def _free_name(self, name: str) -> str:
+        """Get a file name that does not replace a stored file or template.
+
+        Taken names get a numbered suffix on their first part, so that the
+        template named after the file is new as well: 'style.md' becomes
+        'style-2.md' if 'style.md' or the template 'style' exists.
+
+        Args:
+            name: Uploaded file name
+
+        Returns:
+            Free file name
+        """
+        base = name.split(".")[0]
+        rest = name[len(base):]
+        candidate = name
+        number = 1
+        while (self.template_dir / candidate).exists() or (
+            self.template_dir / f"{candidate.split('.')[0]}.json"
+        ).exists():
+            number += 1
+            candidate = f"{base}-{number}{rest}"
+        return candidate
+
+    def _stored_file(self, digest: str) -> Optional[Path]:
+        """Get the stored file with a content hash, if it still exists."""
+        name = self._hashes.get(digest)
+        if name is None:
+            return None
+        path = self.template_dir / name
+        if path.exists():
+            return path
+        del self._hashes[digest]
+        return None
+
+    def _load_index(self) -> Dict[str, str]:
+        """Load the content hash index."""
+        try:
+            with open(self._index_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return {str(k): str(v) for k, v in data.items()}
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError, AttributeError) as e:
+            logging.error(f"Failed to load upload index: {str(e)}")
+            return {}
+
+    def _save_index(self) -> None:
+        """Save the content hash index."""
+        write_json_atomic(self._index_path, self._hashes)
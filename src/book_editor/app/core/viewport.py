@@ -0,0 +1,289 @@
+"""Viewport module for virtualized previews.
+
+Long documents are split into blocks (paragraphs, headings and fenced code
+blocks separated by blank lines) and the blocks are grouped into pages that
+start at headings. Only the page around the editor position, plus a few
+blocks of margin on either side, is rendered, so the size of a preview is
+bounded by the page size instead of the length of the document.
+
+Blocks that Markdown reads as one structure, such as the items of a loose
+list, are kept together, and the link reference definitions of the whole
+document are added to every page so that reference links still resolve.
+"""
+
+import re
+from bisect import bisect_right
+from typing import List, NamedTuple, Optional, Tuple
+
+from src.book_editor.core.text_diff import make_delta
+
+# Maximum number of blocks per page
+DEFAULT_PAGE_BLOCKS = 40
+# Blocks of context rendered before and after a page
+DEFAULT_MARGIN = 2
+
+HEADING = re.compile(r" {0,3}(#{1,6})(?=\s|$)")
+FENCE = re.compile(r"^[ \t]*(```|~~~)", re.MULTILINE)
+# Matches end at the start of a line so that '^' anchors work after them
+LEADING_BLANK_LINES = re.compile(r"(?:[ \t]*\n)*")
+BLANK_LINES = re.compile(r"\n[ \t]*\n(?:[ \t]*\n)*")
+LIST_ITEM = re.compile(r" {0,3}(?:[*+-]|\d+[.)])(?:[ \t]|$)", re.MULTILINE)
+BLOCKQUOTE = re.compile(r" {0,3}>")
+INDENTED = re.compile(r" {4}|\t")
+REFERENCE_DEFINITION = re.compile(r"^ {0,3}\[[^\]\n]+\]:[ \t]*\S.*$", re.MULTILINE)
+
+
+class Block(NamedTuple):
+    """Block of a document.
+
+    Attributes:
+        start: Offset of the first character
+        end: Offset after the last character
+        level: Heading level, or 0 if the block is not a heading
+    """
+
+    start: int
+    end: int
+    level: int
+
+
+def _heading_level(text: str, start: int) -> int:
+    """Get the heading level of the block starting at an offset."""
+    match = HEADING.match(text, start)
+    return len(match.group(1)) if match else 0
+
+
+def index_blocks(text: str) -> List[Block]:
+    """Split text into blocks.
+
+    Blank lines inside fenced code blocks do not end a block, so a page
+    never cuts a code block in half.
+
+    Args:
+        text: Markdown text
+
+    Returns:
+        Blocks in document order
+    """
+    blocks: List[Block] = []
+    start = LEADING_BLANK_LINES.match(text).end()
+    in_fence = False
+    position = start
+    while start < len(text):
+        match = BLANK_LINES.search(text, position)
+        end = match.start() if match else len(text)
+        # An odd number of fence markers leaves a code block open
+        in_fence ^= len(FENCE.findall(text, position, end)) % 2 == 1
+        if in_fence and match:
+            position = match.end()
+            continue
+        blocks.append(Block(start, end, _heading_level(text, start)))
+        if not match:
+            break
+        start = position = match.end()
+        in_fence = False
+    return blocks
+
+
+def group_blocks(text: str, blocks: Optional[List[Block]] = None) -> List[Block]:
+    """Merge blocks that only render correctly together.
+
+    Markdown carries context across blank lines in a few places: the items
+    of a loose list form one list, consecutive quotes form one blockquote
+    and indented blocks continue the list item or code block before them.
+    Such runs of blocks are merged so that each group can be converted on
+    its own with the same result as converting the whole text.
+
+    Args:
+        text: Markdown text
+        blocks: Blocks of the text, as returned by ``index_blocks``. If None,
+            the text is indexed.
+
+    Returns:
+        Groups in document order, each spanning one or more blocks
+    """
+    if blocks is None:
+        blocks = index_blocks(text)
+    groups: List[Block] = []
+    for block in blocks:
+        if groups and (
+            INDENTED.match(text, block.start)
+            or any(
+                pattern.match(text, groups[-1].start)
+                and pattern.match(text, block.start)
+                for pattern in (LIST_ITEM, BLOCKQUOTE)
+            )
+        ):
+            groups[-1] = groups[-1]._replace(end=block.end)
+        else:
+            groups.append(block)
+    return groups
+
+
+def reference_definitions(text: str) -> str:
+    """Collect the link reference definitions of a text.
+
+    Args:
+        text: Markdown text
+
+    Returns:
+        Definition lines joined by newlines, empty if there are none
+    """
+    return "\n".join(REFERENCE_DEFINITION.findall(text))
+
+
+class ViewportIndex:
+    """Page index of a document for virtualized previews."""
+
+    def __init__(
+        self,
+        page_blocks: int = DEFAULT_PAGE_BLOCKS,
+        margin: int = DEFAULT_MARGIN,
+    ):
+        """Initialize viewport index.
+
+        Args:
+            page_blocks: Maximum number of blocks per page
+            margin: Blocks of context rendered before and after a page
+
+        Raises:
+            ValueError: If page_blocks is not positive or margin is negative
+        """
+        if page_blocks <= 0:
+            raise ValueError("page_blocks must be positive")
+        if margin < 0:
+            raise ValueError("margin cannot be negative")
+        self.page_blocks = page_blocks
+        self.margin = margin
+        self._text: Optional[str] = None
+        self._blocks: List[Block] = []
+        self._definitions = ""
+        # Index of the first block of each page
+        self._pages: List[int] = []
+        self._page_starts: List[int] = []
+        # Offset of the first character changed by the last update
+        self.edit_offset: Optional[int] = None
+
+    def update(self, text: str) -> bool:
+        """Index a new version of the text.
+
+        The offset of the first changed character is kept in ``edit_offset``
+        so that previews can follow the position being edited.
+
+        Args:
+            text: Markdown text
+
+        Returns:
+            True if the text changed
+        """
+        if text == self._text:
+            return False
+        previous, self._text = self._text, text
+        self.edit_offset = make_delta(previous, text)[0] if previous is not None else None
+        self._blocks = group_blocks(text)
+        self._definitions = reference_definitions(text)
+        self._pages = []
+        for number, block in enumerate(self._blocks):
+            if not self._pages:
+                self._pages.append(number)
+            elif block.level or number - self._pages[-1] >= self.page_blocks:
+                self._pages.append(number)
+        self._page_starts = [self._blocks[number].start for number in self._pages]
+        return True
+
+    @property
+    def blocks(self) -> List[Block]:
+        """Get the blocks of the indexed text, grouped by ``group_blocks``."""
+        return list(self._blocks)
+
+    @property
+    def page_count(self) -> int:
+        """Get the number of pages."""
+        return len(self._pages)
+
+    def page_of(self, offset: int) -> int:
+        """Get the page containing a character offset.
+
+        Args:
+            offset: Character offset in the text
+
+        Returns:
+            Page number, starting at 0
+        """
+        if not self._pages:
+            return 0
+        return max(bisect_right(self._page_starts, offset) - 1, 0)
+
+    def page_range(self, page: int) -> Tuple[int, int]:
+        """Get the character range rendered for a page.
+
+        Args:
+            page: Page number
+
+        Returns:
+            Tuple (start, end) of character offsets, including the margin
+
+        Raises:
+            IndexError: If the page does not exist
+        """
+        if not 0 <= page < len(self._pages):
+            raise IndexError(f"Page {page} does not exist")
+        first = self._pages[page]
+        last = self._pages[page + 1] if page + 1 < len(self._pages) else len(self._blocks)
+        first = max(first - self.margin, 0)
+        last = min(last + self.margin, len(self._blocks))
+        return self._blocks[first].start, self._blocks[last - 1].end
+
+    def page_text(self, page: int) -> str:
+        """Get the text rendered for a page.
+
+        Args:
+            page: Page number
+
+        Returns:
+            Markdown text of the page, including the margin and followed by
+            the link reference definitions of the whole text
+
+        Raises:
+            IndexError: If the page does not exist
+        """
+        start, end = self.page_range(page)
+        text = (self._text or "")[start:end]
+        if self._definitions:
+            text += "\n\n" + self._definitions
+        return text
+
+    def select_page(self, text: str, page: int) -> Tuple[str, int, int]:
+        """Index a text and get the page to preview.
+
+        The page moves to the last edit when the text changed, and is kept
+        within the pages of the text.
+
+        Args:
+            text: Markdown text
+            page: Page shown before
+
+        Returns:
+            Tuple of the text of the page, the page number and the page
+            count. A text without blocks, such as blank lines only, is
+            returned whole as a single page.
+        """
+        if self.update(text) and self.edit_offset is not None:
+            page = self.page_of(self.edit_offset)
+        if not self._pages:
+            return text, 0, 1
+        page = max(0, min(page, len(self._pages) - 1))
+        return self.page_text(page), page, len(self._pages)
+
+    def window(self, offset: int) -> str:
+        """Get the text rendered around a character offset.
+
+        Args:
+            offset: Character offset in the text
+
+        Returns:
+            Markdown text of the page containing the offset
+        """
+        if not self._pages:
+            return ""
+        return self.page_text(self.page_of(offset))
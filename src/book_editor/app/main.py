@@ -2,15 +2,26 @@
 
 This module provides the main Streamlit interface for the Book Editor,
 including the editor, template management, and preview functionality.
+The editor, template and preview stacks are imported when the first session
+is set up, after the page header has been sent to the browser.
 """
 
+import functools
+import logging
 import time
+import weakref
 from pathlib import Path
 
 import streamlit as st
 
-from book_editor.core.editor import Editor
-from book_editor.core.template import Template, TemplateManager
+from book_editor.app.config.settings import PREVIEW_CONFIG
+from book_editor.app.core.resources import shared_resources
+from book_editor.app.core.viewport import ViewportIndex
+
+# Revisions listed per page of the history panel
+HISTORY_PAGE_SIZE = 20
+# Seconds between checks for a finished preview while one is rendering
+PREVIEW_POLL_INTERVAL = 0.5
 
 # Configure Streamlit page
 st.set_page_config(
@@ -21,49 +32,205 @@ st.set_page_config(
 )
 
 
+def _release_shared(keys, preview_manager):
+    """Release the shared resources of a closed session."""
+    preview_manager.close()
+    for key in keys:
+        shared_resources.release(key)
+
+
 class BookEditor:
     """Main application class for the Book Editor.
 
     Handles editor initialization, template management, and auto-save.
+    The template catalog, the editor's template manager, the preview
+    template, the render cache and the autosave service are shared by all
+    sessions; each session owns its editor state and its legacy template
+    manager, whose categories can be changed.
     """
 
     def __init__(self):
+        # pylint: disable=import-outside-toplevel
+        from book_editor.app.core.autosave import AutoSaveService
+        from book_editor.app.core.preview import PreviewManager
+        from book_editor.app.core.resources import RenderCache
+        from book_editor.app.core.uploads import TemplateUploader
+        from book_editor.core.editor import Editor
+        from book_editor.core.template import (
+            Template,
+            TemplateManager,
+            create_catalog,
+        )
+        from book_editor.core.template_manager import (
+            TemplateManager as EditorTemplateManager,
+        )
+
         self.templates_dir = Path("templates")
-        self.editor = Editor(self.templates_dir)
-        self.template_manager = TemplateManager(self.templates_dir)
         self.ensure_directories()
+        template_key = str(self.templates_dir.resolve())
+        keys = [
+            ("template_catalog", template_key),
+            ("editor_template_manager", template_key),
+            "preview_template",
+            "render_cache",
+            "autosave",
+            ("template_uploader", template_key),
+        ]
+        catalog = shared_resources.acquire(
+            keys[0], lambda: create_catalog(self.templates_dir)
+        )
+        self.template_manager = TemplateManager(self.templates_dir, catalog=catalog)
+        self.editor = Editor(
+            self.templates_dir,
+            template_manager=shared_resources.acquire(
+                keys[1], lambda: EditorTemplateManager(self.templates_dir, catalog)
+            ),
+        )
+        preview_template = shared_resources.acquire(
+            keys[2], lambda: Template("preview", "general")
+        )
+        render_cache = shared_resources.acquire(keys[3], RenderCache)
+        self.preview_manager = PreviewManager(
+            render_cache=render_cache, block_mode=True, styled=False
+        )
+        self.preview_manager.set_template(preview_template)
         self.last_save_time = time.time()
         self.auto_save_interval = 60  # seconds
+        self.autosave = shared_resources.acquire(
+            keys[4], lambda: AutoSaveService(self.auto_save_interval)
+        )
+        self.uploader = shared_resources.acquire(
+            keys[5], lambda: TemplateUploader(self.templates_dir)
+        )
+        self._queued_version = None
+        self.viewport = ViewportIndex(
+            PREVIEW_CONFIG["page_blocks"], PREVIEW_CONFIG["page_margin"]
+        )
+        self.preview_page = 0
+        # Offset the preview should scroll to on its next run, if any
+        self.preview_anchor = None
+        # Generation and fragments of the preview frame shown by this session
+        self.preview_frame = (0, [])
+        # Release the shared resources when the session state is discarded
+        weakref.finalize(self, _release_shared, keys, self.preview_manager)
+
+    def preview_source(self, text_content):
+        """Select the part of the text to preview.
+
+        Short texts are previewed whole. Long texts are split into pages and
+        only the current page is rendered; the page follows the latest edit.
+
+        Returns:
+            Tuple of the text to render, the current page and the page count
+        """
+        if len(text_content) < PREVIEW_CONFIG["virtualize_threshold"]:
+            return text_content, 0, 1
+        source, self.preview_page, pages = self.viewport.select_page(
+            text_content, self.preview_page
+        )
+        return source, self.preview_page, pages
+
+    def update_preview_frame(self, full_refresh=False):
+        """Bring the shown preview frame up to date.
+
+        Only the fragments that changed since the shown frame are fetched,
+        unless a full refresh is requested or the shown frame is too old.
+
+        Returns:
+            Fragments of the newest preview frame
+        """
+        from book_editor.app.core.preview_diff import apply_diff  # pylint: disable=import-outside-toplevel
+
+        generation, fragments = self.preview_frame
+        diff = self.preview_manager.diff_since(0 if full_refresh else generation)
+        if diff.generation != generation or diff.full:
+            fragments = apply_diff(fragments, diff)
+            self.preview_frame = (diff.generation, fragments)
+        return fragments
+
+    def turn_preview_page(self, step):
+        """Move the virtualized preview by a number of pages."""
+        self.preview_page = max(0, min(self.preview_page + step, self.viewport.page_count - 1))
+
+    def show_preview_at(self, offset):
+        """Move the preview to an offset.
+
+        The virtualized preview turns to the page containing the offset, and
+        the preview scrolls to it on its next run.
+        """
+        self.preview_page = self.viewport.page_of(offset)
+        self.preview_anchor = offset
+
+    def take_preview_anchor(self, text_content):
+        """Take the offset the preview should scroll to.
+
+        Returns:
+            Number of headings in the previewed text before the offset, or
+            None if the preview should not scroll
+        """
+        from book_editor.core.outline import Outline  # pylint: disable=import-outside-toplevel
+
+        offset, self.preview_anchor = self.preview_anchor, None
+        if offset is None or offset > len(text_content):
+            return None
+        start = 0
+        if len(text_content) >= PREVIEW_CONFIG["virtualize_threshold"]:
+            start = self.viewport.page_range(self.preview_page)[0]
+        return len(Outline(text_content[start:offset]))
 
     def ensure_directories(self):
         """Ensure required directories exist."""
         self.templates_dir.mkdir(exist_ok=True)
 
     def save_template(self, uploaded_file, category: str = "general"):
-        """Save uploaded template file."""
-        if uploaded_file is not None:
-            # Create template from uploaded file
-            template = Template(uploaded_file.name.split(".")[0], category)
-            template.metadata["description"] = "Uploaded template"
+        """Save uploaded template file.
 
-            # Save the template file
-            file_path = self.templates_dir / uploaded_file.name
-            with open(file_path, "wb") as f:
-                f.write(uploaded_file.getbuffer())
+        The upload is streamed to disk in chunks and identical uploads are
+        stored only once.
+        """
+        if uploaded_file is not None:
+            try:
+                result = self.uploader.ingest(uploaded_file, uploaded_file.name, category)
+            except (OSError, ValueError) as e:
+                logging.error(f"Failed to save uploaded template: {str(e)}")
+                return False
 
             # Save template metadata
-            return self.template_manager.save_template(template)
+            return self.template_manager.save_template(result.template)
         return False
 
     def check_auto_save(self, text_content):
-        """Check if auto-save should be triggered."""
-        current_time = time.time()
-        if current_time - self.last_save_time >= self.auto_save_interval:
-            if self.editor.current_document:
-                self.editor.current_document.update_content(text_content)
-                if self.editor.save_document():
-                    self.last_save_time = current_time
-                    return True
+        """Queue an auto-save and check whether one has completed.
+
+        Changed content is handed to the autosave service, which writes the
+        newest snapshot in the background, so this never waits for the disk.
+        Like a manual save, each auto-save is recorded as a revision.
+
+        Returns:
+            True if an auto-save completed since the last check
+        """
+        from book_editor.app.core.autosave import save_snapshot  # pylint: disable=import-outside-toplevel
+
+        document = self.editor.current_document
+        if not document:
+            return False
+        if text_content and text_content != document.content:
+            document.update_content(text_content)
+        path = self.editor.document_path(document)
+        key = str(path)
+        if self._queued_version != (key, document.version):
+            if document.revisions is None:
+                document.attach_revisions(self.editor.revision_store(document))
+            self.autosave.submit(
+                key,
+                document.to_dict(),
+                functools.partial(save_snapshot, path, document.revisions),
+            )
+            self._queued_version = (key, document.version)
+        last_saved = self.autosave.status(key)["last_saved"]
+        if last_saved is not None and last_saved > self.last_save_time:
+            self.last_save_time = last_saved
+            return True
         return False
 
 
@@ -89,10 +256,14 @@ def render_category_management():
 def render_template_upload(selected_category):
     """Render template upload section."""
     st.subheader("Upload Template")
-    uploaded_file = st.file_uploader("Choose a template file", type=["txt", "md", "docx"])
+    uploaded_file = st.file_uploader(
+        "Choose a template file", type=["txt", "md", "markdown", "html"]
+    )
     if uploaded_file is not None:
         if st.session_state.editor.save_template(uploaded_file, selected_category):
             st.success(f"Template '{uploaded_file.name}' uploaded successfully!")
+        else:
+            st.error(f"Failed to upload template '{uploaded_file.name}'")
 
 
 def render_template_search():
@@ -184,20 +355,41 @@ def render_preview(text_content):
     """Render preview interface."""
     st.subheader("Preview")
     if text_content:
-        # Create temporary document for preview
-        preview_doc = st.session_state.editor.editor.new_document()
-        preview_doc.update_content(text_content)
-
         # Add CSS for markdown styling
         css = st.session_state.editor.editor.get_css()
         st.markdown(f"<style>{css}</style>", unsafe_allow_html=True)
 
-        # Display preview
-        html_content = preview_doc.get_html()
-        st.markdown(
-            '<div class="markdown-body">' f"{html_content}" "</div>",
-            unsafe_allow_html=True,
-        )
+        # Long texts are previewed one page at a time
+        source, page, pages = st.session_state.editor.preview_source(text_content)
+        if pages > 1:
+            cols = st.columns([1, 2, 1])
+            with cols[0]:
+                st.button(
+                    "◀ Previous",
+                    on_click=st.session_state.editor.turn_preview_page,
+                    args=(-1,),
+                    disabled=page == 0,
+                )
+            with cols[1]:
+                st.caption(f"Page {page + 1} of {pages}")
+            with cols[2]:
+                st.button(
+                    "Next ▶",
+                    on_click=st.session_state.editor.turn_preview_page,
+                    args=(1,),
+                    disabled=page == pages - 1,
+                )
+
+        # Render in the background and show the newest finished preview; the
+        # fragment polls until the render of this text is ready
+        preview_manager = st.session_state.editor.preview_manager
+        preview_manager.request_preview(source)
+        full_refresh = st.button("Refresh preview")
+        poll = None if preview_manager.is_current() else PREVIEW_POLL_INTERVAL
+        st.fragment(render_preview_frame, run_every=poll)(full_refresh)
+        heading = st.session_state.editor.take_preview_anchor(text_content)
+        if heading is not None:
+            scroll_preview_to(heading)
 
         # Display statistics
         with st.expander("Text Statistics"):
@@ -213,6 +405,70 @@ def render_preview(text_content):
                 st.metric("Avg. Word Length", f"{stats['avg_word_length']:.1f}")
 
 
+def render_preview_frame(full_refresh=False):
+    """Show the newest finished preview frame."""
+    from book_editor.app.core.preview_diff import chunk_fragments  # pylint: disable=import-outside-toplevel
+
+    preview_manager = st.session_state.editor.preview_manager
+    fragments = st.session_state.editor.update_preview_frame(full_refresh)
+    if fragments:
+        # Streamlit sends large elements it has sent before as references to
+        # the browser's cache, so unchanged chunks are not sent again
+        with st.container(border=True):
+            for html in chunk_fragments(fragments):
+                st.markdown(
+                    '<div class="markdown-body">' f"{html}" "</div>",
+                    unsafe_allow_html=True,
+                )
+    if not preview_manager.is_current():
+        st.caption("Updating preview...")
+
+
+def scroll_preview_to(heading):
+    """Scroll the preview to one of its headings.
+
+    Args:
+        heading: Position of the heading among the headings of the preview
+    """
+    import streamlit.components.v1 as components  # pylint: disable=import-outside-toplevel
+
+    selector = ", ".join(f".markdown-body h{level}" for level in range(1, 7))
+    components.html(
+        "<script>\n"
+        "setTimeout(() => {\n"
+        f"  const headings = window.parent.document.querySelectorAll('{selector}');\n"
+        f"  const target = headings[{int(heading)}];\n"
+        "  if (target) target.scrollIntoView({behavior: 'smooth', block: 'start'});\n"
+        "}, 100);\n"
+        "</script>",
+        height=0,
+    )
+
+
+def jump_to_heading():
+    """Move the preview to the heading selected in the outline."""
+    doc = st.session_state.editor.editor.current_document
+    index = st.session_state.get("outline_heading")
+    if doc and index is not None and index < len(doc.outline):
+        st.session_state.editor.show_preview_at(doc.outline[index].offset)
+
+
+def render_outline(doc):
+    """Render the heading outline of the current document."""
+    st.header("Outline")
+    if not doc or not len(doc.outline):
+        st.caption("No headings")
+        return
+    outline = doc.outline
+    st.selectbox(
+        "Jump to heading",
+        range(len(outline)),
+        format_func=lambda i: f"{'· ' * (outline[i].level - 1)}{outline[i].title}",
+        key="outline_heading",
+        on_change=jump_to_heading,
+    )
+
+
 def main():
     """Main application entry point."""
     st.title("📚 Book Editor")
@@ -233,11 +489,18 @@ def main():
         st.header("Document History")
         doc = st.session_state.editor.editor.current_document
         if doc:
-            history = doc.get_revision_history()
-            if history:
-                st.write(f"Previous versions: {len(history)}")
-                for i, rev in enumerate(history):
-                    st.text(f"Version {i + 1}: {rev['timestamp']}")
+            total = doc.revision_count()
+            if total:
+                st.write(f"Previous versions: {total}")
+                pages = (total + HISTORY_PAGE_SIZE - 1) // HISTORY_PAGE_SIZE
+                page = st.number_input("Page", 1, pages, 1) if pages > 1 else 1
+                history = doc.get_revision_history(
+                    (page - 1) * HISTORY_PAGE_SIZE, HISTORY_PAGE_SIZE
+                )
+                for rev in history:
+                    st.text(f"Version {rev['version']}: {rev['timestamp']} ({rev['author']})")
+
+        render_outline(doc)
 
     # Main editing area
     col1, col2 = st.columns(2)
@@ -0,0 +1,152 @@
+"""Book renderer module for rendering whole books with a template.
+
+Chapters are rendered in a process pool so that books with hundreds of
+chapters use every available core. Workers are started from a fork server
+where available, never forked from the app's threaded process. Results are
+collected in chapter order and streamed to the output file as they arrive.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+from src.book_editor.core.template import Template
+from src.book_editor.core.utils import process_context
+from src.models.book import Book, Chapter
+
+# Template used by the current worker process, set once by the initializer
+_worker_template: Optional[Template] = None
+
+
+def chapter_to_markdown(chapter: Chapter) -> str:
+    """Convert a chapter and its sections to Markdown.
+
+    Args:
+        chapter: Chapter to convert
+
+    Returns:
+        Markdown text of the chapter
+    """
+    parts = [f"# {chapter.title}"]
+    if chapter.content:
+        parts.append(chapter.content)
+    for section in chapter.sections:
+        parts.append(f"## {section.title}")
+        if section.content:
+            parts.append(section.content)
+    return "\n\n".join(parts)
+
+
+def _init_worker(template_data: Dict[str, Any]) -> None:
+    """Build the template once per worker process.
+
+    Args:
+        template_data: Dictionary representation of the template
+    """
+    global _worker_template
+    _worker_template = Template.from_dict(template_data)
+
+
+def _render_chapter(text: str) -> str:
+    """Render a chapter with the worker's template.
+
+    Args:
+        text: Markdown text of the chapter
+
+    Returns:
+        Rendered chapter
+    """
+    if _worker_template is None:
+        raise RuntimeError("Worker template has not been initialized")
+    return _worker_template.render(text)
+
+
+class BookRenderer:
+    """Renders books chapter by chapter across a process pool."""
+
+    def __init__(
+        self,
+        template: Template,
+        max_workers: Optional[int] = None,
+        chunk_size: int = 8,
+    ):
+        """Initialize book renderer.
+
+        Args:
+            template: Template to render chapters with
+            max_workers: Number of worker processes. If None, uses CPU count.
+            chunk_size: Number of chapters sent to a worker at a time
+
+        Raises:
+            ValueError: If max_workers or chunk_size is not positive
+        """
+        if max_workers is not None and max_workers <= 0:
+            raise ValueError("max_workers must be positive")
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be positive")
+
+        template.validate()
+        self.template = template
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+
+    def iter_render(self, book: Book) -> Iterator[str]:
+        """Render the chapters of a book in order.
+
+        Args:
+            book: Book to render
+
+        Returns:
+            Iterator over rendered chapters, in chapter order
+        """
+        texts: List[str] = [chapter_to_markdown(c) for c in book.chapters]
+        if not texts:
+            return
+
+        if self.max_workers == 1 or len(texts) <= self.chunk_size:
+            for text in texts:
+                yield self.template.render(text)
+            return
+
+        with ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=process_context(),
+            initializer=_init_worker,
+            initargs=(self.template.to_dict(),),
+        ) as executor:
+            yield from executor.map(_render_chapter, texts, chunksize=self.chunk_size)
+
+    def render(self, book: Book) -> List[str]:
+        """Render all chapters of a book.
+
+        Args:
+            book: Book to render
+
+        Returns:
+            List of rendered chapters, in chapter order
+        """
+        return list(self.iter_render(book))
+
+    def render_to_file(self, book: Book, path: Union[str, Path]) -> int:
+        """Render a book and stream the chapters to a file.
+
+        Args:
+            book: Book to render
+            path: Path to write the rendered book to
+
+        Returns:
+            Number of chapters written
+
+        Raises:
+            OSError: If file cannot be written
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        count = 0
+        with path.open("w", encoding="utf-8") as f:
+            for html in self.iter_render(book):
+                f.write(html)
+                f.write("\n")
+                count += 1
+        return count
@@ -3,7 +3,10 @@
 import json
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from src.book_editor.core.outline import Heading, Outline
+from src.book_editor.core.revision_store import RevisionStore
 
 
 class Document:
@@ -36,6 +39,8 @@ class Document:
         }
         self._history: List[str] = [content]
         self._history_index = 0
+        self.revisions: Optional[RevisionStore] = None
+        self._outline: Optional[Outline] = None
 
     def validate(self) -> bool:
         """Validate document data.
@@ -146,6 +151,119 @@ class Document:
             self.metadata["updated_at"] = datetime.now()
             self.metadata["version"] = self.version
 
+    @property
+    def outline(self) -> Outline:
+        """Get the heading outline of the content.
+
+        The outline is brought up to date on access, rescanning only the
+        lines changed since it was last used.
+        """
+        if self._outline is None:
+            self._outline = Outline(self.content)
+        elif self._outline.text is not self.content:
+            self._outline.update(self.content)
+        return self._outline
+
+    def get_outline(self) -> List[Heading]:
+        """Get the headings of the content.
+
+        Returns:
+            Headings with their offsets and levels, in order
+        """
+        return self.outline.headings
+
+    def split_chapters(self, level: int = 1) -> List[Tuple[str, str]]:
+        """Split the content into chapters at headings.
+
+        Args:
+            level: Deepest heading level that starts a chapter
+
+        Returns:
+            List of (title, text) tuples
+
+        Raises:
+            ValueError: If level is not between 1 and 6
+        """
+        return self.outline.split(level)
+
+    def attach_revisions(self, store: Optional[RevisionStore]) -> None:
+        """Attach a persistent revision store.
+
+        Args:
+            store: Revision store of this document, or None to detach
+        """
+        self.revisions = store
+
+    def record_revision(self, author: Optional[str] = None) -> Optional[int]:
+        """Record the current content as a revision.
+
+        Nothing is recorded if the content has not changed since the last
+        revision.
+
+        Args:
+            author: Author of the revision. If None, uses the document author.
+
+        Returns:
+            Revision number, or None if nothing was recorded
+
+        Raises:
+            OSError: If the revision cannot be written
+        """
+        store = self.revisions
+        if store is None:
+            return None
+        if len(store) and store.content(-1) == self.content:
+            return None
+        return store.append(
+            self.content,
+            self.version,
+            author if author is not None else self.metadata["author"],
+            self.metadata["updated_at"],
+        )
+
+    def get_revision_history(
+        self, start: int = 0, limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Get a page of revision history, newest first.
+
+        Args:
+            start: Number of newest revisions to skip
+            limit: Maximum number of revisions to return. If None, returns all.
+
+        Returns:
+            List of dictionaries with revision, version, timestamp and author
+        """
+        if self.revisions is None:
+            return []
+        if limit is None:
+            limit = len(self.revisions)
+        return self.revisions.page(start, limit)
+
+    def revision_count(self) -> int:
+        """Get the number of recorded revisions.
+
+        Returns:
+            Number of revisions
+        """
+        return len(self.revisions) if self.revisions is not None else 0
+
+    def get_revision(self, revision: int) -> str:
+        """Get the content of a recorded revision.
+
+        Args:
+            revision: Revision number; negative numbers count from the end
+
+        Returns:
+            Content of the revision
+
+        Raises:
+            ValueError: If no revision store is attached
+            IndexError: If the revision does not exist
+        """
+        if self.revisions is None:
+            raise ValueError("Document has no revision history")
+        return self.revisions.content(revision)
+
     def to_dict(self) -> Dict[str, Any]:
         """Convert document to dictionary.
 
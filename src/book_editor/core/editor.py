@@ -3,12 +3,18 @@
 import json
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Union
 
 from src.book_editor import STORAGE_DIR, TEMPLATE_DIR
 from src.book_editor.core.document import Document
 from src.book_editor.core.document_manager import DocumentManager
+from src.book_editor.core.revision_store import RevisionStore
 from src.book_editor.core.template_manager import TemplateManager
+from src.book_editor.core.text_stats import TextStatistics
+
+
+# Subdirectory of the storage directory holding revision logs
+REVISIONS_DIR = ".revisions"
 
 
 class DateTimeEncoder(json.JSONEncoder):
@@ -26,12 +32,15 @@ class Editor:
         self,
         storage_dir: Optional[Union[str, Path]] = None,
         template_dir: Optional[Union[str, Path]] = None,
+        template_manager: Optional[TemplateManager] = None,
     ):
         """Initialize editor.
 
         Args:
             storage_dir: Directory for storing documents. If None, uses default.
             template_dir: Directory for storing templates. If None, uses default.
+            template_manager: Template manager to share with other editors.
+                If None, a new one is created for template_dir.
         """
         self.storage_dir = Path(storage_dir or STORAGE_DIR)
         self.template_dir = Path(template_dir or TEMPLATE_DIR)
@@ -39,9 +48,10 @@ class Editor:
         self.template_dir.mkdir(parents=True, exist_ok=True)
 
         self.document_manager = DocumentManager(self.storage_dir)
-        self.template_manager = TemplateManager(self.template_dir)
+        self.template_manager = template_manager or TemplateManager(self.template_dir)
         self._current_document: Optional[Document] = None
         self._current_path: Optional[Path] = None
+        self._text_statistics = TextStatistics()
 
     @property
     def current_document(self) -> Optional[Document]:
@@ -87,6 +97,7 @@ class Editor:
         if doc is None:
             raise ValueError(f"Failed to load document {doc_id}")
         
+        doc.attach_revisions(self.revision_store(doc))
         self._current_document = doc
         return doc
 
@@ -106,10 +117,47 @@ class Editor:
         if not doc:
             raise ValueError("No document is currently open")
 
-        doc_id = doc.metadata["title"].lower().replace(" ", "-")
-        path = self.storage_dir / f"{doc_id}.json"
-        doc.save(path)
-        return doc_id
+        doc.save(self.document_path(doc))
+        if doc.revisions is None:
+            doc.attach_revisions(self.revision_store(doc))
+        doc.record_revision()
+        return self.document_id(doc)
+
+    @staticmethod
+    def document_id(document: Document) -> str:
+        """Get the ID a document is stored under.
+
+        Args:
+            document: Document to identify
+
+        Returns:
+            Document ID
+        """
+        return document.metadata["title"].lower().replace(" ", "-")
+
+    def document_path(self, document: Document) -> Path:
+        """Get the path a document is saved to.
+
+        Args:
+            document: Document to locate
+
+        Returns:
+            Path of the document file
+        """
+        return self.storage_dir / f"{self.document_id(document)}.json"
+
+    def revision_store(self, document: Document) -> RevisionStore:
+        """Get the revision store of a document.
+
+        Args:
+            document: Document whose revisions to open
+
+        Returns:
+            Revision store kept next to the document file
+        """
+        return RevisionStore(
+            self.storage_dir / REVISIONS_DIR / f"{self.document_id(document)}.jsonl"
+        )
 
     def load_document(self, path: Union[str, Path]) -> Optional[Document]:
         """Load a document from a file.
@@ -174,6 +222,20 @@ class Editor:
             raise ValueError("No document is currently open")
         self._current_document.redo()
 
+    def analyze_text(self, text: str) -> Dict[str, Any]:
+        """Compute statistics for the text being edited.
+
+        Only paragraphs that changed since the previous call are recounted.
+
+        Args:
+            text: Text to analyze
+
+        Returns:
+            Word, character, line, paragraph and sentence counts and the
+            average word length
+        """
+        return self._text_statistics.update(text)
+
     def list_documents(self) -> List[Dict[str, str]]:
         """List all documents.
 
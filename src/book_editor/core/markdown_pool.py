@@ -0,0 +1,69 @@
+"""Markdown converter pool module.
+
+Creating a ``markdown.Markdown`` instance sets up its whole processing
+pipeline, which ``markdown.markdown`` does on every call. The pool keeps
+converters around and resets them between uses so that the setup cost is
+paid once per concurrent user instead of once per render. The ``markdown``
+package itself is only imported when the first converter is needed.
+"""
+
+import threading
+from typing import TYPE_CHECKING, List
+
+if TYPE_CHECKING:
+    import markdown
+
+# Idle converters kept by the default pool
+DEFAULT_POOL_SIZE = 8
+
+
+class MarkdownPool:
+    """Thread-safe pool of reusable Markdown converters."""
+
+    def __init__(self, max_idle: int = DEFAULT_POOL_SIZE):
+        """Initialize Markdown pool.
+
+        Args:
+            max_idle: Maximum number of idle converters to keep
+
+        Raises:
+            ValueError: If max_idle is negative
+        """
+        if max_idle < 0:
+            raise ValueError("max_idle cannot be negative")
+        self.max_idle = max_idle
+        self._lock = threading.Lock()
+        self._idle: List["markdown.Markdown"] = []
+
+    def convert(self, text: str) -> str:
+        """Convert Markdown text to HTML.
+
+        Args:
+            text: Markdown text
+
+        Returns:
+            HTML output, identical to ``markdown.markdown(text)``
+        """
+        with self._lock:
+            converter = self._idle.pop() if self._idle else None
+        if converter is None:
+            import markdown  # pylint: disable=import-outside-toplevel
+
+            converter = markdown.Markdown()
+        try:
+            return converter.convert(text)
+        finally:
+            converter.reset()
+            with self._lock:
+                if len(self._idle) < self.max_idle:
+                    self._idle.append(converter)
+
+    @property
+    def idle(self) -> int:
+        """Get the number of idle converters."""
+        with self._lock:
+            return len(self._idle)
+
+
+# Process-wide pool shared by all templates
+default_pool = MarkdownPool()
@@ -0,0 +1,320 @@
+"""Outline module.
+
+Keeps an index of the ATX headings ('#' to '######') of a Markdown text with
+their character offsets and levels. After an edit only the lines touched by
+the edit are scanned again, offsets after the edit move without being
+rewritten, and lookups by offset use binary search, so navigating a long
+manuscript does not re-parse it.
+"""
+
+import re
+from bisect import bisect_left, bisect_right
+from typing import Iterator, List, NamedTuple, Optional, Tuple
+
+from src.book_editor.core.text_diff import make_delta
+
+HEADING = re.compile(r"^ {0,3}(#{1,6})(?:[ \t]+(.*?))?(?:[ \t]+#+)?[ \t]*$", re.MULTILINE)
+FENCE = re.compile(r"^[ \t]*(?:```|~~~)", re.MULTILINE)
+
+
+class Heading(NamedTuple):
+    """Heading of a Markdown text.
+
+    Attributes:
+        offset: Offset of the first character of the heading line
+        level: Heading level, 1 to 6
+        title: Heading text without the '#' markers
+    """
+
+    offset: int
+    level: int
+    title: str
+
+
+def _fences(text: str, start: int = 0, end: Optional[int] = None) -> List[int]:
+    """Find the offsets of code fence lines."""
+    end = len(text) if end is None else end
+    return [m.start() for m in FENCE.finditer(text, start, end)]
+
+
+class _Offsets:
+    """Sorted character offsets of a text that move with edits.
+
+    Offsets before a split point are stored as they are and offsets after it
+    as negative distances from the end of the text, as ``LineIndex`` does
+    for line starts. An edit moves the split point to itself, so only the
+    offsets between the previous edit and this one are rewritten; the ones
+    after it follow the end of the text without being touched.
+    """
+
+    def __init__(self, offsets: List[int], length: int):
+        """Initialize offsets.
+
+        Args:
+            offsets: Sorted offsets
+            length: Length of the text
+        """
+        self._values = offsets
+        self._split = len(offsets)
+        self._length = length
+
+    def __len__(self) -> int:
+        """Get the number of offsets."""
+        return len(self._values)
+
+    def __getitem__(self, index: int) -> int:
+        """Get an offset by position."""
+        if index < 0:
+            index += len(self._values)
+        value = self._values[index]
+        return value if index < self._split else value + self._length
+
+    def __iter__(self) -> Iterator[int]:
+        """Iterate over the offsets in order."""
+        for index, value in enumerate(self._values):
+            yield value if index < self._split else value + self._length
+
+    def bisect_left(self, offset: int) -> int:
+        """Get the number of offsets before an offset."""
+        index = bisect_left(self._values, offset, 0, self._split)
+        if index < self._split:
+            return index
+        return bisect_left(self._values, offset - self._length, self._split)
+
+    def bisect_right(self, offset: int) -> int:
+        """Get the number of offsets at or before an offset."""
+        index = bisect_right(self._values, offset, 0, self._split)
+        if index < self._split:
+            return index
+        return bisect_right(self._values, offset - self._length, self._split)
+
+    def _move(self, offset: int) -> None:
+        """Move the split point to a character offset."""
+        values, length = self._values, self._length
+        while self._split < len(values) and values[self._split] + length < offset:
+            values[self._split] += length
+            self._split += 1
+        while self._split > 0 and values[self._split - 1] >= offset:
+            values[self._split - 1] -= length
+            self._split -= 1
+
+    def replace(
+        self, start: int, end: int, offsets: List[int], length: int
+    ) -> Tuple[int, int]:
+        """Replace the offsets of an edited range.
+
+        Args:
+            start: First offset of the edited range in the old text
+            end: Last offset of the edited range in the old text
+            offsets: Offsets of the edited range in the new text
+            length: Length of the new text
+
+        Returns:
+            Tuple (first, last): the positions of the replaced offsets
+        """
+        self._move(start)
+        first = self._split
+        last = bisect_right(self._values, end - self._length, first)
+        self._values[first:last] = offsets
+        self._split = first + len(offsets)
+        self._length = length
+        return first, last
+
+
+def _scan(text: str, start: int, end: int, fences: _Offsets) -> List[Heading]:
+    """Find headings between two offsets that are not inside code blocks.
+
+    Args:
+        text: Text to scan
+        start: Offset of the first line to scan
+        end: Offset after the last line to scan
+        fences: Offsets of all code fence lines in the text
+
+    Returns:
+        Headings in order
+    """
+    headings = []
+    for match in HEADING.finditer(text, start, end):
+        # Inside a code block if an odd number of fences come before
+        if fences.bisect_left(match.start()) % 2:
+            continue
+        headings.append(
+            Heading(match.start(), len(match.group(1)), (match.group(2) or "").strip())
+        )
+    return headings
+
+
+class Outline:
+    """Incrementally updated heading index of a Markdown text."""
+
+    def __init__(self, text: str = ""):
+        """Initialize outline.
+
+        Args:
+            text: Text to index
+        """
+        self._text = text
+        self._index(text)
+        # Number of characters scanned by the last update
+        self.scanned = len(text)
+
+    def _index(self, text: str) -> None:
+        """Index the whole text."""
+        self._fences = _Offsets(_fences(text), len(text))
+        headings = _scan(text, 0, len(text), self._fences)
+        self._offsets = _Offsets([h.offset for h in headings], len(text))
+        # Level and title of each heading
+        self._entries: List[Tuple[int, str]] = [(h.level, h.title) for h in headings]
+
+    @property
+    def text(self) -> str:
+        """Get the indexed text."""
+        return self._text
+
+    @property
+    def headings(self) -> List[Heading]:
+        """Get all headings in order."""
+        return [
+            Heading(offset, level, title)
+            for offset, (level, title) in zip(self._offsets, self._entries)
+        ]
+
+    def __len__(self) -> int:
+        """Get the number of headings."""
+        return len(self._entries)
+
+    def __getitem__(self, index: int) -> Heading:
+        """Get a heading by position."""
+        level, title = self._entries[index]
+        return Heading(self._offsets[index], level, title)
+
+    def update(self, text: str) -> None:
+        """Index a new version of the text.
+
+        Only the lines changed since the previously indexed text are scanned,
+        and only the offsets between the previous edit and this one are
+        rewritten. Edits that add or remove code fences change what is code
+        further down, so they cause a full rescan.
+
+        Args:
+            text: New text
+        """
+        old = self._text
+        if text == old:
+            self.scanned = 0
+            return
+        start, old_end, replacement = make_delta(old, text)
+        # Widen the edit to whole lines
+        line_start = old.rfind("\n", 0, start) + 1
+        line_end = old.find("\n", old_end)
+        line_end = len(old) if line_end == -1 else line_end
+        new_end = line_end + len(text) - len(old)
+        self._text = text
+
+        if FENCE.search(old, line_start, line_end) or FENCE.search(text, line_start, new_end):
+            self._index(text)
+            self.scanned = len(text)
+            return
+
+        # Fences outside the edited lines only move
+        self._fences.replace(line_start, line_end, [], len(text))
+        scanned = _scan(text, line_start, new_end, self._fences)
+        first, last = self._offsets.replace(
+            line_start, line_end, [h.offset for h in scanned], len(text)
+        )
+        self._entries[first:last] = [(h.level, h.title) for h in scanned]
+        self.scanned = new_end - line_start
+
+    def index_at(self, offset: int) -> Optional[int]:
+        """Get the position of the heading whose section contains an offset.
+
+        Args:
+            offset: Character offset in the text
+
+        Returns:
+            Position of the closest heading at or before the offset, or None
+            if the offset comes before the first heading
+        """
+        index = self._offsets.bisect_right(offset) - 1
+        return index if index >= 0 else None
+
+    def heading_at(self, offset: int) -> Optional[Heading]:
+        """Get the heading whose section contains an offset.
+
+        Args:
+            offset: Character offset in the text
+
+        Returns:
+            Closest heading at or before the offset, or None
+        """
+        index = self.index_at(offset)
+        return self[index] if index is not None else None
+
+    def next_heading(self, offset: int) -> Optional[Heading]:
+        """Get the first heading after an offset.
+
+        Args:
+            offset: Character offset in the text
+
+        Returns:
+            Next heading, or None if there is none
+        """
+        index = self._offsets.bisect_right(offset)
+        return self[index] if index < len(self) else None
+
+    def previous_heading(self, offset: int) -> Optional[Heading]:
+        """Get the last heading before an offset.
+
+        Args:
+            offset: Character offset in the text
+
+        Returns:
+            Previous heading, or None if there is none
+        """
+        index = self._offsets.bisect_left(offset) - 1
+        return self[index] if index >= 0 else None
+
+    def section_range(self, index: int) -> Tuple[int, int]:
+        """Get the character range of a heading's section.
+
+        The section runs up to the next heading of the same or a higher
+        level, so it includes its subsections.
+
+        Args:
+            index: Position of the heading
+
+        Returns:
+            Tuple (start, end) of character offsets
+        """
+        level = self._entries[index][0]
+        for following in range(index + 1, len(self._entries)):
+            if self._entries[following][0] <= level:
+                return self._offsets[index], self._offsets[following]
+        return self._offsets[index], len(self._text)
+
+    def split(self, level: int = 1) -> List[Tuple[str, str]]:
+        """Split the text at headings of a level or higher.
+
+        Text before the first such heading is returned with an empty title.
+
+        Args:
+            level: Deepest heading level to split at
+
+        Returns:
+            List of (title, text) tuples, where text includes the heading line
+
+        Raises:
+            ValueError: If level is not between 1 and 6
+        """
+        if not 1 <= level <= 6:
+            raise ValueError("Heading level must be between 1 and 6")
+        cuts = [h for h in self.headings if h.level <= level]
+        parts = []
+        if not cuts or cuts[0].offset > 0:
+            end = cuts[0].offset if cuts else len(self._text)
+            if self._text[:end].strip():
+                parts.append(("", self._text[:end].strip()))
+        for number, heading in enumerate(cuts):
+            end = cuts[number + 1].offset if number + 1 < len(cuts) else len(self._text)
+            parts.append((heading.title, self._text[heading.offset:end].strip()))
+        return parts
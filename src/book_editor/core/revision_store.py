@@ -0,0 +1,288 @@
+"""Revision store module.
+
+Revisions of a document are appended to a JSON-lines log. Most records only
+hold the span that changed since the previous revision; every
+``snapshot_interval``-th record holds the full content, so any revision can
+be rebuilt by replaying at most ``snapshot_interval - 1`` deltas. A sidecar
+index of fixed-width byte offsets gives constant-time access to any record,
+so counting revisions and reading a page of history never scans the log.
+
+Appends are serialized by a lock within the process and, where ``fcntl`` is
+available, by an exclusive lock on the log across processes.
+"""
+
+import json
+import os
+import struct
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Optional, Union
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None  # type: ignore[assignment]
+
+from src.book_editor.core.text_diff import apply_delta, make_delta
+
+# Full content is stored every this many revisions
+DEFAULT_SNAPSHOT_INTERVAL = 50
+INDEX_SUFFIX = ".idx"
+
+_OFFSET = struct.Struct("<Q")
+
+
+class RevisionStore:
+    """Persistent, append-only revision log of a single document."""
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        snapshot_interval: int = DEFAULT_SNAPSHOT_INTERVAL,
+    ):
+        """Initialize revision store.
+
+        Args:
+            path: Path of the revision log
+            snapshot_interval: Number of revisions between full snapshots
+
+        Raises:
+            ValueError: If snapshot_interval is not positive
+        """
+        if snapshot_interval <= 0:
+            raise ValueError("snapshot_interval must be positive")
+        self.path = Path(path)
+        self.index_path = self.path.with_name(self.path.name + INDEX_SUFFIX)
+        self.snapshot_interval = snapshot_interval
+        self._count = 0
+        self._last_content: Optional[str] = None
+        self._lock = threading.RLock()
+        self._recover()
+
+    def __len__(self) -> int:
+        """Get the number of revisions."""
+        with self._lock:
+            return self._count
+
+    def append(
+        self,
+        content: str,
+        version: int,
+        author: str = "",
+        timestamp: Optional[datetime] = None,
+    ) -> int:
+        """Record a new revision.
+
+        Args:
+            content: Content of the revision
+            version: Document version of the revision
+            author: Author of the revision
+            timestamp: Time of the revision. If None, uses the current time.
+
+        Returns:
+            Revision number, starting at 0
+
+        Raises:
+            OSError: If the log cannot be written
+        """
+        with self._lock, self._locked_log() as log:
+            self._sync()
+            revision = self._count
+            record: Dict[str, Any] = {
+                "version": version,
+                "timestamp": (timestamp or datetime.now()).isoformat(),
+                "author": author,
+            }
+            if revision % self.snapshot_interval == 0:
+                record["snapshot"] = content
+            else:
+                record["delta"] = list(make_delta(self.content(revision - 1), content))
+
+            line = (json.dumps(record) + "\n").encode("utf-8")
+            offset = log.seek(0, os.SEEK_END)
+            log.write(line)
+            log.flush()
+            with self.index_path.open("ab") as index:
+                index.write(_OFFSET.pack(offset))
+            self._count += 1
+            self._last_content = content
+            return revision
+
+    @contextmanager
+    def _locked_log(self) -> Iterator[BinaryIO]:
+        """Open the log for appending, holding an exclusive lock on it."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.open("ab") as log:
+            if fcntl is not None:
+                fcntl.flock(log.fileno(), fcntl.LOCK_EX)
+            try:
+                yield log
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(log.fileno(), fcntl.LOCK_UN)
+
+    def _sync(self) -> None:
+        """Pick up revisions appended by other processes."""
+        try:
+            count = self.index_path.stat().st_size // _OFFSET.size
+        except FileNotFoundError:
+            count = 0
+        if count != self._count:
+            self._count = count
+            self._last_content = None
+
+    def get(self, revision: int) -> Dict[str, Any]:
+        """Get the metadata of a revision.
+
+        Args:
+            revision: Revision number; negative numbers count from the end
+
+        Returns:
+            Dictionary with revision, version, timestamp and author
+
+        Raises:
+            IndexError: If the revision does not exist
+        """
+        with self._lock:
+            revision = self._check(revision)
+            return self._metadata(revision, self._read(revision))
+
+    def page(
+        self, start: int = 0, limit: int = 20, newest_first: bool = True
+    ) -> List[Dict[str, Any]]:
+        """Get a page of revision metadata.
+
+        Args:
+            start: Number of revisions to skip
+            limit: Maximum number of revisions to return
+            newest_first: Whether to list the newest revisions first
+
+        Returns:
+            List of revision metadata dictionaries
+
+        Raises:
+            ValueError: If start or limit is negative
+        """
+        if start < 0 or limit < 0:
+            raise ValueError("start and limit cannot be negative")
+        with self._lock:
+            positions = range(start, min(start + limit, self._count))
+            if newest_first:
+                revisions = [self._count - 1 - i for i in positions]
+            else:
+                revisions = list(positions)
+            if not revisions:
+                return []
+            return [
+                self._metadata(revision, record)
+                for revision, record in zip(revisions, self._records(revisions))
+            ]
+
+    def content(self, revision: int) -> str:
+        """Rebuild the content of a revision.
+
+        Args:
+            revision: Revision number; negative numbers count from the end
+
+        Returns:
+            Content of the revision
+
+        Raises:
+            IndexError: If the revision does not exist
+        """
+        with self._lock:
+            revision = self._check(revision)
+            if revision == self._count - 1 and self._last_content is not None:
+                return self._last_content
+            base = revision - revision % self.snapshot_interval
+            records = self._records(range(base, revision + 1))
+            text = next(records)["snapshot"]
+            for record in records:
+                text = apply_delta(text, record["delta"])
+            if revision == self._count - 1:
+                self._last_content = text
+            return text
+
+    @staticmethod
+    def _metadata(revision: int, record: Dict[str, Any]) -> Dict[str, Any]:
+        """Get the metadata of a revision from its record."""
+        return {
+            "revision": revision,
+            "version": record["version"],
+            "timestamp": record["timestamp"],
+            "author": record["author"],
+        }
+
+    def _check(self, revision: int) -> int:
+        """Normalize and validate a revision number."""
+        if revision < 0:
+            revision += self._count
+        if not 0 <= revision < self._count:
+            raise IndexError(f"Revision {revision} does not exist")
+        return revision
+
+    def _offset(self, revision: int) -> int:
+        """Read the log offset of a revision from the index."""
+        with self.index_path.open("rb") as index:
+            index.seek(revision * _OFFSET.size)
+            return _OFFSET.unpack(index.read(_OFFSET.size))[0]
+
+    def _read(self, revision: int) -> Dict[str, Any]:
+        """Read the record of a revision from the log."""
+        (record,) = self._records((revision,))
+        return record
+
+    def _records(self, revisions: Iterable[int]) -> Iterator[Dict[str, Any]]:
+        """Read the records of several revisions.
+
+        The log and the index are opened once for all of them.
+        """
+        with self.path.open("rb") as log, self.index_path.open("rb") as index:
+            for revision in revisions:
+                index.seek(revision * _OFFSET.size)
+                log.seek(_OFFSET.unpack(index.read(_OFFSET.size))[0])
+                yield json.loads(log.readline().decode("utf-8"))
+
+    def _rebuild_index(self) -> None:
+        """Rebuild a missing index by scanning the log."""
+        offsets = bytearray()
+        with self.path.open("rb") as log:
+            offset = 0
+            for line in log:
+                if line.endswith(b"\n"):
+                    offsets += _OFFSET.pack(offset)
+                offset += len(line)
+        self.index_path.write_bytes(bytes(offsets))
+
+    def _recover(self) -> None:
+        """Load the revision count, dropping records left by interrupted writes."""
+        if not self.path.exists():
+            if self.index_path.exists():
+                self.index_path.unlink()
+            return
+        if not self.index_path.exists():
+            self._rebuild_index()
+        log_size = self.path.stat().st_size
+        count = self.index_path.stat().st_size // _OFFSET.size
+        self._count = count
+        # Drop index entries that point past the log or at a partial record
+        while self._count:
+            offset = self._offset(self._count - 1)
+            if offset < log_size:
+                with self.path.open("rb") as log:
+                    log.seek(offset)
+                    line = log.readline()
+                if line.endswith(b"\n"):
+                    end = offset + len(line)
+                    break
+            self._count -= 1
+        else:
+            end = 0
+        if self._count != count or self.index_path.stat().st_size != count * _OFFSET.size:
+            with self.index_path.open("r+b") as index:
+                index.truncate(self._count * _OFFSET.size)
+        if end != log_size:
+            with self.path.open("r+b") as log:
+                log.truncate(end)
@@ -6,7 +6,10 @@ import logging
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Set, Union
 
-import markdown
+from src.book_editor.core.markdown_pool import default_pool
+from src.book_editor.core.template_bundle import default_bundle_path
+from src.book_editor.core.template_catalog import TemplateCatalog
+from src.book_editor.core.template_resolver import TemplateResolver
 
 PAGE_LAYOUTS = {
     "manuscript": {
@@ -28,16 +31,51 @@ VINTAGE_BORDERS = {
 
 VALID_FORMATS = {"markdown", "html", "text"}
 
+# File in the template directory that lists template categories
+CATEGORIES_FILE = "categories.json"
+
+
+class _OwnedDict(dict):
+    """Dict that records which template may modify it in place."""
+
+    __slots__ = ("owner",)
+
+    def __init__(self, owner: object, *args: Any) -> None:
+        super().__init__(*args)
+        self.owner = owner
+
+
+class _OwnedList(list):
+    """List that records which template may modify it in place."""
+
+    __slots__ = ("owner",)
+
+    def __init__(self, owner: object, *args: Any) -> None:
+        super().__init__(*args)
+        self.owner = owner
+
 
 class Template:
-    """Class representing a book template."""
+    """Class representing a book template.
+
+    Templates created with ``copy``, ``flatten`` or ``merge`` share style and
+    layout data internally and copy it lazily, one style type at a time,
+    when either side writes to it. The ``styles`` and ``layouts`` properties,
+    ``to_dict`` and ``from_dict`` never expose shared data.
 
-    def __init__(self, name: str, category: str):
+    A template may name a parent template. It then holds only the styles and
+    layouts it overrides, and ``flatten`` applies them on top of the resolved
+    parent.
+    """
+
+    def __init__(self, name: str, category: str, parent: Optional[str] = None):
         """Initialize template.
 
         Args:
             name: Template name
             category: Template category
+            parent: Optional name of the template to inherit from. Templates
+                with a parent start without styles and layouts of their own.
 
         Raises:
             ValueError: If name or category is empty
@@ -49,6 +87,9 @@ class Template:
 
         self.name = name
         self.category = category
+        self.parent = parent
+        # Marks the containers this template may modify in place
+        self._owner = object()
         self.metadata = {
             "description": "",
             "tags": [],
@@ -79,6 +120,98 @@ class Template:
                 "margin": "2.54cm"
             }
         ]
+        if parent:
+            self.styles = {}
+            self.layouts = []
+
+    @property
+    def styles(self) -> Dict[str, Any]:
+        """Get template styles.
+
+        Data shared with other templates is copied first, so the result may
+        be modified without affecting them.
+        """
+        if isinstance(self._styles, dict):
+            self._own_styles()
+        return self._styles
+
+    @styles.setter
+    def styles(self, styles: Dict[str, Any]) -> None:
+        """Set template styles. The template keeps a copy of dict styles."""
+        self._styles = styles
+        if isinstance(styles, dict):
+            self._own_styles()
+
+    @property
+    def layouts(self) -> List[Dict[str, str]]:
+        """Get template layouts.
+
+        Data shared with other templates is copied first, so the result may
+        be modified without affecting them.
+        """
+        if isinstance(self._layouts, list):
+            return self._writable_layouts()
+        return self._layouts
+
+    @layouts.setter
+    def layouts(self, layouts: List[Dict[str, str]]) -> None:
+        """Set template layouts. The template keeps a copy of list layouts."""
+        self._layouts = layouts
+        if isinstance(layouts, list):
+            self._layouts = self._writable_layouts()
+
+    def _owns(self, container: Any) -> bool:
+        """Check whether a container may be modified in place."""
+        return getattr(container, "owner", None) is self._owner
+
+    def _share(self) -> None:
+        """Give up ownership of all containers before sharing them."""
+        self._owner = object()
+
+    def _copy_group(self, group: Dict[str, Any]) -> Dict[str, Any]:
+        """Copy the styles of one type, including each style's properties."""
+        return _OwnedDict(
+            self._owner,
+            {
+                name: dict(style) if isinstance(style, dict) else style
+                for name, style in group.items()
+            },
+        )
+
+    def _writable_styles(self) -> Dict[str, Any]:
+        """Get the top-level styles dict, copying it if it is shared."""
+        if not self._owns(self._styles):
+            self._styles = _OwnedDict(self._owner, self._styles)
+        return self._styles
+
+    def _own_styles(self) -> None:
+        """Copy every part of the styles that is shared."""
+        styles = self._writable_styles()
+        for style_type, group in styles.items():
+            if isinstance(group, dict) and not self._owns(group):
+                styles[style_type] = self._copy_group(group)
+
+    def _writable_style_group(self, style_type: str) -> Dict[str, Any]:
+        """Get the styles of one type, copying them if they are shared."""
+        styles = self._writable_styles()
+        group = styles.get(style_type)
+        if group is None:
+            group = styles[style_type] = _OwnedDict(self._owner)
+        elif not self._owns(group):
+            group = styles[style_type] = self._copy_group(group)
+        return group
+
+    def _writable_layouts(self) -> List[Dict[str, str]]:
+        """Get the layouts list, copying it and its layouts if it is shared."""
+        if not self._owns(self._layouts):
+            self._layouts = _OwnedList(
+                self._owner,
+                (
+                    dict(layout) if isinstance(layout, dict) else layout
+                    for layout in self._layouts
+                ),
+            )
+        return self._layouts
 
     def validate(self) -> bool:
         """Validate template data.
@@ -101,10 +234,14 @@ class Template:
             raise ValueError(f"Invalid format: {self.metadata['format']}")
         if not isinstance(self.metadata.get("tags", []), list):
             raise ValueError("Template tags must be a list")
-        if not isinstance(self.styles, dict):
+        if not isinstance(self._styles, dict):
             raise ValueError("Template styles must be a dictionary")
-        if not isinstance(self.layouts, list):
+        if not isinstance(self._layouts, list):
             raise ValueError("Template layouts must be a list")
+        if self.parent is not None and not isinstance(self.parent, str):
+            raise ValueError("Template parent must be a string")
+        if self.parent == self.name:
+            raise ValueError("Template cannot inherit from itself")
         return True
 
     def add_style(
@@ -127,11 +264,8 @@ class Template:
         if not isinstance(style_data, dict):
             raise ValueError("Style data must be a dictionary")
 
-        if style_type not in self.styles:
-            self.styles[style_type] = {}
-        if style_name not in self.styles[style_type]:
-            self.styles[style_type][style_name] = {}
-        self.styles[style_type][style_name].update(style_data)
+        group = self._writable_style_group(style_type)
+        group.setdefault(style_name, {}).update(style_data)
 
     def add_layout(self, layout: Dict[str, str]) -> None:
         """Add a layout to the template.
@@ -146,7 +280,7 @@ class Template:
             raise ValueError("Layout must be a dictionary")
         if not layout:
             raise ValueError("Layout cannot be empty")
-        self.layouts.append(layout.copy())
+        self._writable_layouts().append(layout.copy())
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert template to dictionary.
@@ -158,16 +292,19 @@ class Template:
             ValueError: If template data is invalid
         """
         self.validate()
-        return {
+        data = {
             "name": self.name,
             "category": self.category,
             "metadata": self.metadata.copy(),
             "styles": {
                 k: {sk: sv.copy() for sk, sv in v.items()}
-                for k, v in self.styles.items()
+                for k, v in self._styles.items()
             },
-            "layouts": [layout.copy() for layout in self.layouts],
+            "layouts": [layout.copy() for layout in self._layouts],
         }
+        if self.parent:
+            data["parent"] = self.parent
+        return data
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "Template":
@@ -189,16 +326,13 @@ class Template:
         if "category" not in data:
             raise ValueError("Template data must include category")
 
-        template = cls(data["name"], data["category"])
+        template = cls(data["name"], data["category"], data.get("parent"))
         if "metadata" in data:
             template.metadata = data["metadata"].copy()
         if "styles" in data:
-            template.styles = {
-                k: {sk: sv.copy() for sk, sv in v.items()}
-                for k, v in data["styles"].items()
-            }
+            template.styles = data["styles"]
         if "layouts" in data:
-            template.layouts = [layout.copy() for layout in data["layouts"]]
+            template.layouts = data["layouts"]
 
         template.validate()
         return template
@@ -280,16 +414,20 @@ class Template:
         if not content:
             raise ValueError("Content cannot be empty")
 
-        # Convert content based on format
-        if self.metadata["format"] == "markdown":
-            html_content = markdown.markdown(content)
-        elif self.metadata["format"] == "html":
-            html_content = content
-        elif self.metadata["format"] == "text":
-            html_content = f"<pre>{content}</pre>"
-        else:
-            raise ValueError(f"Invalid format: {self.metadata['format']}")
+        return self.frame(self.convert(content))
 
+    def frame(self, html: str) -> str:
+        """Wrap converted HTML in the template borders and styles.
+
+        Blocks converted separately can be joined and framed once, so the
+        page style is applied to the whole preview rather than to each block.
+
+        Args:
+            html: HTML returned by ``convert``
+
+        Returns:
+            Framed HTML
+        """
         # Build style strings
         border_style = self._build_border_style()
         content_style = self._build_content_style()
@@ -298,11 +436,31 @@ class Template:
         return (
             f"<div style='{border_style}'>\n"
             f"<div style='{content_style}'>\n"
-            f"{html_content}\n"
+            f"{html}\n"
             "</div>\n"
             "</div>"
         )
 
+    def convert(self, content: str) -> str:
+        """Convert content to HTML based on the template format.
+
+        Args:
+            content: Content to convert
+
+        Returns:
+            HTML without the template borders and styles
+
+        Raises:
+            ValueError: If format is invalid
+        """
+        if self.metadata["format"] == "markdown":
+            return default_pool.convert(content)
+        if self.metadata["format"] == "html":
+            return content
+        if self.metadata["format"] == "text":
+            return f"<pre>{content}</pre>"
+        raise ValueError(f"Invalid format: {self.metadata['format']}")
+
     def _build_border_style(self) -> str:
         """Build border style string.
 
@@ -310,8 +468,8 @@ class Template:
             Style string
         """
         styles = []
-        if "borders" in self.styles:
-            for style_name, style_data in self.styles["borders"].items():
+        if "borders" in self._styles:
+            for style_name, style_data in self._styles["borders"].items():
                 styles.extend(f"{k}: {v}" for k, v in style_data.items())
         return "; ".join(styles)
 
@@ -323,19 +481,19 @@ class Template:
         """
         styles = []
         # Add font styles
-        if "fonts" in self.styles:
-            for style_name, style_data in self.styles["fonts"].items():
+        if "fonts" in self._styles:
+            for style_name, style_data in self._styles["fonts"].items():
                 styles.extend(f"{k}: {v}" for k, v in style_data.items())
         # Add text styles
-        if "text" in self.styles:
-            for style_name, style_data in self.styles["text"].items():
+        if "text" in self._styles:
+            for style_name, style_data in self._styles["text"].items():
                 styles.extend(f"{k}: {v}" for k, v in style_data.items())
         # Add background styles
-        if "background" in self.styles:
-            for style_name, style_data in self.styles["background"].items():
+        if "background" in self._styles:
+            for style_name, style_data in self._styles["background"].items():
                 styles.extend(f"{k}: {v}" for k, v in style_data.items())
         # Add layout styles
-        for layout in self.layouts:
+        for layout in self._layouts:
             styles.extend(f"{k}: {v}" for k, v in layout.items())
         return "; ".join(styles)
 
@@ -350,13 +508,17 @@ class Template:
         """
         if source is None:
             raise ValueError("Source template cannot be None")
-        if not isinstance(source.styles, dict):
+        if not isinstance(source._styles, dict):
             raise ValueError("Source template styles must be a dictionary")
 
-        for style_type, styles in source.styles.items():
-            if style_type not in self.styles:
-                self.styles[style_type] = {}
-            self.styles[style_type].update(styles)
+        source._share()
+        for style_type, styles in source._styles.items():
+            if style_type not in self._styles:
+                self._writable_styles()[style_type] = styles
+            elif styles:
+                self._writable_style_group(style_type).update(
+                    (name, dict(style)) for name, style in styles.items()
+                )
 
     def merge_layouts(self, source: "Template") -> None:
         """Merge layouts from source template.
@@ -369,11 +531,14 @@ class Template:
         """
         if source is None:
             raise ValueError("Source template cannot be None")
-        if not isinstance(source.layouts, list):
+        if not isinstance(source._layouts, list):
             raise ValueError("Source template layouts must be a list")
 
         # Keep existing layouts and add source layouts
-        self.layouts.extend(copy.deepcopy(source.layouts))
+        if source._layouts:
+            self._writable_layouts().extend(
+                layout.copy() for layout in source._layouts
+            )
 
     def merge(self, source: "Template") -> None:
         """Merge source template into this template.
@@ -392,15 +557,49 @@ class Template:
         self.merge_layouts(source)
 
     def copy(self) -> "Template":
-        """Create a deep copy of the template.
+        """Create a copy of the template.
+
+        Metadata is copied; styles and layouts are shared until either
+        template writes to them.
 
         Returns:
             Copy of template
         """
-        template = Template(self.name, self.category)
+        template = Template(self.name, self.category, self.parent)
+        template.metadata = copy.deepcopy(self.metadata)
+        self._share()
+        template._styles = self._styles
+        template._layouts = self._layouts
+        return template
+
+    def flatten(self, parent: "Template") -> "Template":
+        """Apply this template's overrides on top of its parent.
+
+        Args:
+            parent: Resolved parent template
+
+        Returns:
+            New template without a parent. Data it does not override is
+            shared with the parent.
+
+        Raises:
+            ValueError: If parent is None
+        """
+        if parent is None:
+            raise ValueError("Parent template cannot be None")
+
+        template = parent.copy()
+        template.name = self.name
+        template.category = self.category
+        template.parent = None
         template.metadata = copy.deepcopy(self.metadata)
-        template.styles = copy.deepcopy(self.styles)
-        template.layouts = copy.deepcopy(self.layouts)
+        for style_type, styles in self._styles.items():
+            for style_name, style_data in styles.items():
+                template.add_style(style_type, style_name, style_data)
+        if self._layouts:
+            template._writable_layouts().extend(
+                layout.copy() for layout in self._layouts
+            )
         return template
 
     def validate_metadata(self) -> bool:
@@ -433,9 +632,9 @@ class Template:
         Raises:
             ValueError: If styles are invalid
         """
-        if not isinstance(self.styles, dict):
+        if not isinstance(self._styles, dict):
             raise ValueError("Template styles must be a dictionary")
-        for category in self.styles.values():
+        for category in self._styles.values():
             if not isinstance(category, dict):
                 raise ValueError("Style category must be a dictionary")
             for style in category.values():
@@ -452,9 +651,9 @@ class Template:
         Raises:
             ValueError: If layouts are invalid
         """
-        if not isinstance(self.layouts, list):
+        if not isinstance(self._layouts, list):
             raise ValueError("Template layouts must be a list")
-        for layout in self.layouts:
+        for layout in self._layouts:
             if not isinstance(layout, dict):
                 raise ValueError("Layout must be a dictionary")
             if not layout:
@@ -462,18 +661,81 @@ class Template:
         return True
 
 
+def _template_from_data(data: Dict[str, Any]) -> Template:
+    """Build a template from stored data without validating it.
+
+    Args:
+        data: Template data read from a template file
+
+    Returns:
+        Template instance
+
+    Raises:
+        KeyError: If name or category is missing
+        ValueError: If name or category is empty
+    """
+    template = Template(data["name"], data["category"], data.get("parent"))
+    template.metadata = data.get("metadata", {})
+    template.styles = data.get("styles", {})
+    template.layouts = data.get("layouts", [])
+    return template
+
+
+def create_catalog(template_dir: Union[str, Path]) -> TemplateCatalog[Template]:
+    """Create the template catalog used by ``TemplateManager``.
+
+    Args:
+        template_dir: Directory for storing templates
+
+    Returns:
+        Catalog of the directory
+    """
+    return TemplateCatalog(
+        template_dir,
+        _template_from_data,
+        bundle_path=default_bundle_path(template_dir),
+        data_files=(CATEGORIES_FILE,),
+    )
+
+
 class TemplateManager:
     """Class for managing book templates."""
 
-    def __init__(self, template_dir: Union[str, Path]):
+    def __init__(
+        self,
+        template_dir: Union[str, Path],
+        catalog: Optional[TemplateCatalog[Template]] = None,
+    ):
         """Initialize template manager.
 
         Args:
             template_dir: Directory for storing templates
+            catalog: Catalog of template_dir to share with other managers.
+                If None, a new one is created. Categories added with
+                ``add_category`` stay private to this manager.
         """
         self.template_dir = Path(template_dir)
         self.template_dir.mkdir(parents=True, exist_ok=True)
-        self.categories: Set[str] = {"general"}
+        self.catalog: TemplateCatalog[Template] = catalog or create_catalog(
+            self.template_dir
+        )
+        self.resolver = TemplateResolver(self.catalog)
+        self.categories: Set[str] = {"general"} | self._load_categories()
+
+    def _load_categories(self) -> Set[str]:
+        """Load category names from the category list file.
+
+        Returns:
+            Set of category names, empty if the file is missing or invalid
+        """
+        data = self.catalog.data(CATEGORIES_FILE)
+        if not isinstance(data, dict) or not isinstance(data.get("categories"), list):
+            return set()
+        return {
+            entry["name"]
+            for entry in data["categories"]
+            if isinstance(entry, dict) and isinstance(entry.get("name"), str)
+        }
 
     def add_category(self, category: str, description: Optional[str] = None) -> bool:
         """Add a new template category.
@@ -541,31 +803,33 @@ class TemplateManager:
         try:
             with open(template_path, "w", encoding="utf-8") as f:
                 json.dump(template.to_dict(), f, indent=2)
+            self.catalog.update(template_path)
             return True
         except (OSError, json.JSONDecodeError) as e:
             logging.error(f"Failed to save template: {str(e)}")
             return False
 
-    def list_templates(self, category: Optional[str] = None) -> List[str]:
+    def list_templates(
+        self, category: Optional[str] = None, tag: Optional[str] = None
+    ) -> List[str]:
         """List all templates.
 
         Args:
             category: Optional category to filter by
+            tag: Optional tag to filter by
 
         Returns:
             List of template names
         """
-        templates = []
-        for template_path in self.template_dir.glob("*.json"):
-            try:
-                with open(template_path, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                    if category is None or data["category"] == category:
-                        templates.append(data["name"])
-            except (OSError, json.JSONDecodeError, KeyError) as e:
-                logging.error(f"Failed to load template during listing: {str(e)}")
-                continue
-        return templates
+        if tag is not None:
+            templates = self.catalog.by_tag(tag)
+            if category is not None:
+                templates = [t for t in templates if t.category == category]
+        elif category is not None:
+            templates = self.catalog.by_category(category)
+        else:
+            templates = self.catalog.items()
+        return [template.name for template in templates]
 
     def search_templates(self, query: str) -> List[Template]:
         """Search for templates.
@@ -578,28 +842,31 @@ class TemplateManager:
         """
         query = query.lower()
         results = []
-        for template_path in self.template_dir.glob("*.json"):
-            try:
-                with open(template_path, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                    metadata = data.get("metadata", {})
-                    description = metadata.get("description", "").lower()
-                    tags = metadata.get("tags", [])
-                    if (
-                        query in data["name"].lower()
-                        or query in description
-                        or any(query in tag.lower() for tag in tags)
-                    ):
-                        template = Template(data["name"], data["category"])
-                        template.metadata = metadata
-                        template.styles = data.get("styles", {})
-                        template.layouts = data.get("layouts", [])
-                        results.append(template)
-            except (OSError, json.JSONDecodeError, KeyError) as e:
-                logging.error(f"Failed to load template during search: {str(e)}")
-                continue
+        for template in self.catalog.items():
+            description = template.metadata.get("description", "").lower()
+            tags = template.metadata.get("tags", [])
+            if (
+                query in template.name.lower()
+                or query in description
+                or any(query in tag.lower() for tag in tags)
+            ):
+                results.append(template.copy())
         return results
 
+    def resolve_template(self, name: str) -> Optional[Template]:
+        """Get a template with its inherited styles and layouts applied.
+
+        Args:
+            name: Template name
+
+        Returns:
+            Flattened template or None if not found
+
+        Raises:
+            ValueError: If a parent is missing or the chain has a cycle
+        """
+        return self.resolver.resolve(name)
+
     def load_template(self, name: str) -> Optional[Template]:
         """Load a template by name.
 
@@ -0,0 +1,163 @@
+"""Template bundle module.
+
+A template bundle packs the data of every file in a template directory into
+one versioned file, so that the catalog can start up with a single read
+instead of opening each template separately. Each bundled file keeps the
+modification stamp it had when it was packed, which is how stale entries
+are detected. The bundle also keeps the stamp of the directory itself, so
+a catalog can trust the whole bundle without listing the directory when no
+file was added, removed or renamed since it was written.
+
+Bundles are written to a cache directory rather than into the template
+directory, which may be part of a source tree.
+"""
+
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple, Union
+
+BUNDLE_NAME = ".templates.bundle"
+BUNDLE_FORMAT = "book-editor-template-bundle"
+BUNDLE_VERSION = 2
+# Environment variable that overrides the cache directory
+CACHE_DIR_ENV = "BOOK_EDITOR_CACHE_DIR"
+
+# Modification stamp: mtime in nanoseconds and size
+Stamp = Tuple[int, int]
+# Bundled source: modification stamp and decoded JSON data (None if undecodable)
+BundledSource = Tuple[Stamp, Any]
+
+
+def cache_dir() -> Path:
+    """Get the directory for cached files.
+
+    Returns:
+        ``$BOOK_EDITOR_CACHE_DIR`` if set, otherwise ``book-editor`` in
+        ``$XDG_CACHE_HOME`` or ``~/.cache``
+    """
+    override = os.getenv(CACHE_DIR_ENV)
+    if override:
+        return Path(override)
+    base = os.getenv("XDG_CACHE_HOME") or str(Path.home() / ".cache")
+    return Path(base) / "book-editor"
+
+
+def default_bundle_path(template_dir: Union[str, Path]) -> Path:
+    """Get the cache path of the bundle for a template directory.
+
+    Args:
+        template_dir: Template directory
+
+    Returns:
+        Path of the bundle, unique to the directory
+    """
+    key = hashlib.sha256(str(Path(template_dir).resolve()).encode("utf-8"))
+    return cache_dir() / f"templates-{key.hexdigest()[:16]}.bundle"
+
+
+def _stamp(value: Any) -> Stamp:
+    """Read a stored stamp.
+
+    Raises:
+        TypeError: If the value is not a pair
+        ValueError: If the pair does not hold numbers
+    """
+    mtime_ns, size = value
+    return (int(mtime_ns), int(size))
+
+
+class TemplateBundle:
+    """Reads and writes packed template bundles."""
+
+    def __init__(self, path: Union[str, Path]):
+        """Initialize template bundle.
+
+        Args:
+            path: Path of the bundle file
+        """
+        self.path = Path(path)
+
+    def load(self) -> Dict[str, BundledSource]:
+        """Load the bundled sources.
+
+        Returns:
+            Mapping of source file name to its stamp and data. Empty if the
+            bundle is missing, unreadable or has a different version.
+        """
+        return self.read()[1]
+
+    def read(self) -> Tuple[Optional[Stamp], Dict[str, BundledSource]]:
+        """Load the bundled sources and the directory stamp.
+
+        Returns:
+            Tuple of the stamp the template directory had when the bundle was
+            written (None if unknown) and the bundled sources. The sources
+            are empty if the bundle is missing, unreadable or has a
+            different version.
+        """
+        try:
+            with self.path.open("r", encoding="utf-8") as f:
+                bundle = json.load(f)
+        except FileNotFoundError:
+            return None, {}
+        except (OSError, json.JSONDecodeError) as e:
+            logging.error(f"Failed to load template bundle: {str(e)}")
+            return None, {}
+
+        if (
+            not isinstance(bundle, dict)
+            or bundle.get("format") != BUNDLE_FORMAT
+            or bundle.get("version") != BUNDLE_VERSION
+            or not isinstance(bundle.get("sources"), dict)
+        ):
+            return None, {}
+
+        sources: Dict[str, BundledSource] = {}
+        for name, source in bundle["sources"].items():
+            try:
+                sources[name] = (_stamp(source["stamp"]), source["data"])
+            except (KeyError, TypeError, ValueError):
+                continue
+        try:
+            directory: Optional[Stamp] = _stamp(bundle.get("directory"))
+        except (TypeError, ValueError):
+            directory = None
+        return directory, sources
+
+    def save(
+        self, sources: Dict[str, BundledSource], directory: Optional[Stamp] = None
+    ) -> None:
+        """Write the bundle atomically.
+
+        Args:
+            sources: Mapping of source file name to its stamp and data
+            directory: Stamp of the template directory the sources were read
+                from, if it is known to match them
+
+        Raises:
+            OSError: If the bundle cannot be written
+        """
+        bundle = {
+            "format": BUNDLE_FORMAT,
+            "version": BUNDLE_VERSION,
+            "directory": list(directory) if directory is not None else None,
+            "sources": {
+                name: {"stamp": list(stamp), "data": data}
+                for name, (stamp, data) in sorted(sources.items())
+            },
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(f"{self.path.name}.tmp")
+        with tmp_path.open("w", encoding="utf-8") as f:
+            json.dump(bundle, f, separators=(",", ":"))
+        os.replace(tmp_path, self.path)
+
+    def delete(self) -> None:
+        """Delete the bundle file if it exists."""
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
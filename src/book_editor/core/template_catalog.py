@@ -0,0 +1,450 @@
+"""Template catalog module.
+
+Keeps an in-memory index of the templates in a directory so that listings,
+category lookups and tag filters do not re-read every template file. Each
+file is parsed once and only re-parsed when its modification time or size
+changes. Lookups do not scan the directory: they re-check it only when the
+directory itself changed (a file was added, removed or renamed) or when the
+refresh interval has passed since the last scan, which is how files edited
+in place are noticed. Between scans a lookup costs one ``stat`` of the
+directory plus the size of its result.
+
+When a bundle path is given, the catalog starts from the packed template
+bundle. If the directory stamp is the one recorded in the bundle, the
+bundle is used as it is, without listing the directory or opening any
+file; files edited in place are then picked up by the first interval
+refresh. Otherwise only files that changed since the bundle was written
+are opened. The bundle is rewritten after a refresh that found changes.
+"""
+
+import json
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generic,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+    Union,
+)
+
+from src.book_editor.core.template_bundle import BundledSource, TemplateBundle
+
+T = TypeVar("T")
+
+# Errors that mark a template file as invalid rather than failing the scan
+LOAD_ERRORS = (OSError, json.JSONDecodeError, KeyError, TypeError, ValueError)
+# Seconds between scans that look for files edited in place
+DEFAULT_REFRESH_INTERVAL = 2.0
+
+
+class _Entry(Generic[T]):
+    """Catalog entry for a single template file."""
+
+    __slots__ = ("stamp", "data", "item", "name", "category", "tags")
+
+    def __init__(self, stamp: Tuple[int, int], data: Any, item: Optional[T]):
+        self.stamp = stamp
+        self.data = data
+        self.item = item
+        if not isinstance(data, dict):
+            data = {}
+        self.name: Optional[str] = data.get("name") if item is not None else None
+        self.category: Optional[str] = data.get("category") if item is not None else None
+        metadata = data.get("metadata") if item is not None else None
+        tags = metadata.get("tags", []) if isinstance(metadata, dict) else []
+        self.tags: List[str] = [t for t in tags if isinstance(t, str)]
+
+
+class TemplateCatalog(Generic[T]):
+    """In-memory catalog of template files indexed by name, category and tag."""
+
+    def __init__(
+        self,
+        template_dir: Union[str, Path],
+        loader: Callable[[Dict[str, Any]], T],
+        pattern: str = "*.json",
+        bundle_path: Optional[Union[str, Path]] = None,
+        refresh_interval: float = DEFAULT_REFRESH_INTERVAL,
+        clock: Callable[[], float] = time.monotonic,
+        data_files: Iterable[str] = (),
+    ):
+        """Initialize template catalog.
+
+        Args:
+            template_dir: Directory containing template files
+            loader: Callable that builds an item from template data. It should
+                raise KeyError or ValueError for invalid data.
+            pattern: Glob pattern for template files
+            bundle_path: Optional path of a template bundle to start from
+                and keep up to date
+            refresh_interval: Seconds after which lookups scan the directory
+                again even if it did not change
+            clock: Time source
+            data_files: Names of files in the directory that hold other data,
+                such as the category list. They are decoded for ``data`` but
+                not loaded as templates.
+
+        Raises:
+            ValueError: If refresh_interval is negative
+        """
+        if refresh_interval < 0:
+            raise ValueError("refresh_interval cannot be negative")
+        self.template_dir = Path(template_dir)
+        self.pattern = pattern
+        self._loader = loader
+        self._lock = threading.RLock()
+        self._entries: Dict[Path, _Entry[T]] = {}
+        self._by_name: Dict[str, Path] = {}
+        self._by_category: Dict[str, Dict[Path, None]] = {}
+        self._by_tag: Dict[str, Dict[Path, None]] = {}
+        self._bundle = TemplateBundle(bundle_path) if bundle_path else None
+        self._bundled: Optional[Dict[str, BundledSource]] = None
+        self._bundle_dirty = False
+        self.refresh_interval = refresh_interval
+        self._clock = clock
+        # Time and directory stamp of the last full scan
+        self._scanned_at: Optional[float] = None
+        self._dir_stamp: Optional[Tuple[int, int]] = None
+        # Number of entries with a valid item
+        self._valid = 0
+        self.data_files = frozenset(data_files)
+
+    @staticmethod
+    def _stamp(path: Path) -> Optional[Tuple[int, int]]:
+        """Get the modification stamp of a file.
+
+        Args:
+            path: File path
+
+        Returns:
+            Tuple of modification time and size, or None if the file is missing
+        """
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def _parse(self, path: Path, stamp: Tuple[int, int]) -> _Entry[T]:
+        """Parse a template file into a catalog entry.
+
+        The bundled data is used when the file is unchanged since the bundle
+        was written; otherwise the file itself is read.
+
+        Args:
+            path: File path
+            stamp: Modification stamp of the file
+
+        Returns:
+            Catalog entry. Invalid files get an entry without an item so they
+            are not parsed again until they change.
+        """
+        bundled = self._bundled.get(path.name) if self._bundled else None
+        if bundled is not None and bundled[0] == stamp:
+            data = bundled[1]
+        else:
+            self._bundle_dirty = True
+            try:
+                with path.open("r", encoding="utf-8") as f:
+                    data = json.load(f)
+            except LOAD_ERRORS as e:
+                logging.error(f"Failed to load template {path.name}: {str(e)}")
+                return _Entry(stamp, None, None)
+        return self._entry(path, stamp, data)
+
+    def _entry(self, path: Path, stamp: Tuple[int, int], data: Any) -> _Entry[T]:
+        """Build a catalog entry from decoded file data.
+
+        Args:
+            path: File path
+            stamp: Modification stamp of the file
+            data: Decoded JSON data
+
+        Returns:
+            Catalog entry, without an item for data files and invalid
+            templates
+        """
+        if path.name in self.data_files:
+            return _Entry(stamp, data, None)
+        try:
+            if not isinstance(data, dict):
+                raise ValueError("Template data must be a dictionary")
+            return _Entry(stamp, data, self._loader(data))
+        except LOAD_ERRORS as e:
+            logging.error(f"Failed to load template {path.name}: {str(e)}")
+            return _Entry(stamp, data, None)
+
+    def _index(self, path: Path, entry: _Entry[T]) -> None:
+        """Add an entry to the catalog indexes."""
+        self._entries[path] = entry
+        if entry.item is None:
+            return
+        self._valid += 1
+        if entry.name is not None:
+            self._by_name[entry.name] = path
+        if entry.category is not None:
+            self._by_category.setdefault(entry.category, {})[path] = None
+        for tag in entry.tags:
+            self._by_tag.setdefault(tag, {})[path] = None
+
+    def _unindex(self, path: Path) -> None:
+        """Remove an entry from the catalog indexes."""
+        entry = self._entries.pop(path, None)
+        if entry is None:
+            return
+        self._bundle_dirty = True
+        if entry.item is None:
+            return
+        self._valid -= 1
+        if entry.name is not None and self._by_name.get(entry.name) == path:
+            del self._by_name[entry.name]
+        if entry.category is not None:
+            self._discard(self._by_category, entry.category, path)
+        for tag in entry.tags:
+            self._discard(self._by_tag, tag, path)
+
+    @staticmethod
+    def _discard(index: Dict[str, Dict[Path, None]], key: str, path: Path) -> None:
+        """Remove a path from one bucket of an index."""
+        bucket = index.get(key)
+        if bucket is None:
+            return
+        bucket.pop(path, None)
+        if not bucket:
+            del index[key]
+
+    def refresh(self) -> None:
+        """Bring the catalog up to date with the template directory.
+
+        Every file is checked, but only files whose modification stamp
+        changed are parsed again.
+        """
+        with self._lock:
+            self._scanned_at = self._clock()
+            self._dir_stamp = self._stamp(self.template_dir)
+            if self._bundle is not None and self._bundled is None:
+                self._bundled = self._bundle.read()[1]
+            seen = set()
+            if self.template_dir.is_dir():
+                for path in self.template_dir.glob(self.pattern):
+                    seen.add(path)
+                    self._refresh_path(path)
+            for path in [p for p in self._entries if p not in seen]:
+                self._unindex(path)
+            if self._bundled is not None and set(self._bundled) != {
+                p.name for p in seen
+            }:
+                self._bundle_dirty = True
+            if self._bundle_dirty:
+                self._save_bundle()
+
+    def refresh_if_stale(self) -> None:
+        """Refresh the catalog if the directory may have changed.
+
+        The directory is scanned if it was never scanned, if its own
+        modification stamp changed or if the refresh interval has passed.
+        """
+        with self._lock:
+            if self._scanned_at is None and self._load_bundle():
+                return
+            if (
+                self._scanned_at is None
+                or self._clock() - self._scanned_at >= self.refresh_interval
+                or self._stamp(self.template_dir) != self._dir_stamp
+            ):
+                self.refresh()
+
+    def _load_bundle(self) -> bool:
+        """Start from the bundle if the directory did not change since it was written.
+
+        Returns:
+            True if the catalog was filled from the bundle without a scan
+        """
+        if self._bundle is None or self._bundled is not None:
+            return False
+        directory, self._bundled = self._bundle.read()
+        stamp = self._stamp(self.template_dir)
+        if directory is None or directory != stamp:
+            return False
+        for name, (file_stamp, data) in self._bundled.items():
+            path = self.template_dir / name
+            self._index(path, self._entry(path, file_stamp, data))
+        self._scanned_at = self._clock()
+        self._dir_stamp = stamp
+        return True
+
+    def _save_bundle(self) -> None:
+        """Write the current catalog contents to the bundle."""
+        self._bundle_dirty = False
+        if self._bundle is None:
+            return
+        self._bundled = {
+            path.name: (entry.stamp, entry.data)
+            for path, entry in self._entries.items()
+        }
+        try:
+            self._bundle.save(self._bundled, self._dir_stamp)
+        except OSError as e:
+            logging.error(f"Failed to save template bundle: {str(e)}")
+
+    def data(self, file_name: str) -> Any:
+        """Get the decoded data of a file in the template directory.
+
+        This also covers files that are not valid templates, such as the
+        category list.
+
+        Args:
+            file_name: Name of the file within the template directory
+
+        Returns:
+            Decoded JSON data or None if the file is missing or undecodable
+        """
+        with self._lock:
+            self.refresh_if_stale()
+            entry = self._entries.get(self.template_dir / file_name)
+            return entry.data if entry is not None else None
+
+    def _refresh_path(self, path: Path) -> None:
+        """Re-parse a single file if it changed since it was indexed."""
+        stamp = self._stamp(path)
+        if stamp is None:
+            self._unindex(path)
+            return
+        entry = self._entries.get(path)
+        if entry is not None and entry.stamp == stamp:
+            return
+        self._unindex(path)
+        self._index(path, self._parse(path, stamp))
+
+    def update(self, path: Union[str, Path]) -> None:
+        """Update the catalog after a file was written or removed.
+
+        Args:
+            path: Path of the changed file
+        """
+        with self._lock:
+            self._refresh_path(Path(path))
+            self._sync_bundle()
+
+    def remove(self, path: Union[str, Path]) -> None:
+        """Remove a file from the catalog.
+
+        Args:
+            path: Path of the removed file
+        """
+        with self._lock:
+            self._unindex(Path(path))
+            self._sync_bundle()
+
+    def _sync_bundle(self) -> None:
+        """Rescan and rewrite the bundle after a change made through the catalog.
+
+        The bundle records a directory stamp, so it is only written from a
+        full scan, never from a catalog that may be behind the directory.
+        """
+        if self._bundle is not None and self._bundle_dirty:
+            self.refresh()
+
+    def clear(self) -> None:
+        """Drop all cached entries."""
+        with self._lock:
+            self._entries.clear()
+            self._bundled = None
+            self._scanned_at = None
+            self._valid = 0
+            self._by_name.clear()
+            self._by_category.clear()
+            self._by_tag.clear()
+
+    def items(self) -> List[T]:
+        """Get all valid catalog items.
+
+        Returns:
+            List of items, ordered by file path
+        """
+        with self._lock:
+            self.refresh_if_stale()
+            return [
+                self._entries[path].item  # type: ignore[misc]
+                for path in sorted(self._entries)
+                if self._entries[path].item is not None
+            ]
+
+    def get(self, name: str, refresh: bool = True) -> Optional[T]:
+        """Get an item by template name.
+
+        Args:
+            name: Template name
+            refresh: Whether to check the template directory for changes first,
+                as the other lookups do
+
+        Returns:
+            Item or None if not found
+        """
+        with self._lock:
+            if refresh:
+                self.refresh_if_stale()
+            path = self._by_name.get(name)
+            return self._entries[path].item if path is not None else None
+
+    def by_category(self, category: str) -> List[T]:
+        """Get all items in a category.
+
+        Args:
+            category: Category name
+
+        Returns:
+            List of items, ordered by file path
+        """
+        with self._lock:
+            self.refresh_if_stale()
+            paths = self._by_category.get(category, {})
+            return [self._entries[p].item for p in sorted(paths)]  # type: ignore[misc]
+
+    def by_tag(self, tag: str) -> List[T]:
+        """Get all items with a tag.
+
+        Args:
+            tag: Tag name
+
+        Returns:
+            List of items, ordered by file path
+        """
+        with self._lock:
+            self.refresh_if_stale()
+            paths = self._by_tag.get(tag, {})
+            return [self._entries[p].item for p in sorted(paths)]  # type: ignore[misc]
+
+    def categories(self) -> List[str]:
+        """Get all categories with at least one template.
+
+        Returns:
+            Sorted list of category names
+        """
+        with self._lock:
+            self.refresh_if_stale()
+            return sorted(self._by_category)
+
+    def tags(self) -> List[str]:
+        """Get all tags used by templates.
+
+        Returns:
+            Sorted list of tag names
+        """
+        with self._lock:
+            self.refresh_if_stale()
+            return sorted(self._by_tag)
+
+    def __len__(self) -> int:
+        """Get the number of valid templates in the catalog."""
+        with self._lock:
+            self.refresh_if_stale()
+            return self._valid
@@ -8,7 +8,9 @@ import re
 from pathlib import Path
 from typing import List, Optional, Union
 
-from .template import Template
+from .template import Template, create_catalog
+from .template_catalog import TemplateCatalog
+from .template_resolver import TemplateResolver
 
 # Windows reserved filenames
 RESERVED_NAMES = {
@@ -24,11 +26,19 @@ MAX_FILENAME_LENGTH = 255
 class TemplateManager:
     """Manages templates for the book editor."""
 
-    def __init__(self, template_dir: Union[str, Path]):
+    def __init__(
+        self,
+        template_dir: Union[str, Path],
+        catalog: Optional[TemplateCatalog[Template]] = None,
+    ):
         """Initialize template manager.
 
         Args:
             template_dir: Path to template directory
+            catalog: Catalog of template_dir to share with other managers.
+                If None, a new one is created with ``create_catalog``, so
+                every manager of a directory reads and bundles its
+                templates the same way.
 
         Raises:
             ValueError: If template directory path is empty
@@ -38,6 +48,8 @@ class TemplateManager:
 
         self.template_dir = Path(template_dir)
         self.template_dir.mkdir(parents=True, exist_ok=True)
+        self.catalog = catalog or create_catalog(self.template_dir)
+        self.resolver = TemplateResolver(self.catalog)
 
     def _sanitize_filename(self, name: str) -> str:
         """Sanitize filename to be safe for filesystem.
@@ -117,6 +129,7 @@ class TemplateManager:
 
         with path.open("w") as f:
             json.dump(template.to_dict(), f, indent=2)
+        self.catalog.update(path)
 
         return path
 
@@ -155,22 +168,43 @@ class TemplateManager:
         path = self.template_dir / f"{name.replace(' ', '_')}.json"
         return self.load_template(path)
 
-    def list_templates(self, category: Optional[str] = None) -> List[Template]:
+    def resolve_template(self, name: str) -> Optional[Template]:
+        """Get a template with its inherited styles and layouts applied.
+
+        Args:
+            name: Template name
+
+        Returns:
+            Flattened template or None if not found
+
+        Raises:
+            ValueError: If a parent is missing or the chain has a cycle
+        """
+        if not name:
+            return None
+        return self.resolver.resolve(name)
+
+    def list_templates(
+        self, category: Optional[str] = None, tag: Optional[str] = None
+    ) -> List[Template]:
         """List all templates.
 
         Args:
             category: Optional category to filter by
+            tag: Optional tag to filter by
 
         Returns:
             List of templates
         """
-        templates = []
-        for path in self.template_dir.glob("*.json"):
-            template = self.load_template(path)
-            if template is not None:
-                if category is None or template.category == category:
-                    templates.append(template)
-        return templates
+        if tag is not None:
+            templates = self.catalog.by_tag(tag)
+            if category is not None:
+                templates = [t for t in templates if t.category == category]
+        elif category is not None:
+            templates = self.catalog.by_category(category)
+        else:
+            templates = self.catalog.items()
+        return [template.copy() for template in templates]
 
     def delete_template(self, name: str) -> bool:
         """Delete template.
@@ -187,6 +221,7 @@ class TemplateManager:
         path = self.template_dir / f"{name.replace(' ', '_')}.json"
         if path.exists():
             path.unlink()
+            self.catalog.remove(path)
             return True
         return False
 
@@ -196,10 +231,7 @@ class TemplateManager:
         Returns:
             List of category names
         """
-        categories = set()
-        for template in self.list_templates():
-            categories.add(template.category)
-        return sorted(list(categories))
+        return self.catalog.categories()
 
     def validate_template_name(self, name: str) -> bool:
         """Validate template name.
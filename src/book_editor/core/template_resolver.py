@@ -0,0 +1,96 @@
+"""Template resolver module.
+
+Resolves template inheritance chains against a template catalog. The
+flattened template for each name is memoized together with the catalog
+entries it was built from, and is only rebuilt when one of those entries
+changes.
+"""
+
+import threading
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
+
+from src.book_editor.core.template_catalog import TemplateCatalog
+
+if TYPE_CHECKING:
+    from src.book_editor.core.template import Template
+
+# Flattened template and the chain of catalog templates it was built from
+_Resolved = Tuple["Template", Tuple["Template", ...]]
+
+
+class TemplateResolver:
+    """Resolves and memoizes flattened templates."""
+
+    def __init__(self, catalog: "TemplateCatalog[Template]"):
+        """Initialize template resolver.
+
+        Args:
+            catalog: Catalog to look templates up in
+        """
+        self.catalog = catalog
+        self._lock = threading.RLock()
+        self._memo: Dict[str, _Resolved] = {}
+
+    def resolve(self, name: str) -> Optional["Template"]:
+        """Get the flattened template for a name.
+
+        Args:
+            name: Template name
+
+        Returns:
+            Flattened template or None if the template does not exist
+
+        Raises:
+            ValueError: If a parent is missing or the chain has a cycle
+        """
+        with self._lock:
+            self.catalog.refresh_if_stale()
+            resolved = self._resolve(name, ())
+            return resolved[0].copy() if resolved is not None else None
+
+    def clear(self) -> None:
+        """Drop all memoized templates."""
+        with self._lock:
+            self._memo.clear()
+
+    def _is_current(self, chain: Tuple["Template", ...]) -> bool:
+        """Check that no template in a chain changed in the catalog."""
+        return all(
+            self.catalog.get(template.name, refresh=False) is template
+            for template in chain
+        )
+
+    def _resolve(self, name: str, visiting: Tuple[str, ...]) -> Optional[_Resolved]:
+        """Resolve a template, reusing memoized results that are current.
+
+        Args:
+            name: Template name
+            visiting: Names of the templates currently being resolved
+
+        Returns:
+            Flattened template and its chain, or None if not found
+
+        Raises:
+            ValueError: If a parent is missing or the chain has a cycle
+        """
+        if name in visiting:
+            raise ValueError(f"Template inheritance cycle: {' -> '.join(visiting + (name,))}")
+
+        template = self.catalog.get(name, refresh=False)
+        if template is None:
+            self._memo.pop(name, None)
+            return None
+        if not template.parent:
+            return template, (template,)
+
+        memo = self._memo.get(name)
+        if memo is not None and self._is_current(memo[1]):
+            return memo
+
+        parent = self._resolve(template.parent, visiting + (name,))
+        if parent is None:
+            raise ValueError(f"Parent template not found: {template.parent}")
+
+        resolved = (template.flatten(parent[0]), (template,) + parent[1])
+        self._memo[name] = resolved
+        return resolved
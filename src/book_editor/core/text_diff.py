@@ -0,0 +1,50 @@
+"""Text diff module.
+
+Computes and applies single-span deltas between two versions of a text.
+"""
+
+from typing import Tuple
+
+
+def make_delta(old: str, new: str) -> Tuple[int, int, str]:
+    """Compute the span of old text replaced to get the new text.
+
+    Args:
+        old: Previous text
+        new: New text
+
+    Returns:
+        Tuple (start, end, text): ``old[start:end]`` is replaced by text
+    """
+    limit = min(len(old), len(new))
+    # Binary search on slices keeps the comparisons in C
+    low, high = 0, limit
+    while low < high:
+        mid = (low + high + 1) // 2
+        if old[:mid] == new[:mid]:
+            low = mid
+        else:
+            high = mid - 1
+    start = low
+    low, high = 0, limit - start
+    while low < high:
+        mid = (low + high + 1) // 2
+        if old[len(old) - mid:] == new[len(new) - mid:]:
+            low = mid
+        else:
+            high = mid - 1
+    return start, len(old) - low, new[start:len(new) - low]
+
+
+def apply_delta(text: str, delta: Tuple[int, int, str]) -> str:
+    """Apply a delta computed by ``make_delta``.
+
+    Args:
+        text: Text the delta was computed against
+        delta: Tuple (start, end, replacement)
+
+    Returns:
+        New text
+    """
+    start, end, replacement = delta
+    return text[:start] + replacement + text[end:]
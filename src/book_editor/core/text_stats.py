@@ -0,0 +1,223 @@
+"""Text statistics module.
+
+Computes word, character, line, paragraph and sentence counts and the
+average word length in one pass over the text. Paragraphs (blocks separated
+by blank lines) are counted independently, so ``TextStatistics`` can keep
+per-paragraph counts and recount only the paragraphs that changed between
+two versions of a text.
+"""
+
+import re
+import string
+from typing import Any, Dict, Iterable, List, NamedTuple
+
+# Blank lines separate paragraphs
+PARAGRAPH_BREAK = re.compile(r"\n[ \t]*\n")
+WORD = re.compile(r"\S+")
+
+SENTENCE_END = ".!?"
+# Closing characters that may follow a sentence terminator, as in 'end."'
+CLOSING = "\"')]}”’"
+PUNCTUATION = string.punctuation + "“”‘’"
+
+
+class ParagraphCounts(NamedTuple):
+    """Counts for a single paragraph."""
+
+    words: int
+    sentences: int
+    word_chars: int
+
+
+EMPTY_COUNTS = ParagraphCounts(0, 0, 0)
+
+
+def count_paragraph(paragraph: str) -> ParagraphCounts:
+    """Count words and sentences of a paragraph in one pass over its words.
+
+    A sentence ends at a word ending in '.', '!' or '?', optionally followed
+    by closing quotes or brackets. Trailing words without a terminator count
+    as a final sentence.
+
+    Args:
+        paragraph: Paragraph text
+
+    Returns:
+        Paragraph counts
+    """
+    words = sentences = word_chars = 0
+    open_sentence = False
+    for match in WORD.finditer(paragraph):
+        word = match.group()
+        words += 1
+        word_chars += len(word.strip(PUNCTUATION))
+        stripped = word.rstrip(CLOSING)
+        if stripped and stripped[-1] in SENTENCE_END:
+            sentences += 1
+            open_sentence = False
+        else:
+            open_sentence = True
+    if open_sentence:
+        sentences += 1
+    return ParagraphCounts(words, sentences, word_chars)
+
+
+def split_paragraphs(text: str) -> List[str]:
+    """Split text into paragraphs.
+
+    Args:
+        text: Text to split
+
+    Returns:
+        List of paragraphs, including blank ones
+    """
+    return PARAGRAPH_BREAK.split(text) if text else []
+
+
+def _build_stats(
+    chars: int, lines: int, paragraphs: int, counts: ParagraphCounts
+) -> Dict[str, Any]:
+    """Build the statistics dictionary.
+
+    Args:
+        chars: Character count
+        lines: Line count
+        paragraphs: Number of non-blank paragraphs
+        counts: Summed paragraph counts
+
+    Returns:
+        Text statistics
+    """
+    return {
+        "word_count": counts.words,
+        "char_count": chars,
+        "line_count": lines,
+        "paragraph_count": paragraphs,
+        "sentence_count": counts.sentences,
+        "avg_word_length": counts.word_chars / counts.words if counts.words else 0.0,
+    }
+
+
+def _add(a: ParagraphCounts, b: ParagraphCounts, sign: int = 1) -> ParagraphCounts:
+    """Add or subtract paragraph counts."""
+    return ParagraphCounts(
+        a.words + sign * b.words,
+        a.sentences + sign * b.sentences,
+        a.word_chars + sign * b.word_chars,
+    )
+
+
+def analyze_chunks(chunks: Iterable[str]) -> Dict[str, Any]:
+    """Compute text statistics in a single streaming pass.
+
+    Only the unfinished paragraph at the end of each chunk is carried over
+    to the next one, so memory does not grow with the length of the text.
+
+    Args:
+        chunks: Text chunks, in order
+
+    Returns:
+        Text statistics
+    """
+    chars = newlines = paragraphs = 0
+    totals = EMPTY_COUNTS
+    tail = ""
+    for chunk in chunks:
+        if not chunk:
+            continue
+        chars += len(chunk)
+        newlines += chunk.count("\n")
+        parts = PARAGRAPH_BREAK.split(tail + chunk)
+        tail = parts.pop()
+        for paragraph in parts:
+            if paragraph.strip():
+                paragraphs += 1
+                totals = _add(totals, count_paragraph(paragraph))
+    if tail.strip():
+        paragraphs += 1
+        totals = _add(totals, count_paragraph(tail))
+    lines = newlines + 1 if chars else 0
+    return _build_stats(chars, lines, paragraphs, totals)
+
+
+def analyze_text(text: str) -> Dict[str, Any]:
+    """Compute text statistics.
+
+    Args:
+        text: Text to analyze
+
+    Returns:
+        Text statistics
+    """
+    return analyze_chunks([text])
+
+
+class TextStatistics:
+    """Incremental text statistics with per-paragraph counts."""
+
+    def __init__(self) -> None:
+        """Initialize text statistics."""
+        self._paragraphs: List[str] = []
+        self._counts: List[ParagraphCounts] = []
+        self._totals = EMPTY_COUNTS
+        self._non_blank = 0
+        self._stats = _build_stats(0, 0, 0, EMPTY_COUNTS)
+        # Number of paragraphs recounted by the last update
+        self.recounted = 0
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """Get the statistics of the last analyzed text."""
+        return self._stats.copy()
+
+    def update(self, text: str) -> Dict[str, Any]:
+        """Analyze a new version of the text.
+
+        Paragraphs shared with the previous version at the start and end are
+        kept; only the changed paragraphs in between are recounted.
+
+        Args:
+            text: New text
+
+        Returns:
+            Text statistics
+        """
+        paragraphs = split_paragraphs(text)
+        old = self._paragraphs
+        limit = min(len(old), len(paragraphs))
+
+        start = 0
+        while start < limit and old[start] == paragraphs[start]:
+            start += 1
+        end = 0
+        while end < limit - start and old[-1 - end] == paragraphs[-1 - end]:
+            end += 1
+
+        removed = self._counts[start:len(old) - end]
+        for counts, paragraph in zip(removed, old[start:len(old) - end]):
+            self._totals = _add(self._totals, counts, -1)
+            self._non_blank -= bool(paragraph.strip())
+
+        added = []
+        for paragraph in paragraphs[start:len(paragraphs) - end]:
+            counts = count_paragraph(paragraph) if paragraph.strip() else EMPTY_COUNTS
+            added.append(counts)
+            self._totals = _add(self._totals, counts)
+            self._non_blank += bool(paragraph.strip())
+
+        self._counts[start:len(old) - end] = added
+        self.recounted = len(added)
+        self._paragraphs = paragraphs
+
+        lines = text.count("\n") + 1 if text else 0
+        self._stats = _build_stats(len(text), lines, self._non_blank, self._totals)
+        return self.stats
+
+    def reset(self) -> None:
+        """Forget the previous text."""
+        self._paragraphs = []
+        self._counts = []
+        self._totals = EMPTY_COUNTS
+        self._non_blank = 0
+        self._stats = _build_stats(0, 0, 0, EMPTY_COUNTS)
+        self.recounted = 0
@@ -1,8 +1,12 @@
 """Utility functions and classes."""
 
 import json
+import multiprocessing
+import os
 from datetime import datetime
-from typing import Any
+from pathlib import Path
+from multiprocessing.context import BaseContext
+from typing import Any, Union
 
 
 class DateTimeEncoder(json.JSONEncoder):
@@ -20,3 +24,36 @@ class DateTimeEncoder(json.JSONEncoder):
         if isinstance(obj, datetime):
             return obj.isoformat()
         return super().default(obj)
+
+
+def write_json_atomic(path: Union[str, Path], data: Any) -> None:
+    """Write JSON data to a file atomically.
+
+    Args:
+        path: Path to write to
+        data: JSON-serializable data
+
+    Raises:
+        OSError: If the file cannot be written
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    with tmp_path.open("w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def process_context() -> BaseContext:
+    """Get the context to start worker processes with.
+
+    Workers come from a fork server, or are spawned where there is none,
+    rather than being forked from this process, which may be running other
+    threads such as the autosave and preview workers.
+
+    Returns:
+        Multiprocessing context
+    """
+    methods = multiprocessing.get_all_start_methods()
+    method = "forkserver" if "forkserver" in methods else "spawn"
+    return multiprocessing.get_context(method)
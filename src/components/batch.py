@@ -0,0 +1,109 @@
+"""Batched edits for editor components.
+
+A batch collects range edits without applying them. Offsets refer to the
+text as it was when the batch was opened, so edits can be added in any
+order. On commit the edits of each target are sorted and turned into one
+``ReplaceRecord``, which the editor applies in a single pass and records as
+one undo step.
+"""
+
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
+
+from src.components.undo import ReplaceRecord
+
+
+class EditBatch:
+    """Range edits collected to be applied together."""
+
+    def __init__(self, default_target: Hashable) -> None:
+        """Initialize edit batch.
+
+        Args:
+            default_target: Target of edits that do not name one
+        """
+        self.default_target = default_target
+        self._edits: Dict[Hashable, List[Tuple[int, int, str]]] = {}
+
+    def __len__(self) -> int:
+        """Get the number of collected edits."""
+        return sum(len(edits) for edits in self._edits.values())
+
+    @property
+    def targets(self) -> List[Hashable]:
+        """Get the targets with edits, in the order they were first edited."""
+        return list(self._edits)
+
+    def replace(
+        self, start: int, end: int, text: str, target: Optional[Hashable] = None
+    ) -> None:
+        """Replace a range.
+
+        Args:
+            start: Offset of the range
+            end: Offset after the range
+            text: Text to put in place of the range
+            target: What to edit. If None, uses the default target.
+
+        Raises:
+            ValueError: If the range is reversed or negative
+        """
+        if not 0 <= start <= end:
+            raise ValueError(f"Invalid edit range: {start}-{end}")
+        target = self.default_target if target is None else target
+        self._edits.setdefault(target, []).append((start, end, text))
+
+    def insert(self, offset: int, text: str, target: Optional[Hashable] = None) -> None:
+        """Insert text at an offset.
+
+        Args:
+            offset: Offset to insert at
+            text: Text to insert
+            target: What to edit. If None, uses the default target.
+        """
+        self.replace(offset, offset, text, target)
+
+    def delete(self, start: int, end: int, target: Optional[Hashable] = None) -> None:
+        """Delete a range.
+
+        Args:
+            start: Offset of the range
+            end: Offset after the range
+            target: What to edit. If None, uses the default target.
+        """
+        self.replace(start, end, "", target)
+
+    def build(
+        self, text_of: Callable[[Hashable], str], when: float
+    ) -> List[ReplaceRecord]:
+        """Turn the collected edits into one record per target.
+
+        Edits at the same offset keep the order they were added in. Edits
+        that change nothing are left out.
+
+        Args:
+            text_of: Gets the current text of a target
+            when: Time of the edits
+
+        Returns:
+            Records of the targets that change, in the order of ``targets``
+
+        Raises:
+            ValueError: If an edit is outside its text or edits overlap
+        """
+        records = []
+        for target, edits in self._edits.items():
+            text = text_of(target)
+            spans: List[Tuple[int, str, str]] = []
+            position = 0
+            for start, end, new in sorted(edits, key=lambda edit: (edit[0], edit[1])):
+                if end > len(text):
+                    raise ValueError(f"Edit range {start}-{end} is outside the text")
+                if start < position:
+                    raise ValueError("Edits in a batch cannot overlap")
+                old = text[start:end]
+                if old != new:
+                    spans.append((start, old, new))
+                position = end
+            if spans:
+                records.append(ReplaceRecord(target, spans, when))
+        return records
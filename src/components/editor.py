@@ -1,19 +1,94 @@
 """Editor component for managing book content."""
 
-from typing import Any, Dict, List, Optional
+from contextlib import contextmanager
+from typing import Callable, Deque, Hashable, Iterator, List, Optional, Union
 
-from src.models.book import Book
+from src.components.batch import EditBatch
+from src.components.find_replace import FindReplace, Match
+from src.components.undo import UndoHistory, UndoStep
+from src.models.book import Book, Chapter, Section
 
 
 class Editor:
     """Editor class for managing book content and operations."""
 
-    def __init__(self) -> None:
-        """Initialize the editor."""
+    def __init__(self, history: Optional[UndoHistory] = None) -> None:
+        """Initialize the editor.
+
+        Args:
+            history: Undo history to use. If None, a default one is created.
+        """
         self.current_book: Optional[Book] = None
         self.current_chapter_index: int = 0
-        self.undo_stack: List[Dict[str, Any]] = []
-        self.redo_stack: List[Dict[str, Any]] = []
+        self.history = history or UndoHistory()
+        self._listeners: List[Callable[[List[Hashable]], None]] = []
+        self._batch: Optional[EditBatch] = None
+
+    @property
+    def undo_stack(self) -> Deque[UndoStep]:
+        """Get the undo steps, oldest first."""
+        return self.history.undo_stack
+
+    @property
+    def redo_stack(self) -> List[UndoStep]:
+        """Get the redo steps, oldest first."""
+        return self.history.redo_stack
+
+    def add_listener(self, callback: Callable[[List[Hashable]], None]) -> None:
+        """Register a callback called after content changes.
+
+        Args:
+            callback: Called with the undo targets of the changed chapters
+                and sections
+        """
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback: Callable[[List[Hashable]], None]) -> None:
+        """Unregister a change callback."""
+        self._listeners.remove(callback)
+
+    @contextmanager
+    def batch(self) -> Iterator[EditBatch]:
+        """Collect range edits and apply them together when the block ends.
+
+        Edits go to the current chapter unless they name another chapter id,
+        or a tuple of chapter id and section id. Offsets refer to the text as
+        it was when the batch was opened. Each chapter is rebuilt in one
+        pass, the whole batch is one undo step and listeners are told once.
+        If the block raises, nothing is applied.
+
+        Returns:
+            Batch to add edits to
+
+        Raises:
+            ValueError: If no book is loaded or a batch is already open, or
+                on commit if an edit names an unknown chapter, is outside
+                its text or overlaps another edit
+        """
+        if not self.current_book:
+            raise ValueError("No book loaded")
+        self._check_no_batch()
+        batch = EditBatch(self.current_book.chapters[self.current_chapter_index].id)
+        self._batch = batch
+        try:
+            yield batch
+        finally:
+            self._batch = None
+
+        nodes = {}
+        for target in batch.targets:
+            node = self._find_target(target)
+            if node is None:
+                raise ValueError(f"Unknown edit target: {target!r}")
+            nodes[target] = node
+        records = batch.build(
+            lambda target: nodes[target].content, self.history.clock()
+        )
+        for record in records:
+            node = nodes[record.target]
+            node.content = record.redo(node.content)
+        self.history.push_group(records)
+        self._notify([record.target for record in records])
 
     def load_book(self, book: Book) -> None:
         """Load a book into the editor.
@@ -23,8 +98,7 @@ class Editor:
         """
         self.current_book = book
         self.current_chapter_index = 0
-        self.undo_stack.clear()
-        self.redo_stack.clear()
+        self.history.clear()
 
     def next_chapter(self) -> None:
         """Move to the next chapter."""
@@ -51,16 +125,13 @@ class Editor:
         if not self.current_book:
             raise ValueError("No book loaded")
 
+        self._check_no_batch()
         chapter = self.current_book.chapters[self.current_chapter_index]
-        old_content = chapter.content
-        self.undo_stack.append(
-            {
-                "chapter_index": self.current_chapter_index,
-                "content": old_content,
-            }
-        )
-        self.redo_stack.clear()
+        changed = chapter.content != new_content
+        self.history.record(chapter.id, chapter.content, new_content)
         chapter.content = new_content
+        if changed:
+            self._notify([chapter.id])
 
     def add_chapter(self, title: str, content: str) -> None:
         """Add a new chapter to the book.
@@ -110,31 +181,84 @@ class Editor:
         ):
             raise IndexError("Invalid chapter index")
 
-        chapter = self.current_book.chapters.pop(from_index)
-        self.current_book.chapters.insert(to_index, chapter)
+        self.current_book.move_chapter(from_index, to_index)
+
+    def replace_all(
+        self, finder: FindReplace, replacement: str, preview: bool = False
+    ) -> List[Match]:
+        """Replace a pattern in every chapter as one undo step.
+
+        Args:
+            finder: Pattern to replace and how to search for it
+            replacement: Text to put in place of each match
+            preview: If True, return the replacements without changing
+                the book
+
+        Returns:
+            Replaced matches in reading order
+        """
+        if not self.current_book:
+            raise ValueError("No book loaded")
+
+        self._check_no_batch()
+        matches = finder.replace(self.current_book, replacement, self.history, preview)
+        if matches and not preview:
+            self._notify(list(dict.fromkeys(match.target for match in matches)))
+        return matches
 
     def undo(self) -> None:
         """Undo the last content change."""
-        if not self.current_book or not self.undo_stack:
+        if not self.current_book:
             return
 
-        current_state = self.undo_stack.pop()
-        chapter_index = current_state["chapter_index"]
-        chapter = self.current_book.chapters[chapter_index]
-        current_content = chapter.content
-
-        self.redo_stack.append({"chapter_index": chapter_index, "content": current_content})
-        chapter.content = current_state["content"]
+        self._check_no_batch()
+        step = self.history.pop_undo()
+        if step is not None:
+            for record in reversed(step.parts()):
+                node = self._find_target(record.target)
+                if node is not None:
+                    node.content = record.undo(node.content)
+            self._notify([record.target for record in step.parts()])
 
     def redo(self) -> None:
         """Redo the last undone change."""
-        if not self.current_book or not self.redo_stack:
+        if not self.current_book:
             return
 
-        next_state = self.redo_stack.pop()
-        chapter_index = next_state["chapter_index"]
-        chapter = self.current_book.chapters[chapter_index]
-        current_content = chapter.content
+        self._check_no_batch()
+        step = self.history.pop_redo()
+        if step is not None:
+            for record in step.parts():
+                node = self._find_target(record.target)
+                if node is not None:
+                    node.content = record.redo(node.content)
+            self._notify([record.target for record in step.parts()])
+
+    def _find_target(self, target: Hashable) -> Optional[Union[Chapter, Section]]:
+        """Get the chapter, or the section of a chapter, an edit was made in.
 
-        self.undo_stack.append({"chapter_index": chapter_index, "content": current_content})
-        chapter.content = next_state["content"]
+        Args:
+            target: Chapter id, or tuple of chapter id and section id
+
+        Returns:
+            Chapter or section, or None if it no longer exists
+        """
+        if not self.current_book:
+            return None
+        if isinstance(target, tuple):
+            chapter_id, section_id = target
+            chapter = self.current_book.get_chapter(chapter_id)
+            return chapter.get_section(section_id) if chapter is not None else None
+        return self.current_book.get_chapter(target)  # type: ignore[arg-type]
+
+    def _check_no_batch(self) -> None:
+        """Reject direct edits while a batch is open."""
+        if self._batch is not None:
+            raise ValueError("Cannot edit directly while a batch is open")
+
+    def _notify(self, targets: List[Hashable]) -> None:
+        """Tell the listeners which chapters and sections changed."""
+        if not targets:
+            return
+        for callback in list(self._listeners):
+            callback(targets)
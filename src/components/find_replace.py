@@ -0,0 +1,282 @@
+"""Find and replace across all chapters of a book.
+
+The pattern is compiled once. The texts of the chapters and their sections
+are scanned in a process pool when the book has enough text to be worth it,
+and each text is then rebuilt in a single pass from its matches. The pool is
+shared by the whole process and started on first use, so searches do not
+pay for starting workers each time. A replace
+is recorded in an undo history as one step covering every text it changed.
+
+Texts are identified by undo targets: the chapter id for chapter content,
+and a ``(chapter id, section id)`` tuple for section content.
+"""
+
+import os
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from typing import Dict, Hashable, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+from src.book_editor.core.utils import process_context
+from src.components.undo import ReplaceRecord, UndoHistory
+from src.models.book import Book, Chapter, Section
+
+# Total characters below which a book is scanned in this process, because
+# sending the texts to workers costs more than scanning them
+DEFAULT_PARALLEL_CHARS = 4_000_000
+
+# Process-wide worker pools by number of workers, started on first use
+_pools: Dict[int, ProcessPoolExecutor] = {}
+_pools_lock = threading.Lock()
+
+# A span found by a scan: start, end, matched text and replacement text
+_Span = Tuple[int, int, str, Optional[str]]
+
+
+class Match(NamedTuple):
+    """A match of the pattern in a book."""
+
+    chapter_id: str
+    section_id: Optional[str]
+    start: int
+    end: int
+    text: str
+    replacement: Optional[str] = None
+
+    @property
+    def target(self) -> Hashable:
+        """Get the undo target of the text holding the match."""
+        if self.section_id is None:
+            return self.chapter_id
+        return (self.chapter_id, self.section_id)
+
+
+def _scan_text(
+    pattern: "re.Pattern[str]", replacement: Optional[Tuple[str, bool]], text: str
+) -> List[_Span]:
+    """Find the matches of a pattern in a text.
+
+    Args:
+        pattern: Compiled pattern
+        replacement: Replacement and whether it is a regular expression
+            template, or None to only find
+        text: Text to scan
+
+    Returns:
+        Spans of the matches in order
+    """
+    spans: List[_Span] = []
+    for match in pattern.finditer(text):
+        new: Optional[str] = None
+        if replacement is not None:
+            template, expand = replacement
+            new = match.expand(template) if expand else template
+        spans.append((match.start(), match.end(), match.group(), new))
+    return spans
+
+
+def _pool(max_workers: int) -> ProcessPoolExecutor:
+    """Get the shared worker pool of a size, starting it if needed.
+
+    Args:
+        max_workers: Number of worker processes
+
+    Returns:
+        Worker pool
+    """
+    with _pools_lock:
+        pool = _pools.get(max_workers)
+        if pool is None:
+            pool = ProcessPoolExecutor(
+                max_workers=max_workers, mp_context=process_context()
+            )
+            _pools[max_workers] = pool
+        return pool
+
+
+def _discard_pool(max_workers: int, pool: ProcessPoolExecutor) -> None:
+    """Forget a broken worker pool so that the next scan starts a new one."""
+    with _pools_lock:
+        if _pools.get(max_workers) is pool:
+            del _pools[max_workers]
+    pool.shutdown(wait=False)
+
+
+def _texts(book: Book) -> Iterator[Tuple[Chapter, Optional[Section]]]:
+    """Iterate over the chapters and sections of a book in reading order."""
+    for chapter in book.chapters:
+        yield chapter, None
+        for section in chapter.sections:
+            yield chapter, section
+
+
+class FindReplace:
+    """Finds and replaces a pattern in every chapter of a book."""
+
+    def __init__(
+        self,
+        pattern: str,
+        regex: bool = False,
+        case_sensitive: bool = True,
+        whole_word: bool = False,
+        max_workers: Optional[int] = None,
+        chunk_size: int = 8,
+        parallel_chars: int = DEFAULT_PARALLEL_CHARS,
+    ):
+        """Initialize find and replace.
+
+        Args:
+            pattern: Text or regular expression to find
+            regex: Whether the pattern is a regular expression
+            case_sensitive: Whether case must match
+            whole_word: Whether matches must start and end at word boundaries
+            max_workers: Number of worker processes. If None, uses CPU count.
+            chunk_size: Number of texts sent to a worker at a time
+            parallel_chars: Smallest total number of characters scanned in
+                the worker pool
+
+        Raises:
+            ValueError: If the pattern is empty or invalid, or max_workers,
+                chunk_size or parallel_chars is not positive
+        """
+        if not pattern:
+            raise ValueError("Pattern cannot be empty")
+        if max_workers is not None and max_workers <= 0:
+            raise ValueError("max_workers must be positive")
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be positive")
+        if parallel_chars <= 0:
+            raise ValueError("parallel_chars must be positive")
+
+        source = pattern if regex else re.escape(pattern)
+        if whole_word:
+            source = rf"\b(?:{source})\b"
+        try:
+            self.pattern = re.compile(source, 0 if case_sensitive else re.IGNORECASE)
+        except re.error as e:
+            raise ValueError(f"Invalid pattern: {str(e)}") from e
+        self.regex = regex
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.parallel_chars = parallel_chars
+
+    def find(self, book: Book) -> List[Match]:
+        """Find every match in a book without changing it.
+
+        Args:
+            book: Book to search
+
+        Returns:
+            Matches in reading order
+        """
+        return [match for _, match in self._matches(book, None)]
+
+    def replace(
+        self,
+        book: Book,
+        replacement: str,
+        history: Optional[UndoHistory] = None,
+        preview: bool = False,
+    ) -> List[Match]:
+        """Replace every match in a book.
+
+        In a regular expression replace, the replacement may refer to groups
+        of the match as in ``re.sub``; otherwise it is inserted as is.
+
+        Args:
+            book: Book to change
+            replacement: Text to put in place of each match
+            history: Undo history to record the replace in as one step
+            preview: If True, return the replacements without changing
+                the book
+
+        Returns:
+            Replaced matches in reading order, with their replacement text
+
+        Raises:
+            ValueError: If the replacement refers to a group that does not
+                exist
+        """
+        found = list(self._matches(book, replacement))
+        if preview or not found:
+            return [match for _, match in found]
+
+        records: List[ReplaceRecord] = []
+        when = history.clock() if history is not None else 0.0
+        index = 0
+        while index < len(found):
+            node, first = found[index]
+            spans: List[Tuple[int, str, str]] = []
+            while index < len(found) and found[index][0] is node:
+                match = found[index][1]
+                spans.append((match.start, match.text, match.replacement or ""))
+                index += 1
+            record = ReplaceRecord(first.target, spans, when)
+            node.content = record.redo(node.content)
+            records.append(record)
+
+        if history is not None:
+            history.push_group(records)
+        return [match for _, match in found]
+
+    def _matches(
+        self, book: Book, replacement: Optional[str]
+    ) -> Iterator[Tuple[Union[Chapter, Section], Match]]:
+        """Scan a book and yield its matches.
+
+        Args:
+            book: Book to scan
+            replacement: Replacement text, or None to only find
+
+        Returns:
+            Iterator over the matches and the nodes holding them, in reading
+            order
+
+        Raises:
+            ValueError: If the replacement refers to a group that does not
+                exist
+        """
+        nodes = list(_texts(book))
+        texts = [
+            (section if section is not None else chapter).content for chapter, section in nodes
+        ]
+        options = None if replacement is None else (replacement, self.regex)
+        try:
+            results = self._scan_all(texts, options)
+        except (re.error, IndexError) as e:
+            raise ValueError(f"Invalid replacement: {str(e)}") from e
+
+        for (chapter, section), spans in zip(nodes, results):
+            node: Union[Chapter, Section] = section if section is not None else chapter
+            section_id = section.id if section is not None else None
+            for start, end, text, new in spans:
+                yield node, Match(chapter.id, section_id, start, end, text, new)
+
+    def _scan_all(
+        self, texts: List[str], replacement: Optional[Tuple[str, bool]]
+    ) -> List[List[_Span]]:
+        """Scan texts, in the worker pool if they are long enough.
+
+        Args:
+            texts: Texts to scan
+            replacement: Replacement and whether it is a template, or None
+
+        Returns:
+            Spans of each text, in the order of the texts
+        """
+        scan = partial(_scan_text, self.pattern, replacement)
+        if (
+            self.max_workers == 1
+            or len(texts) < 2
+            or sum(map(len, texts)) < self.parallel_chars
+        ):
+            return [scan(text) for text in texts]
+
+        pool = _pool(self.max_workers)
+        try:
+            return list(pool.map(scan, texts, chunksize=self.chunk_size))
+        except BrokenProcessPool:
+            _discard_pool(self.max_workers, pool)
+            return [scan(text) for text in texts]
@@ -0,0 +1,159 @@
+"""Gap buffer module.
+
+A gap buffer keeps text in an array with an unused gap at the position
+being edited. Inserting or deleting at the gap only touches the gap, and
+moving the gap costs the distance it moves, so edits around a cursor do
+not copy the whole text.
+
+Characters are stored in a unicode ``array`` rather than a list, so each
+takes a fixed-width code unit instead of a pointer to a string object.
+"""
+
+from array import array, typecodes
+from typing import Optional
+
+# Smallest gap created when the buffer grows
+MIN_GAP = 64
+# Array type code of a fixed-width character ("u" is deprecated from 3.13)
+TYPECODE = "w" if "w" in typecodes else "u"
+
+
+def _chars(text: str) -> "array[str]":
+    """Store text as a character array."""
+    return array(TYPECODE, text)
+
+
+class GapBuffer:
+    """Text buffer with a movable gap for cheap local edits."""
+
+    def __init__(self, text: str = ""):
+        """Initialize gap buffer.
+
+        Args:
+            text: Initial text
+        """
+        self._chars = _chars(text + "\0" * MIN_GAP)
+        self._gap_start = len(text)
+        self._gap_end = len(self._chars)
+        self._text: Optional[str] = text
+
+    def __len__(self) -> int:
+        """Get the length of the text."""
+        return len(self._chars) - (self._gap_end - self._gap_start)
+
+    @property
+    def text(self) -> str:
+        """Get the whole text."""
+        if self._text is None:
+            chars = self._chars
+            before, after = chars[:self._gap_start], chars[self._gap_end:]
+            self._text = before.tounicode() + after.tounicode()
+        return self._text
+
+    @property
+    def gap_position(self) -> int:
+        """Get the text offset of the gap."""
+        return self._gap_start
+
+    def slice(self, start: int, end: int) -> str:
+        """Get part of the text without building the whole text.
+
+        Args:
+            start: Offset of the first character
+            end: Offset after the last character
+
+        Returns:
+            Text between the offsets
+        """
+        start, end = self._clamp(start), self._clamp(end)
+        if start >= end:
+            return ""
+        if self._text is not None:
+            return self._text[start:end]
+        gap = self._gap_end - self._gap_start
+        if end <= self._gap_start:
+            return self._chars[start:end].tounicode()
+        if start >= self._gap_start:
+            return self._chars[start + gap:end + gap].tounicode()
+        return (
+            self._chars[start:self._gap_start].tounicode()
+            + self._chars[self._gap_end:end + gap].tounicode()
+        )
+
+    def insert(self, position: int, text: str) -> None:
+        """Insert text at an offset.
+
+        Args:
+            position: Offset to insert at
+            text: Text to insert
+        """
+        if not text:
+            return
+        self._move_gap(self._clamp(position))
+        self._reserve(len(text))
+        end = self._gap_start + len(text)
+        self._chars[self._gap_start:end] = _chars(text)
+        self._gap_start = end
+        self._text = None
+
+    def delete(self, start: int, end: int) -> str:
+        """Delete part of the text.
+
+        Args:
+            start: Offset of the first character
+            end: Offset after the last character
+
+        Returns:
+            Deleted text
+        """
+        start, end = self._clamp(start), self._clamp(end)
+        if start >= end:
+            return ""
+        self._move_gap(start)
+        removed = self._chars[self._gap_end:self._gap_end + end - start].tounicode()
+        self._gap_end += end - start
+        self._text = None
+        return removed
+
+    def replace(self, start: int, end: int, text: str) -> str:
+        """Replace part of the text.
+
+        Args:
+            start: Offset of the first character
+            end: Offset after the last character
+            text: Replacement text
+
+        Returns:
+            Replaced text
+        """
+        removed = self.delete(start, end)
+        self.insert(start, text)
+        return removed
+
+    def _clamp(self, position: int) -> int:
+        """Limit an offset to the text."""
+        return max(0, min(position, len(self)))
+
+    def _move_gap(self, position: int) -> None:
+        """Move the gap to an offset."""
+        chars = self._chars
+        if position < self._gap_start:
+            count = self._gap_start - position
+            chars[self._gap_end - count:self._gap_end] = chars[position:self._gap_start]
+            self._gap_start = position
+            self._gap_end -= count
+        elif position > self._gap_start:
+            count = position - self._gap_start
+            chars[self._gap_start:position] = chars[self._gap_end:self._gap_end + count]
+            self._gap_start = position
+            self._gap_end += count
+
+    def _reserve(self, size: int) -> None:
+        """Grow the gap to hold at least a number of characters."""
+        gap = self._gap_end - self._gap_start
+        if gap >= size:
+            return
+        # Grow in proportion to the text so that repeated growth stays cheap
+        extra = max(size - gap, len(self) // 2, MIN_GAP)
+        self._chars[self._gap_end:self._gap_end] = _chars("\0" * extra)
+        self._gap_end += extra
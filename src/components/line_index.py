@@ -0,0 +1,152 @@
+"""Line index module.
+
+Maps character offsets to (line, column) positions and back. Line starts
+are kept on either side of the last edit like the text in a gap buffer:
+starts before the edit are stored as offsets from the beginning, starts
+after it as distances from the end, which an edit does not change. An
+edit therefore only touches the line starts it adds or removes and those
+between it and the previous edit, and lookups use binary search.
+
+Lines and columns count from 0.
+"""
+
+from bisect import bisect_left, bisect_right
+from typing import List, Tuple
+
+
+class LineIndex:
+    """Incrementally updated index of line start offsets."""
+
+    def __init__(self, text: str = ""):
+        """Initialize line index.
+
+        Args:
+            text: Text to index
+        """
+        self._length = len(text)
+        # Line starts up to the edit position, as offsets
+        self._head: List[int] = [0] + [i + 1 for i, c in enumerate(text) if c == "\n"]
+        # Line starts after the edit position, as distances from the end,
+        # nearest to the edit position last
+        self._tail: List[int] = []
+        self._boundary = self._length
+
+    @property
+    def line_count(self) -> int:
+        """Get the number of lines."""
+        return len(self._head) + len(self._tail)
+
+    def line_start(self, line: int) -> int:
+        """Get the offset of the first character of a line.
+
+        Args:
+            line: Line number
+
+        Returns:
+            Offset of the line start
+
+        Raises:
+            IndexError: If the line does not exist
+        """
+        if not 0 <= line < self.line_count:
+            raise IndexError(f"Line {line} does not exist")
+        if line < len(self._head):
+            return self._head[line]
+        return self._length - self._tail[len(self._tail) - 1 - (line - len(self._head))]
+
+    def line_end(self, line: int) -> int:
+        """Get the offset of the end of a line, before its line break.
+
+        Args:
+            line: Line number
+
+        Returns:
+            Offset after the last character of the line
+
+        Raises:
+            IndexError: If the line does not exist
+        """
+        if line + 1 < self.line_count:
+            return self.line_start(line + 1) - 1
+        self.line_start(line)
+        return self._length
+
+    def line_of(self, offset: int) -> int:
+        """Get the line containing an offset.
+
+        Args:
+            offset: Character offset, limited to the text
+
+        Returns:
+            Line number
+        """
+        offset = max(0, min(offset, self._length))
+        # Starts in the tail at or before the offset have distances >= this
+        distance = self._length - offset
+        in_tail = len(self._tail) - bisect_left(self._tail, distance)
+        if in_tail:
+            return len(self._head) + in_tail - 1
+        return bisect_right(self._head, offset) - 1
+
+    def position(self, offset: int) -> Tuple[int, int]:
+        """Get the line and column of an offset.
+
+        Args:
+            offset: Character offset, limited to the text
+
+        Returns:
+            Tuple (line, column)
+        """
+        offset = max(0, min(offset, self._length))
+        line = self.line_of(offset)
+        return line, offset - self.line_start(line)
+
+    def offset(self, line: int, column: int = 0) -> int:
+        """Get the offset of a line and column.
+
+        Lines and columns outside the text are limited to it.
+
+        Args:
+            line: Line number
+            column: Column in the line
+
+        Returns:
+            Character offset
+        """
+        line = max(0, min(line, self.line_count - 1))
+        start = self.line_start(line)
+        return start + max(0, min(column, self.line_end(line) - start))
+
+    def replace(self, start: int, end: int, text: str) -> None:
+        """Update the index for a replaced range of the text.
+
+        Args:
+            start: Offset of the first replaced character
+            end: Offset after the last replaced character
+            text: Replacement text
+        """
+        start = max(0, min(start, self._length))
+        end = max(start, min(end, self._length))
+        self._move(start)
+        # Drop the starts of lines that began inside the replaced range
+        removed_from = self._length - end
+        while self._tail and self._tail[-1] >= removed_from:
+            self._tail.pop()
+        self._head.extend(start + i + 1 for i, c in enumerate(text) if c == "\n")
+        self._length += len(text) - (end - start)
+        self._boundary = start + len(text)
+
+    def _move(self, offset: int) -> None:
+        """Move the edit position so that starts after the offset are in the tail."""
+        if offset < self._boundary:
+            # Starts after the offset move to the tail
+            split = bisect_right(self._head, offset)
+            self._tail.extend(self._length - s for s in reversed(self._head[split:]))
+            del self._head[split:]
+        elif offset > self._boundary:
+            # Starts up to the offset move to the head
+            distance = self._length - offset
+            split = bisect_left(self._tail, distance)
+            self._head.extend(self._length - d for d in reversed(self._tail[split:]))
+            del self._tail[split:]
+        self._boundary = offset
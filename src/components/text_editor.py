@@ -1,25 +1,109 @@
 """Text editor component for handling text editing functionality."""
 
-from typing import List, Optional
+from contextlib import contextmanager
+from typing import Callable, Deque, Hashable, Iterator, List, Optional, Tuple
+
+from src.book_editor.core.text_diff import make_delta
+from src.components.batch import EditBatch
+from src.components.gap_buffer import GapBuffer
+from src.components.line_index import LineIndex
+from src.components.undo import EditRecord, UndoHistory, UndoStep
+
+# Undo targets; whole-content replacements are never merged with cursor edits
+SET_CONTENT = "content"
+CURSOR_EDIT = "cursor"
 
 
 class EditorComponent:
     """Component for handling text editing operations."""
 
-    def __init__(self) -> None:
-        self.content = ""
+    def __init__(self, history: Optional[UndoHistory] = None) -> None:
+        self._buffer = GapBuffer()
+        self._lines = LineIndex()
         self.cursor_position = 0
         self.selection_start: Optional[int] = None
         self.selection_end: Optional[int] = None
-        self._undo_stack: List[str] = []
-        self._redo_stack: List[str] = []
+        self._history = history or UndoHistory()
+        self._listeners: List[Callable[[], None]] = []
+        self._batch: Optional[EditBatch] = None
+
+    @property
+    def content(self) -> str:
+        """Get editor content."""
+        return self._buffer.text
+
+    @content.setter
+    def content(self, content: str) -> None:
+        """Replace editor content without recording an undo step."""
+        self._buffer = GapBuffer(content)
+        self._lines = LineIndex(content)
+
+    @property
+    def line_count(self) -> int:
+        """Get the number of lines."""
+        return self._lines.line_count
+
+    @property
+    def _undo_stack(self) -> Deque[UndoStep]:
+        """Get the undo steps, oldest first."""
+        return self._history.undo_stack
+
+    @property
+    def _redo_stack(self) -> List[UndoStep]:
+        """Get the redo steps, oldest first."""
+        return self._history.redo_stack
+
+    def add_listener(self, callback: Callable[[], None]) -> None:
+        """Register a callback called after each change to the content."""
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback: Callable[[], None]) -> None:
+        """Unregister a change callback."""
+        self._listeners.remove(callback)
+
+    @contextmanager
+    def batch(self) -> Iterator[EditBatch]:
+        """Collect range edits and apply them together when the block ends.
+
+        Offsets refer to the content as it was when the batch was opened.
+        The edits are applied in one pass, recorded as one undo step and
+        reported to listeners once. If the block raises, nothing is applied.
+
+        Returns:
+            Batch to add edits to
+
+        Raises:
+            ValueError: If a batch is already open, or on commit if an edit
+                is outside the content or edits overlap
+        """
+        self._check_no_batch()
+        batch = EditBatch(CURSOR_EDIT)
+        self._batch = batch
+        try:
+            yield batch
+        finally:
+            self._batch = None
+
+        text = self.content
+        records = batch.build(lambda _: text, self._history.clock())
+        if not records:
+            return
+        for record in records:
+            self._apply(record.redo_edits())
+        self._history.push_group(records)
+        self.clear_selection()
+        self._notify()
 
     def set_content(self, content: str) -> None:
         """Set editor content."""
-        self._push_undo_state()
-        self.content = content
+        self._check_no_batch()
+        start, end, text = make_delta(self.content, content)
+        removed = self._replace(start, end, text)
+        # Each call is its own undo step, even if the content is unchanged
+        record = EditRecord(SET_CONTENT, start, removed, text, self._history.clock())
+        self._history.push_group([record])
+        self._notify()
         self.cursor_position = len(content)
-        self._redo_stack.clear()
 
     def get_content(self) -> str:
         """Get current editor content."""
@@ -27,45 +111,153 @@ class EditorComponent:
 
     def move_cursor(self, position: int) -> None:
         """Move cursor to specified position."""
-        self.cursor_position = max(0, min(position, len(self.content)))
+        self.cursor_position = max(0, min(position, len(self._buffer)))
         self.clear_selection()
 
     def select_text(self, start: int, end: int) -> None:
         """Select text range."""
-        content_length = len(self.content)
+        content_length = len(self._buffer)
         self.selection_start = max(0, min(start, content_length))
         self.selection_end = max(0, min(end, content_length))
         self.cursor_position = self.selection_end
 
     def get_selected_text(self) -> Optional[str]:
         """Get currently selected text."""
-        if self.selection_start is None or self.selection_end is None:
+        selection = self._selection_range()
+        if selection is None:
             return None
-        start = min(self.selection_start, self.selection_end)
-        end = max(self.selection_start, self.selection_end)
-        return self.content[start:end]
+        return self._buffer.slice(*selection)
 
     def clear_selection(self) -> None:
         """Clear text selection."""
         self.selection_start = None
         self.selection_end = None
 
-    def _push_undo_state(self) -> None:
-        """Push current state to undo stack."""
-        self._undo_stack.append(self.content)
+    def get_line_column(self, offset: Optional[int] = None) -> Tuple[int, int]:
+        """Get the line and column of an offset, or of the cursor if None.
+
+        Lines and columns count from 0.
+        """
+        return self._lines.position(self.cursor_position if offset is None else offset)
+
+    def get_offset(self, line: int, column: int = 0) -> int:
+        """Get the offset of a line and column, limited to the content."""
+        return self._lines.offset(line, column)
+
+    def get_line_range(self, line: int) -> Tuple[int, int]:
+        """Get the start and end offsets of a line, without its line break."""
+        return self._lines.line_start(line), self._lines.line_end(line)
+
+    def move_to_line(self, line: int, column: int = 0) -> None:
+        """Move cursor to a line and column."""
+        self.move_cursor(self._lines.offset(line, column))
+
+    def insert_at_cursor(self, text: str) -> None:
+        """Insert text at the cursor, replacing the selection if there is one."""
+        self.replace_selection(text)
+
+    def delete_backward(self, count: int = 1) -> str:
+        """Delete characters before the cursor, or the selection if there is one.
+
+        Returns:
+            Deleted text
+        """
+        selection = self._selection_range()
+        if selection is not None and selection[0] != selection[1]:
+            return self.delete_selection()
+        end = self.cursor_position
+        start = max(0, end - count)
+        removed = self._edit(start, end, "", CURSOR_EDIT)
+        self.cursor_position = start
+        self.clear_selection()
+        return removed
+
+    def delete_selection(self) -> str:
+        """Delete the selected text.
+
+        Returns:
+            Deleted text, or an empty string if nothing is selected
+        """
+        selection = self._selection_range()
+        if selection is None:
+            return ""
+        removed = self._edit(selection[0], selection[1], "", CURSOR_EDIT)
+        self.cursor_position = selection[0]
+        self.clear_selection()
+        return removed
+
+    def replace_selection(self, text: str) -> str:
+        """Replace the selected text, or insert at the cursor if nothing is selected.
+
+        Returns:
+            Replaced text
+        """
+        start, end = self._selection_range() or (self.cursor_position, self.cursor_position)
+        removed = self._edit(start, end, text, CURSOR_EDIT)
+        self.cursor_position = start + len(text)
+        self.clear_selection()
+        return removed
+
+    def _selection_range(self) -> Optional[Tuple[int, int]]:
+        """Get the selected range in increasing order."""
+        if self.selection_start is None or self.selection_end is None:
+            return None
+        return (
+            min(self.selection_start, self.selection_end),
+            max(self.selection_start, self.selection_end),
+        )
+
+    def _edit(self, start: int, end: int, text: str, target: str) -> str:
+        """Replace a range of the content and record its inverse."""
+        self._check_no_batch()
+        removed = self._replace(start, end, text)
+        self._history.push(target, start, removed, text)
+        self._notify()
+        return removed
+
+    def _replace(self, start: int, end: int, text: str) -> str:
+        """Replace a range of the content and keep the line index current."""
+        self._lines.replace(start, end, text)
+        return self._buffer.replace(start, end, text)
+
+    def _apply(self, edits: List[Tuple[int, int, str]]) -> None:
+        """Apply replacements ordered last first and put the cursor after the first."""
+        for start, end, text in edits:
+            self._replace(start, end, text)
+            self.cursor_position = start + len(text)
+
+    def _check_no_batch(self) -> None:
+        """Reject direct edits while a batch is open."""
+        if self._batch is not None:
+            raise ValueError("Cannot edit directly while a batch is open")
+
+    def _notify(self) -> None:
+        """Tell the listeners the content changed."""
+        for callback in list(self._listeners):
+            callback()
 
     def undo(self) -> None:
         """Undo last change."""
-        if self._undo_stack:
-            self._redo_stack.append(self.content)
-            self.content = self._undo_stack.pop()
-            self.cursor_position = len(self.content)
-            self.clear_selection()
+        self._check_no_batch()
+        step = self._history.pop_undo()
+        if step is not None:
+            for record in reversed(step.parts()):
+                self._apply(record.undo_edits())
+                self._restore_cursor(record.target)
+            self._notify()
 
     def redo(self) -> None:
         """Redo last undone change."""
-        if self._redo_stack:
-            self._push_undo_state()
-            self.content = self._redo_stack.pop()
-            self.cursor_position = len(self.content)
-            self.clear_selection()
+        self._check_no_batch()
+        step = self._history.pop_redo()
+        if step is not None:
+            for record in step.parts():
+                self._apply(record.redo_edits())
+                self._restore_cursor(record.target)
+            self._notify()
+
+    def _restore_cursor(self, target: Hashable) -> None:
+        """Place the cursor after undoing or redoing a change."""
+        if target == SET_CONTENT:
+            self.cursor_position = len(self._buffer)
+        self.clear_selection()
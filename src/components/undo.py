@@ -0,0 +1,361 @@
+"""Undo history for editor components.
+
+Edits are stored as the span they replaced instead of whole copies of the
+text, so memory grows with what was typed rather than with the size of the
+text. Consecutive edits of the same target that touch each other and follow
+each other quickly are merged into one undo step. The history has a memory
+cap and forgets its oldest steps first.
+
+Edits made together, such as a replace across a whole book, are stored as
+one step: a ``ReplaceRecord`` holds all edits of one target made in a
+single pass, and an ``EditGroup`` holds the records of several targets.
+"""
+
+import time
+from collections import deque
+from typing import Callable, Deque, Hashable, List, Optional, Sequence, Tuple, Union
+
+from src.book_editor.core.text_diff import make_delta
+
+# Default memory cap in characters of stored text
+DEFAULT_MAX_CHARS = 1_000_000
+# Seconds within which adjacent edits are merged into one step
+DEFAULT_COALESCE_WINDOW = 1.0
+# Approximate per-record overhead, in characters, counted against the cap
+RECORD_OVERHEAD = 64
+# Approximate per-span overhead of a ReplaceRecord, in characters
+SPAN_OVERHEAD = 16
+
+
+class EditRecord:
+    """Single undoable edit: ``new`` replaced ``old`` at ``start``."""
+
+    __slots__ = ("target", "start", "old", "new", "time")
+
+    def __init__(self, target: Hashable, start: int, old: str, new: str, when: float):
+        """Initialize edit record.
+
+        Args:
+            target: What was edited, e.g. a chapter index
+            start: Offset of the edit
+            old: Replaced text
+            new: Inserted text
+            when: Time of the latest edit merged into this record
+        """
+        self.target = target
+        self.start = start
+        self.old = old
+        self.new = new
+        self.time = when
+
+    @property
+    def size(self) -> int:
+        """Get the memory charged for this record."""
+        return len(self.old) + len(self.new) + RECORD_OVERHEAD
+
+    def undo(self, text: str) -> str:
+        """Revert the edit on the text it produced."""
+        return text[:self.start] + self.old + text[self.start + len(self.new):]
+
+    def redo(self, text: str) -> str:
+        """Apply the edit again to the text it was made on."""
+        return text[:self.start] + self.new + text[self.start + len(self.old):]
+
+    def merge(self, start: int, old: str, new: str) -> bool:
+        """Merge a following edit that touches this one.
+
+        Args:
+            start: Offset of the following edit in the text this record produced
+            old: Text replaced by the following edit
+            new: Text inserted by the following edit
+
+        Returns:
+            True if the edits touch and were merged
+        """
+        inserted_end = self.start + len(self.new)
+        end = start + len(old)
+        if start > inserted_end or end < self.start:
+            return False
+        low = min(self.start, start)
+        # Text between low and high after this edit, rebuilt from both edits
+        before = old[:self.start - start] if start < self.start else ""
+        after = old[inserted_end - start:] if end > inserted_end else ""
+        between = before + self.new + after
+        self.old = before + self.old + after
+        self.new = between[:start - low] + new + between[end - low:]
+        self.start = low
+        return True
+
+    def undo_edits(self) -> List[Tuple[int, int, str]]:
+        """Get the ``(start, end, text)`` replacements that revert the edit."""
+        return [(self.start, self.start + len(self.new), self.old)]
+
+    def redo_edits(self) -> List[Tuple[int, int, str]]:
+        """Get the ``(start, end, text)`` replacements that apply the edit."""
+        return [(self.start, self.start + len(self.old), self.new)]
+
+    def parts(self) -> Sequence["EditRecord"]:
+        """Get the records of this step, in the order they were made."""
+        return (self,)
+
+
+class ReplaceRecord:
+    """Non-overlapping edits of one target made in a single pass.
+
+    Each span is ``(start, old, new)`` with ``start`` an offset in the text
+    before the edits. Spans are sorted by offset, so undoing and redoing
+    rebuild the text in one pass however many spans there are.
+    """
+
+    __slots__ = ("target", "spans", "time")
+
+    def __init__(
+        self, target: Hashable, spans: Sequence[Tuple[int, str, str]], when: float
+    ):
+        """Initialize replace record.
+
+        Args:
+            target: What was edited
+            spans: Edits sorted by offset, as ``(start, old, new)`` tuples
+            when: Time of the edits
+        """
+        self.target = target
+        self.spans = tuple(spans)
+        self.time = when
+
+    @property
+    def size(self) -> int:
+        """Get the memory charged for this record."""
+        chars = sum(len(old) + len(new) for _, old, new in self.spans)
+        return chars + SPAN_OVERHEAD * len(self.spans) + RECORD_OVERHEAD
+
+    def undo(self, text: str) -> str:
+        """Revert the edits on the text they produced."""
+        pieces: List[str] = []
+        position = shift = 0
+        for start, old, new in self.spans:
+            start += shift
+            pieces.append(text[position:start])
+            pieces.append(old)
+            position = start + len(new)
+            shift += len(new) - len(old)
+        pieces.append(text[position:])
+        return "".join(pieces)
+
+    def redo(self, text: str) -> str:
+        """Apply the edits again to the text they were made on."""
+        pieces: List[str] = []
+        position = 0
+        for start, old, new in self.spans:
+            pieces.append(text[position:start])
+            pieces.append(new)
+            position = start + len(old)
+        pieces.append(text[position:])
+        return "".join(pieces)
+
+    def undo_edits(self) -> List[Tuple[int, int, str]]:
+        """Get the ``(start, end, text)`` replacements that revert the edits.
+
+        The replacements are ordered last first, so each one can be applied
+        to the text left by the ones before it.
+        """
+        edits = []
+        shift = 0
+        for start, old, new in self.spans:
+            edits.append((start + shift, start + shift + len(new), old))
+            shift += len(new) - len(old)
+        edits.reverse()
+        return edits
+
+    def redo_edits(self) -> List[Tuple[int, int, str]]:
+        """Get the ``(start, end, text)`` replacements that apply the edits.
+
+        The replacements are ordered last first, so each one can be applied
+        to the text left by the ones before it.
+        """
+        return [
+            (start, start + len(old), new) for start, old, new in reversed(self.spans)
+        ]
+
+    def parts(self) -> Sequence["ReplaceRecord"]:
+        """Get the records of this step, in the order they were made."""
+        return (self,)
+
+
+class EditGroup:
+    """Records of several targets undone and redone as one step."""
+
+    __slots__ = ("records", "time")
+
+    # A group is never merged with following edits
+    target = None
+
+    def __init__(
+        self, records: Sequence[Union[EditRecord, ReplaceRecord]], when: float
+    ):
+        """Initialize edit group.
+
+        Args:
+            records: Records in the order they were made
+            when: Time of the edits
+        """
+        self.records = tuple(records)
+        self.time = when
+
+    @property
+    def size(self) -> int:
+        """Get the memory charged for this group."""
+        return sum(record.size for record in self.records)
+
+    def parts(self) -> Sequence[Union[EditRecord, ReplaceRecord]]:
+        """Get the records of this step, in the order they were made."""
+        return self.records
+
+
+# One undo step
+UndoStep = Union[EditRecord, ReplaceRecord, EditGroup]
+
+
+class UndoHistory:
+    """Bounded undo and redo stacks of coalesced edit records."""
+
+    def __init__(
+        self,
+        max_chars: int = DEFAULT_MAX_CHARS,
+        coalesce_window: float = DEFAULT_COALESCE_WINDOW,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize undo history.
+
+        Args:
+            max_chars: Memory cap in characters of stored text
+            coalesce_window: Seconds within which adjacent edits are merged
+            clock: Time source
+
+        Raises:
+            ValueError: If max_chars is not positive or coalesce_window is
+                negative
+        """
+        if max_chars <= 0:
+            raise ValueError("max_chars must be positive")
+        if coalesce_window < 0:
+            raise ValueError("coalesce_window cannot be negative")
+        self.max_chars = max_chars
+        self.coalesce_window = coalesce_window
+        self.clock = clock
+        self.undo_stack: Deque[UndoStep] = deque()
+        self.redo_stack: List[UndoStep] = []
+        self._size = 0
+        self._sealed = False
+
+    @property
+    def size(self) -> int:
+        """Get the memory charged for the undo stack."""
+        return self._size
+
+    def record(self, target: Hashable, old_text: str, new_text: str) -> None:
+        """Record an edit.
+
+        Args:
+            target: What was edited
+            old_text: Text before the edit
+            new_text: Text after the edit
+        """
+        start, end, new = make_delta(old_text, new_text)
+        self.push(target, start, old_text[start:end], new)
+
+    def push(self, target: Hashable, start: int, old: str, new: str) -> None:
+        """Record an edit whose span is already known.
+
+        Args:
+            target: What was edited
+            start: Offset of the edit
+            old: Replaced text
+            new: Inserted text
+        """
+        if old == new:
+            return
+        self.redo_stack.clear()
+        now = self.clock()
+
+        top = self.undo_stack[-1] if self.undo_stack else None
+        if (
+            isinstance(top, EditRecord)
+            and not self._sealed
+            and top.target == target
+            and now - top.time <= self.coalesce_window
+        ):
+            size = top.size
+            if top.merge(start, old, new):
+                top.time = now
+                self._size += top.size - size
+                self._evict()
+                return
+        self._sealed = False
+        record = EditRecord(target, start, old, new, now)
+        self.undo_stack.append(record)
+        self._size += record.size
+        self._evict()
+
+    def push_group(self, records: Sequence[Union[EditRecord, ReplaceRecord]]) -> None:
+        """Record edits that are undone and redone together as one step.
+
+        Args:
+            records: Records in the order they were made. Nothing is recorded
+                if empty.
+        """
+        if not records:
+            return
+        self.redo_stack.clear()
+        step: UndoStep = (
+            records[0] if len(records) == 1 else EditGroup(records, self.clock())
+        )
+        self.undo_stack.append(step)
+        self._size += step.size
+        self._sealed = True
+        self._evict()
+
+    def seal(self) -> None:
+        """End the current undo step so the next edit starts a new one."""
+        self._sealed = True
+
+    def pop_undo(self) -> Optional[UndoStep]:
+        """Take the newest undo step and move it to the redo stack.
+
+        Returns:
+            Step to undo, or None if there is nothing to undo
+        """
+        if not self.undo_stack:
+            return None
+        record = self.undo_stack.pop()
+        self._size -= record.size
+        self.redo_stack.append(record)
+        self._sealed = True
+        return record
+
+    def pop_redo(self) -> Optional[UndoStep]:
+        """Take the newest redo step and move it back to the undo stack.
+
+        Returns:
+            Step to redo, or None if there is nothing to redo
+        """
+        if not self.redo_stack:
+            return None
+        record = self.redo_stack.pop()
+        self.undo_stack.append(record)
+        self._size += record.size
+        self._sealed = True
+        self._evict()
+        return record
+
+    def clear(self) -> None:
+        """Forget all undo and redo steps."""
+        self.undo_stack.clear()
+        self.redo_stack.clear()
+        self._size = 0
+        self._sealed = False
+
+    def _evict(self) -> None:
+        """Drop the oldest undo steps until the memory cap is met."""
+        while self._size > self.max_chars and len(self.undo_stack) > 1:
+            self._size -= self.undo_stack.popleft().size
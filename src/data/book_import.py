@@ -0,0 +1,290 @@
+"""Book import module.
+
+Builds a book from a directory of Markdown files. Files are discovered
+recursively and ordered by their paths with numbers compared by value, so
+``chapter2.md`` comes before ``chapter10.md``. They are read, decoded and
+split into chapters and sections in a thread pool, which keeps many reads
+in flight at once. The book is built in file order however the reads
+finish, and a callback is told about progress and throughput after each
+file.
+
+Each file becomes one or more chapters: headings up to ``chapter_level``
+start chapters and deeper headings up to ``section_level`` start sections.
+Text before the first heading goes into a chapter named after the file.
+"""
+
+import os
+import re
+import time
+from concurrent.futures import FIRST_EXCEPTION, Future, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+from src.book_editor.core.outline import Outline
+from src.models.book import Book
+
+EXTENSIONS = (".md", ".markdown")
+# Tried in order; the last one decodes any bytes
+ENCODINGS = ("utf-8-sig", "cp1252", "latin-1")
+
+_DIGITS = re.compile(r"(\d+)")
+
+# A chapter read from a file: title, content and (title, content) sections
+ChapterData = Tuple[str, str, List[Tuple[str, str]]]
+
+
+class ImportProgress(NamedTuple):
+    """Progress of an import.
+
+    Attributes:
+        files_done: Number of files read so far
+        files_total: Number of files to read
+        bytes_read: Bytes read so far
+        elapsed: Seconds since the import started
+    """
+
+    files_done: int
+    files_total: int
+    bytes_read: int
+    elapsed: float
+
+    @property
+    def files_per_second(self) -> float:
+        """Get the files read per second."""
+        return self.files_done / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def bytes_per_second(self) -> float:
+        """Get the bytes read per second."""
+        return self.bytes_read / self.elapsed if self.elapsed > 0 else 0.0
+
+
+class ImportResult(NamedTuple):
+    """Outcome of an import.
+
+    Attributes:
+        book: Imported book
+        progress: Final progress, with the totals and throughput
+    """
+
+    book: Book
+    progress: ImportProgress
+
+
+def _sort_key(path: Path) -> List[Tuple[int, Union[int, str]]]:
+    """Get a key that orders paths with numbers compared by value."""
+    key: List[Tuple[int, Union[int, str]]] = []
+    for part in path.parts:
+        for number, piece in enumerate(_DIGITS.split(part.lower())):
+            if number % 2:
+                key.append((0, int(piece)))
+            elif piece:
+                key.append((1, piece))
+        key.append((-1, ""))
+    return key
+
+
+def decode(data: bytes, encodings: Sequence[str] = ENCODINGS) -> str:
+    """Decode file content with the first encoding that fits.
+
+    Line endings are normalized to ``\\n``.
+
+    Args:
+        data: Raw bytes
+        encodings: Encodings to try in order
+
+    Returns:
+        Decoded text
+
+    Raises:
+        ValueError: If no encoding can decode the data
+    """
+    for encoding in encodings:
+        try:
+            text = data.decode(encoding)
+        except UnicodeDecodeError:
+            continue
+        return text.replace("\r\n", "\n").replace("\r", "\n")
+    raise ValueError(f"Cannot decode text with any of: {', '.join(encodings)}")
+
+
+def split_chapters(
+    text: str, default_title: str, chapter_level: int = 1, section_level: int = 2
+) -> List[ChapterData]:
+    """Split Markdown text into chapters and sections at its headings.
+
+    Args:
+        text: Markdown text
+        default_title: Title of the chapter holding text before the first
+            chapter heading
+        chapter_level: Deepest heading level that starts a chapter
+        section_level: Deepest heading level that starts a section
+
+    Returns:
+        Chapters in order
+    """
+    headings = [h for h in Outline(text).headings if h.level <= section_level]
+    chapters: List[ChapterData] = []
+
+    lead_end = headings[0].offset if headings else len(text)
+    if text[:lead_end].strip():
+        chapters.append((default_title, text[:lead_end].strip(), []))
+
+    for number, heading in enumerate(headings):
+        line_end = text.find("\n", heading.offset)
+        start = len(text) if line_end == -1 else line_end + 1
+        end = headings[number + 1].offset if number + 1 < len(headings) else len(text)
+        body = text[start:end].strip()
+        if heading.level <= chapter_level:
+            chapters.append((heading.title or default_title, body, []))
+        else:
+            if not chapters:
+                chapters.append((default_title, "", []))
+            chapters[-1][2].append((heading.title, body))
+    return chapters
+
+
+class BookImporter:
+    """Imports a directory of Markdown files as a book."""
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        chapter_level: int = 1,
+        section_level: int = 2,
+        extensions: Sequence[str] = EXTENSIONS,
+        encodings: Sequence[str] = ENCODINGS,
+        progress: Optional[Callable[[ImportProgress], None]] = None,
+    ):
+        """Initialize book importer.
+
+        Args:
+            max_workers: Number of reader threads. If None, uses the thread
+                pool default, which grows with the CPU count.
+            chapter_level: Deepest heading level that starts a chapter
+            section_level: Deepest heading level that starts a section
+            extensions: File extensions to import
+            encodings: Encodings to try in order when decoding a file
+            progress: Called with the progress after each file is read
+
+        Raises:
+            ValueError: If max_workers is not positive, the heading levels
+                are not increasing levels between 1 and 6, or no encodings
+                are given
+        """
+        if max_workers is not None and max_workers <= 0:
+            raise ValueError("max_workers must be positive")
+        if not 1 <= chapter_level < section_level <= 6:
+            raise ValueError("Heading levels must satisfy 1 <= chapter < section <= 6")
+        if not encodings:
+            raise ValueError("At least one encoding is required")
+
+        self.max_workers = max_workers
+        self.chapter_level = chapter_level
+        self.section_level = section_level
+        self.extensions = tuple(ext.lower() for ext in extensions)
+        self.encodings = tuple(encodings)
+        self.progress = progress
+
+    def discover(self, directory: Union[str, Path]) -> List[Path]:
+        """Find the files to import, in import order.
+
+        Hidden files and directories are skipped.
+
+        Args:
+            directory: Directory to search
+
+        Returns:
+            Paths of the files
+
+        Raises:
+            NotADirectoryError: If the directory does not exist
+        """
+        root = Path(directory)
+        if not root.is_dir():
+            raise NotADirectoryError(f"Not a directory: {root}")
+        found = []
+        for current, dirs, files in os.walk(root):
+            dirs[:] = [d for d in dirs if not d.startswith(".")]
+            for name in files:
+                if not name.startswith(".") and name.lower().endswith(self.extensions):
+                    found.append(Path(current, name))
+        return sorted(found, key=lambda path: _sort_key(path.relative_to(root)))
+
+    def import_directory(
+        self, directory: Union[str, Path], title: Optional[str] = None, author: str = ""
+    ) -> ImportResult:
+        """Import a directory of Markdown files.
+
+        Args:
+            directory: Directory to import
+            title: Title of the book. If None, uses the directory name.
+            author: Author of the book
+
+        Returns:
+            Imported book and the final progress
+
+        Raises:
+            NotADirectoryError: If the directory does not exist
+            OSError: If a file cannot be read
+            ValueError: If a file cannot be decoded
+        """
+        started = time.perf_counter()
+        paths = self.discover(directory)
+        results: Dict[int, List[ChapterData]] = {}
+        bytes_read = 0
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            pending = {
+                executor.submit(self._read, path): index for index, path in enumerate(paths)
+            }
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_EXCEPTION)
+                for future in done:
+                    index = pending.pop(future)
+                    size, chapters = self._result(future, executor)
+                    results[index] = chapters
+                    bytes_read += size
+                    if self.progress is not None:
+                        self.progress(self._progress(len(results), len(paths), bytes_read, started))
+
+        book = Book(title if title is not None else Path(directory).resolve().name, author)
+        for index in range(len(paths)):
+            for chapter_title, content, sections in results[index]:
+                chapter = book.add_chapter(chapter_title, content)
+                for section_title, section_content in sections:
+                    chapter.add_section(section_title, section_content)
+        return ImportResult(book, self._progress(len(paths), len(paths), bytes_read, started))
+
+    def _read(self, path: Path) -> Tuple[int, List[ChapterData]]:
+        """Read, decode and split one file.
+
+        Args:
+            path: File to read
+
+        Returns:
+            Tuple of the file size in bytes and its chapters
+        """
+        data = path.read_bytes()
+        try:
+            text = decode(data, self.encodings)
+        except ValueError as e:
+            raise ValueError(f"Failed to decode {path}: {str(e)}") from e
+        chapters = split_chapters(text, path.stem, self.chapter_level, self.section_level)
+        return len(data), chapters
+
+    @staticmethod
+    def _result(
+        future: "Future[Tuple[int, List[ChapterData]]]", executor: ThreadPoolExecutor
+    ) -> Tuple[int, List[ChapterData]]:
+        """Get the result of a read, cancelling the other reads if it failed."""
+        try:
+            return future.result()
+        except BaseException:
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+
+    @staticmethod
+    def _progress(done: int, total: int, bytes_read: int, started: float) -> ImportProgress:
+        """Build a progress report."""
+        return ImportProgress(done, total, bytes_read, time.perf_counter() - started)
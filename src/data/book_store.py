@@ -0,0 +1,193 @@
+"""Book storage module.
+
+A book is stored as a directory with a manifest and one file per chapter::
+
+    book.json                   title, author, metadata, chapter order and counts
+    chapters/<id>.<version>.json  content, sections and metadata of one chapter
+
+Saving writes only the chapters that changed since they were loaded or
+last saved. A changed chapter is written to a file with the next version
+number rather than over its current file, and the small manifest is then
+replaced atomically to point at the new files. Files the previous manifest
+referred to are deleted only after that, so a save interrupted at any point
+leaves the manifest and every file it names intact. Opening a book reads
+only the manifest; each chapter is read the first time it is used.
+"""
+
+import json
+from functools import partial
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+from src.book_editor.core.utils import write_json_atomic
+from src.models.book import Book, Chapter, TextCounts
+
+MANIFEST_NAME = "book.json"
+CHAPTER_DIR = "chapters"
+FORMAT_VERSION = 2
+
+
+class BookStore:
+    """Stores a book as a manifest plus one file per chapter."""
+
+    def __init__(self, root_dir: Union[str, Path]) -> None:
+        """Initialize book store.
+
+        Args:
+            root_dir: Directory of the book
+        """
+        self.root_dir = Path(root_dir)
+        self.manifest_path = self.root_dir / MANIFEST_NAME
+        self.chapter_dir = self.root_dir / CHAPTER_DIR
+        # Version of the stored file of each chapter the manifest refers to,
+        # or None until the manifest is read
+        self._versions: Optional[Dict[str, int]] = None
+
+    def exists(self) -> bool:
+        """Check whether a book has been saved in the store."""
+        return self.manifest_path.exists()
+
+    def open(self) -> Book:
+        """Open the stored book without reading its chapters.
+
+        Returns:
+            Book whose chapters are loaded on first use
+
+        Raises:
+            FileNotFoundError: If no book is stored
+            ValueError: If the manifest is invalid
+        """
+        manifest = self._read_manifest()
+
+        book = Book(manifest.get("title", ""), manifest.get("author", ""))
+        book.description = manifest.get("description", "")
+        book.metadata = manifest.get("metadata") or {}
+        versions = {}
+        for entry in manifest.get("chapters", []):
+            versions[entry["id"]] = entry["version"]
+            loader = partial(self._read_chapter, entry["id"], entry["version"])
+            counts = None
+            if "words" in entry and "chars" in entry:
+                counts = TextCounts(entry["words"], entry["chars"])
+            book.chapters.append(
+                Chapter.lazy(entry.get("title", ""), loader, entry["id"], counts)
+            )
+        book.dirty = False
+        self._versions = versions
+        return book
+
+    def save(self, book: Book) -> int:
+        """Save the changes to a book.
+
+        Args:
+            book: Book to save
+
+        Returns:
+            Number of chapter files written
+
+        Raises:
+            OSError: If the book cannot be written
+        """
+        if self._versions is None:
+            # Files of a book saved by another store are replaced as well
+            self._versions = self._stored_versions()
+        versions = dict(self._versions)
+        written = []
+        for chapter in book.chapters:
+            if chapter.changed or chapter.id not in versions:
+                data = chapter.to_dict()
+                for section, section_data in zip(chapter.sections, data["sections"]):
+                    section_data["id"] = section.id
+                version = versions.get(chapter.id, 0) + 1
+                write_json_atomic(self._chapter_path(chapter.id, version), data)
+                versions[chapter.id] = version
+                written.append(chapter)
+
+        manifest = {
+            "format": FORMAT_VERSION,
+            "title": book.title,
+            "author": book.author,
+            "description": book.description,
+            "metadata": book.metadata,
+            "chapters": [
+                {
+                    "id": chapter.id,
+                    "version": versions[chapter.id],
+                    "title": chapter.title,
+                    "words": chapter.counts.words,
+                    "chars": chapter.counts.chars,
+                }
+                for chapter in book.chapters
+            ],
+        }
+        write_json_atomic(self.manifest_path, manifest)
+        for chapter in written:
+            chapter.mark_clean()
+        book.dirty = False
+
+        # Replaced and removed chapter files are deleted once the manifest no
+        # longer refers to them
+        current = {chapter.id: versions[chapter.id] for chapter in book.chapters}
+        for chapter_id, version in self._versions.items():
+            if current.get(chapter_id) != version:
+                self._chapter_path(chapter_id, version).unlink(missing_ok=True)
+        self._versions = current
+        return len(written)
+
+    def _read_manifest(self) -> Dict[str, Any]:
+        """Read the manifest.
+
+        Returns:
+            Manifest data
+
+        Raises:
+            FileNotFoundError: If no book is stored
+            ValueError: If the manifest is invalid
+        """
+        with open(self.manifest_path, "r", encoding="utf-8") as f:
+            try:
+                manifest = json.load(f)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Invalid book manifest: {str(e)}") from e
+        if not isinstance(manifest, dict):
+            raise ValueError("Invalid book manifest: not an object")
+        if manifest.get("format") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported book format: {manifest.get('format')}")
+        return manifest
+
+    def _stored_versions(self) -> Dict[str, int]:
+        """Get the chapter file versions of the stored manifest.
+
+        Returns:
+            Version of each chapter the manifest refers to, or an empty dict
+            if no valid manifest is stored
+        """
+        try:
+            manifest = self._read_manifest()
+        except (FileNotFoundError, ValueError):
+            return {}
+        return {entry["id"]: entry["version"] for entry in manifest.get("chapters", [])}
+
+    def _chapter_path(self, chapter_id: str, version: int) -> Path:
+        """Get the file of a chapter version."""
+        return self.chapter_dir / f"{chapter_id}.{version}.json"
+
+    def _read_chapter(self, chapter_id: str, version: int) -> Dict[str, Any]:
+        """Read a chapter file.
+
+        Args:
+            chapter_id: Id of the chapter
+            version: Version of the chapter file
+
+        Returns:
+            Chapter in its dictionary form
+
+        Raises:
+            FileNotFoundError: If the chapter file is missing
+            ValueError: If the chapter file is invalid
+        """
+        with open(self._chapter_path(chapter_id, version), "r", encoding="utf-8") as f:
+            try:
+                return json.load(f)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Invalid chapter file {chapter_id}: {str(e)}") from e
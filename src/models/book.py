@@ -1,15 +1,218 @@
-"""Book model module for managing book structure and content."""
+"""Book model module for managing book structure and content.
 
-from typing import Any, Dict, List
+Model classes use ``__slots__`` and create their metadata dict on first use,
+so books with many thousands of sections stay small in memory. Titles are
+interned because the same titles ("Notes", "Summary", ...) repeat across a
+book.
 
+Every node has a stable ``id``. Chapters and sections are held in
+``NodeList`` containers, which find, move and remove nodes by id or
+position in O(log n).
 
-class Section:
+Chapters and sections carry a ``dirty`` flag that is set by every change, so
+storage can write only what changed. A chapter can also be created unloaded,
+in which case its content is read the first time it is used.
+
+Word and character counts are cached on every node once they are asked for.
+An edit changes the cached counts of the edited node and its chapter and
+book by the difference it makes, so book totals stay current without
+walking the book again.
+"""
+
+import secrets
+import sys
+from typing import Any, Callable, Dict, NamedTuple, Optional
+
+from src.book_editor.core.text_diff import make_delta
+from src.models.node_list import ListNode, NodeList
+
+
+def new_id() -> str:
+    """Create a node id."""
+    return secrets.token_hex(8)
+
+
+def _intern(value: Any) -> Any:
+    """Intern a plain string, leaving other values unchanged."""
+    return sys.intern(value) if type(value) is str else value  # pylint: disable=unidiomatic-typecheck
+
+
+class TextCounts(NamedTuple):
+    """Word and character counts."""
+
+    words: int
+    chars: int
+
+    @classmethod
+    def of(cls, text: str) -> "TextCounts":
+        """Count the words and characters of a text."""
+        return cls(len(text.split()), len(text))
+
+    @classmethod
+    def change(cls, old: str, new: str) -> "TextCounts":
+        """Get the change in counts from one version of a text to another.
+
+        Only the span that changed and the words at its edges are counted,
+        not the whole text.
+        """
+        start, end, _ = make_delta(old, new)
+        # Widen the span to whitespace so that no word crosses its edges
+        while start > 0 and not old[start - 1].isspace():
+            start -= 1
+        while end < len(old) and not old[end].isspace():
+            end += 1
+        new_end = end + len(new) - len(old)
+        return cls(
+            len(new[start:new_end].split()) - len(old[start:end].split()),
+            len(new) - len(old),
+        )
+
+    def plus(self, other: "TextCounts") -> "TextCounts":
+        """Add other counts."""
+        return TextCounts(self.words + other.words, self.chars + other.chars)
+
+    def minus(self, other: "TextCounts") -> "TextCounts":
+        """Subtract other counts."""
+        return TextCounts(self.words - other.words, self.chars - other.chars)
+
+
+NO_COUNTS = TextCounts(0, 0)
+
+
+class _Node(ListNode):
+    """Base class for model objects with a title and metadata."""
+
+    __slots__ = ("id", "_title", "_metadata", "dirty", "_counts")
+
+    def __init__(self, title: str) -> None:
+        super().__init__()
+        self.id = new_id()
+        self._title = _intern(title)
+        self._metadata: Optional[Dict[str, Any]] = None
+        self.dirty = True
+        # Counts of the node and its children, or None until asked for
+        self._counts: Optional[TextCounts] = None
+
+    @property
+    def counts(self) -> TextCounts:
+        """Get the word and character counts, including child nodes."""
+        if self._counts is None:
+            self._counts = self._count()
+        return self._counts
+
+    def _count(self) -> TextCounts:
+        """Count the words and characters of the node and its children."""
+        return NO_COUNTS
+
+    def _tracked(self) -> bool:
+        """Check whether the node or an owner has cached counts."""
+        node: Optional[ListNode] = self
+        while isinstance(node, _Node):
+            if node._counts is not None:
+                return True
+            node = node.owner
+        return False
+
+    def _change_counts(self, delta: TextCounts) -> None:
+        """Apply a change in counts to the node and its owners."""
+        node: Optional[ListNode] = self
+        while isinstance(node, _Node):
+            if node._counts is not None:
+                node._counts = node._counts.plus(delta)
+            node = node.owner
+
+    def _set_content(self, old: str, new: str) -> None:
+        """Update cached counts for a content change."""
+        if self._tracked():
+            self._change_counts(TextCounts.change(old, new))
+
+    def _child_added(self, child: ListNode) -> None:
+        """Add the counts of a new child."""
+        if isinstance(child, _Node) and self._tracked():
+            self._change_counts(child.counts)
+
+    def _child_removed(self, child: ListNode) -> None:
+        """Subtract the counts of a removed child."""
+        if isinstance(child, _Node) and self._tracked():
+            self._change_counts(NO_COUNTS.minus(child.counts))
+
+    @property
+    def title(self) -> str:
+        """Get the title."""
+        return self._title
+
+    @title.setter
+    def title(self, title: str) -> None:
+        """Set the title."""
+        self._title = _intern(title)
+        self.dirty = True
+
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        """Get the metadata dict, creating it on first use.
+
+        The dict may be changed by the caller, so getting it marks the
+        object dirty.
+        """
+        self._load()
+        if self._metadata is None:
+            self._metadata = {}
+        self.dirty = True
+        return self._metadata
+
+    @metadata.setter
+    def metadata(self, metadata: Dict[str, Any]) -> None:
+        """Replace the metadata dict."""
+        self._load()
+        self._metadata = metadata
+        self.dirty = True
+
+    def set_metadata(self, key: str, value: Any) -> None:
+        """Set metadata value."""
+        self.metadata[key] = value
+
+    def _metadata_dict(self) -> Dict[str, Any]:
+        """Get the metadata for serialization without creating it."""
+        self._load()
+        return self._metadata if self._metadata is not None else {}
+
+    def _load(self) -> None:
+        """Load content that has not been read yet."""
+
+
+class Section(_Node):
     """Represents a section within a chapter."""
 
+    __slots__ = ("_content",)
+
     def __init__(self, title: str, content: str = "") -> None:
-        self.title = title
-        self.content = content
-        self.metadata: Dict[str, Any] = {}
+        super().__init__(title)
+        self._content = content
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Section":
+        """Create an unmodified section from its dictionary form."""
+        section = cls(data.get("title", ""), data.get("content", ""))
+        section.id = data.get("id") or section.id
+        section._metadata = data.get("metadata") or None
+        section.dirty = False
+        return section
+
+    @property
+    def content(self) -> str:
+        """Get section content."""
+        return self._content
+
+    @content.setter
+    def content(self, content: str) -> None:
+        """Set section content."""
+        self._set_content(self._content, content)
+        self._content = content
+        self.dirty = True
+
+    def _count(self) -> TextCounts:
+        """Count the words and characters of the section."""
+        return TextCounts.of(self._content)
 
     def update_content(self, content: str) -> None:
         """Update section content."""
@@ -23,42 +226,128 @@ class Section:
         """Clear section content."""
         self.content = ""
 
-    def set_metadata(self, key: str, value: Any) -> None:
-        """Set metadata value."""
-        self.metadata[key] = value
-
     def to_dict(self) -> Dict[str, Any]:
         """Convert section to dictionary for serialization."""
         return {
             "title": self.title,
             "content": self.content,
-            "metadata": self.metadata,
+            "metadata": self._metadata_dict(),
         }
 
 
-class Chapter:
+class Chapter(_Node):
     """Represents a chapter in the book."""
 
+    __slots__ = ("_content", "_sections", "_loader")
+
     def __init__(self, title: str, content: str = "") -> None:
-        self.title = title
-        self.content = content
-        self.sections: List[Section] = []
-        self.metadata: Dict[str, Any] = {}
+        super().__init__(title)
+        self._content = content
+        self._sections: NodeList[Section] = NodeList(owner=self)
+        self._loader: Optional[Callable[[], Dict[str, Any]]] = None
+
+    @classmethod
+    def lazy(
+        cls,
+        title: str,
+        loader: Callable[[], Dict[str, Any]],
+        chapter_id: str,
+        counts: Optional[TextCounts] = None,
+    ) -> "Chapter":
+        """Create an unmodified chapter whose content is loaded on first use.
+
+        Args:
+            title: Chapter title
+            loader: Returns the chapter in its dictionary form
+            chapter_id: Id of the chapter
+            counts: Known counts of the chapter, so that they can be used
+                without loading it
+
+        Returns:
+            Unloaded chapter
+        """
+        chapter = cls(title)
+        chapter.id = chapter_id
+        chapter._loader = loader
+        chapter._counts = counts
+        chapter.dirty = False
+        return chapter
+
+    @property
+    def loaded(self) -> bool:
+        """Check whether the chapter content has been read."""
+        return self._loader is None
+
+    @property
+    def changed(self) -> bool:
+        """Check whether the chapter or any of its sections is dirty."""
+        return self.dirty or any(section.dirty for section in self._sections)
+
+    def mark_clean(self) -> None:
+        """Clear the dirty flags of the chapter and its sections."""
+        self.dirty = False
+        for section in self._sections:
+            section.dirty = False
+
+    @property
+    def content(self) -> str:
+        """Get chapter content."""
+        self._load()
+        return self._content
+
+    @content.setter
+    def content(self, content: str) -> None:
+        """Set chapter content."""
+        self._load()
+        self._set_content(self._content, content)
+        self._content = content
+        self.dirty = True
+
+    @property
+    def sections(self) -> NodeList[Section]:
+        """Get the sections.
+
+        The list should be changed through add_section and remove_section so
+        that the chapter is marked dirty.
+        """
+        self._load()
+        return self._sections
 
     def add_section(self, title: str, content: str = "") -> Section:
         """Add a new section to the chapter."""
         section = Section(title, content)
         self.sections.append(section)
+        self.dirty = True
         return section
 
     def remove_section(self, section: Section) -> None:
         """Remove a section from the chapter."""
         if section in self.sections:
             self.sections.remove(section)
+            self.dirty = True
 
-    def set_metadata(self, key: str, value: Any) -> None:
-        """Set metadata value."""
-        self.metadata[key] = value
+    def get_section(self, section_id: str) -> Optional[Section]:
+        """Get a section by id."""
+        return self.sections.get(section_id)
+
+    def _load(self) -> None:
+        """Read the chapter content if it has not been read yet."""
+        if self._loader is None:
+            return
+        data = self._loader()
+        self._loader = None
+        self._content = data.get("content", "")
+        self._sections = NodeList(
+            (Section.from_dict(s) for s in data.get("sections", [])), owner=self
+        )
+        self._metadata = data.get("metadata") or None
+
+    def _count(self) -> TextCounts:
+        """Count the words and characters of the chapter and its sections."""
+        counts = TextCounts.of(self.content)
+        for section in self._sections:
+            counts = counts.plus(section.counts)
+        return counts
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert chapter to dictionary for serialization."""
@@ -66,20 +355,41 @@ class Chapter:
             "title": self.title,
             "content": self.content,
             "sections": [section.to_dict() for section in self.sections],
-            "metadata": self.metadata,
+            "metadata": self._metadata_dict(),
         }
 
 
-class Book:
+class Book(_Node):
     """Represents a book with chapters and metadata."""
 
+    __slots__ = ("author", "chapters", "description")
+
     def __init__(self, title: str, author: str) -> None:
-        self.title = title
+        super().__init__(title)
         self.author = author
-        self.chapters: List[Chapter] = []
-        self.metadata: Dict[str, Any] = {}
+        self.chapters: NodeList[Chapter] = NodeList(owner=self)
         self.description = ""
 
+    def _count(self) -> TextCounts:
+        """Count the words and characters of all chapters."""
+        counts = NO_COUNTS
+        for chapter in self.chapters:
+            counts = counts.plus(chapter.counts)
+        return counts
+
+    def get_statistics(self) -> Dict[str, int]:
+        """Get book-wide counts.
+
+        The totals are kept up to date by edits, so this does not walk the
+        book after the first call.
+        """
+        counts = self.counts
+        return {
+            "word_count": counts.words,
+            "char_count": counts.chars,
+            "chapter_count": len(self.chapters),
+        }
+
     def add_chapter(self, title: str, content: str = "") -> Chapter:
         """Add a new chapter to the book."""
         chapter = Chapter(title, content)
@@ -91,6 +401,14 @@ class Book:
         if chapter in self.chapters:
             self.chapters.remove(chapter)
 
+    def get_chapter(self, chapter_id: str) -> Optional[Chapter]:
+        """Get a chapter by id."""
+        return self.chapters.get(chapter_id)
+
+    def move_chapter(self, from_index: int, to_index: int) -> None:
+        """Move a chapter to another position."""
+        self.chapters.move(from_index, to_index)
+
     def delete_chapter(self, index: int) -> None:
         """Delete a chapter by index."""
         if 0 <= index < len(self.chapters):
@@ -103,10 +421,6 @@ class Book:
             chapter.title = title
             chapter.content = content
 
-    def set_metadata(self, key: str, value: Any) -> None:
-        """Set metadata value."""
-        self.metadata[key] = value
-
     def to_dict(self) -> Dict[str, Any]:
         """Convert book to dictionary for serialization."""
         return {
@@ -114,5 +428,5 @@ class Book:
             "author": self.author,
             "description": self.description,
             "chapters": [chapter.to_dict() for chapter in self.chapters],
-            "metadata": self.metadata,
+            "metadata": self._metadata_dict(),
         }
@@ -0,0 +1,363 @@
+"""Node list module.
+
+A list of model nodes kept in a balanced tree (an implicit treap) instead of
+an array. The nodes are the tree nodes themselves and positions are implicit
+in subtree sizes, so insert-at, remove, move, positional access and finding
+the position of a node all take O(log n), and removing a node does not scan
+the list for it. Lookup by id uses a dict that is built on first use.
+
+A node can be in only one list at a time. The list may have an owner node,
+which is set as the ``owner`` of its nodes and told when nodes are added or
+removed.
+"""
+
+# Tree links are shared between ListNode and the functions of this module
+# pylint: disable=protected-access
+
+from collections.abc import MutableSequence
+from typing import Any, Dict, Generic, Iterable, Iterator, List, Optional, Tuple, TypeVar
+
+_LINKS = ("_left", "_right", "_parent", "_size")
+
+
+class ListNode:
+    """Base class for items of a ``NodeList``."""
+
+    __slots__ = _LINKS + ("_owner",)
+
+    id: str
+
+    def __init__(self) -> None:
+        self._left: Optional["ListNode"] = None
+        self._right: Optional["ListNode"] = None
+        self._parent: Optional["ListNode"] = None
+        # Size of the subtree, or 0 if the node is in no list
+        self._size = 0
+        self._owner: Optional["ListNode"] = None
+
+    @property
+    def owner(self) -> Optional["ListNode"]:
+        """Get the owner of the list holding this node."""
+        return self._owner
+
+    def _child_added(self, child: "ListNode") -> None:
+        """Handle a node added to a list this node owns."""
+
+    def _child_removed(self, child: "ListNode") -> None:
+        """Handle a node removed from a list this node owns."""
+
+    def __getstate__(self) -> Any:
+        """Get the state to pickle, without the tree links."""
+        state = {}
+        for cls in type(self).__mro__:
+            for name in getattr(cls, "__slots__", ()):
+                if name not in _LINKS and hasattr(self, name):
+                    state[name] = getattr(self, name)
+        return None, state
+
+    def __setstate__(self, state: Any) -> None:
+        """Restore a pickled node outside of any list."""
+        ListNode.__init__(self)
+        for name, value in state[1].items():
+            setattr(self, name, value)
+
+
+T = TypeVar("T", bound=ListNode)
+
+
+def _size(node: Optional[ListNode]) -> int:
+    """Get the number of nodes in a subtree."""
+    return node._size if node is not None else 0
+
+
+def _priority(node: ListNode) -> int:
+    """Get the heap priority of a node, which is random but fixed."""
+    return hash(node.id)
+
+
+def _update(node: ListNode) -> ListNode:
+    """Recompute a node's size and its children's parent links."""
+    node._size = 1 + _size(node._left) + _size(node._right)
+    if node._left is not None:
+        node._left._parent = node
+    if node._right is not None:
+        node._right._parent = node
+    return node
+
+
+def _merge(left: Optional[ListNode], right: Optional[ListNode]) -> Optional[ListNode]:
+    """Join two subtrees, all nodes of ``left`` coming first."""
+    if left is None:
+        return right
+    if right is None:
+        return left
+    if _priority(left) > _priority(right):
+        left._right = _merge(left._right, right)
+        return _update(left)
+    right._left = _merge(left, right._left)
+    return _update(right)
+
+
+def _split(
+    node: Optional[ListNode], count: int
+) -> Tuple[Optional[ListNode], Optional[ListNode]]:
+    """Split a subtree after its first ``count`` nodes."""
+    if node is None:
+        return None, None
+    if _size(node._left) >= count:
+        left, node._left = _split(node._left, count)
+        if left is not None:
+            left._parent = None
+        return left, _update(node)
+    node._right, right = _split(node._right, count - _size(node._left) - 1)
+    if right is not None:
+        right._parent = None
+    return _update(node), right
+
+
+class NodeList(MutableSequence, Generic[T]):  # pylint: disable=too-many-ancestors
+    """Ordered list of nodes with unique ids."""
+
+    def __init__(self, items: Iterable[T] = (), owner: Optional[ListNode] = None) -> None:
+        """Initialize node list.
+
+        Args:
+            items: Initial nodes; the owner is not told about them
+            owner: Node that owns the list
+
+        Raises:
+            ValueError: If a node is already in a list
+        """
+        self._root: Optional[ListNode] = None
+        self._by_id: Optional[Dict[str, T]] = None
+        self._owner: Optional[ListNode] = None
+        for item in items:
+            self.append(item)
+            item._owner = owner
+        self._owner = owner
+
+    def __len__(self) -> int:
+        """Get the number of nodes."""
+        return _size(self._root)
+
+    def __iter__(self) -> Iterator[T]:
+        """Iterate over the nodes in order."""
+        stack: List[Any] = []
+        node: Any = self._root
+        while stack or node is not None:
+            while node is not None:
+                stack.append(node)
+                node = node._left
+            node = stack.pop()
+            yield node
+            node = node._right
+
+    def __contains__(self, item: Any) -> bool:
+        """Check whether a node is in the list."""
+        if not isinstance(item, ListNode) or not item._size:
+            return False
+        while item._parent is not None:
+            item = item._parent
+        return item is self._root
+
+    def __getitem__(self, index: Any) -> Any:
+        """Get a node by position, or a list of nodes by slice."""
+        if isinstance(index, slice):
+            return list(self)[index]
+        return self._node_at(index)
+
+    def __setitem__(self, index: Any, item: Any) -> None:
+        """Replace the node at a position, or the nodes of a slice."""
+        if isinstance(index, slice):
+            items = list(self)
+            items[index] = item
+            self._replace_all(items)
+            return
+        index = self._normalize(index)
+        if self._node_at(index) is not item:
+            self._check_new(item)
+            self.pop(index)
+            self.insert(index, item)
+
+    def __delitem__(self, index: Any) -> None:
+        """Delete the node at a position, or the nodes of a slice."""
+        if isinstance(index, slice):
+            items = list(self)
+            del items[index]
+            self._replace_all(items)
+            return
+        self.pop(index)
+
+    def __eq__(self, other: object) -> bool:
+        """Compare nodes in order with another sequence."""
+        if isinstance(other, (NodeList, list, tuple)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        """Get a debug representation."""
+        return f"NodeList({list(self)!r})"
+
+    def __reduce__(self) -> Any:
+        """Pickle the nodes and the owner without telling the owner."""
+        return (self.__class__, (), {"_owner": self._owner}, iter(list(self)))
+
+    def insert(self, index: int, value: T) -> None:
+        """Insert a node before a position.
+
+        Raises:
+            ValueError: If the node is already in a list or its id is taken
+        """
+        self._check_new(value)
+        value._left = value._right = value._parent = None
+        value._size = 1
+        left, right = _split(self._root, self._clamp(index))
+        self._set_root(_merge(_merge(left, value), right))
+        if self._by_id is not None:
+            self._by_id[value.id] = value
+        if self._owner is not None:
+            value._owner = self._owner
+            self._owner._child_added(value)
+
+    def pop(self, index: int = -1) -> T:
+        """Remove and return the node at a position.
+
+        Raises:
+            IndexError: If the list is empty or the position does not exist
+        """
+        index = self._normalize(index)
+        left, right = _split(self._root, index)
+        node, right = _split(right, 1)
+        self._set_root(_merge(left, right))
+        if node is None:
+            raise IndexError("list index out of range")
+        node._size = 0
+        node._parent = None
+        if self._by_id is not None:
+            del self._by_id[node.id]
+        if self._owner is not None:
+            self._owner._child_removed(node)
+            node._owner = None
+        return node  # type: ignore[return-value]
+
+    def remove(self, value: T) -> None:
+        """Remove a node.
+
+        Raises:
+            ValueError: If the node is not in the list
+        """
+        self.pop(self.index(value))
+
+    def index(self, value: Any, start: int = 0, stop: Optional[int] = None) -> int:
+        """Get the position of a node.
+
+        Raises:
+            ValueError: If the node is not in the list or not in the range
+        """
+        if value not in self:
+            raise ValueError(f"{value!r} is not in list")
+        position = _size(value._left)
+        node = value
+        while node._parent is not None:
+            if node is node._parent._right:
+                position += _size(node._parent._left) + 1
+            node = node._parent
+        length = len(self)
+        start = start + length if start < 0 else start
+        stop = length if stop is None else (stop + length if stop < 0 else stop)
+        if not start <= position < stop:
+            raise ValueError(f"{value!r} is not in range")
+        return position
+
+    def get(self, item_id: str) -> Optional[T]:
+        """Get a node by id.
+
+        Args:
+            item_id: Id of the node
+
+        Returns:
+            Node, or None if no node has the id
+        """
+        if self._by_id is None:
+            self._by_id = {node.id: node for node in self}
+        return self._by_id.get(item_id)
+
+    def move(self, from_index: int, to_index: int) -> None:
+        """Move a node to another position.
+
+        Args:
+            from_index: Current position of the node
+            to_index: Position of the node after the move
+
+        Raises:
+            IndexError: If a position does not exist
+        """
+        to_index = self._normalize(to_index)
+        self.insert(to_index, self.pop(from_index))
+
+    def clear(self) -> None:
+        """Remove all nodes."""
+        nodes = list(self)
+        for node in nodes:
+            node._size = 0
+            node._left = node._right = node._parent = None
+        self._root = None
+        self._by_id = None
+        if self._owner is not None:
+            for node in nodes:
+                self._owner._child_removed(node)
+                node._owner = None
+
+    def reverse(self) -> None:
+        """Reverse the order of the nodes."""
+        self._replace_all(list(reversed(list(self))))
+
+    def _replace_all(self, items: List[T]) -> None:
+        """Replace the contents with new nodes."""
+        self.clear()
+        for item in items:
+            self.append(item)
+
+    def _check_new(self, item: T) -> None:
+        """Reject a node that is already in a list or whose id is taken."""
+        if item._size:
+            raise ValueError(f"{item!r} is already in a list")
+        if self._by_id is not None and item.id in self._by_id:
+            raise ValueError(f"Duplicate id: {item.id}")
+
+    def _set_root(self, root: Optional[ListNode]) -> None:
+        """Install a new tree root."""
+        if root is not None:
+            root._parent = None
+        self._root = root
+
+    def _clamp(self, index: int) -> int:
+        """Limit an insert position like ``list.insert`` does."""
+        length = len(self)
+        if index < 0:
+            index = max(index + length, 0)
+        return min(index, length)
+
+    def _normalize(self, index: int) -> int:
+        """Turn a possibly negative position into an offset from the start."""
+        length = len(self)
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError("list index out of range")
+        return index
+
+    def _node_at(self, index: int) -> T:
+        """Find the node at a position."""
+        index = self._normalize(index)
+        node: Any = self._root
+        while node is not None:
+            left = _size(node._left)
+            if index < left:
+                node = node._left
+            elif index == left:
+                return node
+            else:
+                index -= left + 1
+                node = node._right
+        raise IndexError("list index out of range")
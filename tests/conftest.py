@@ -8,6 +8,17 @@ from src.book_editor.app.core.editor import DocumentManager, EditorApp
 from src.book_editor.app.core.preview import PreviewManager
 from src.book_editor.core.editor import Editor
 from src.book_editor.core.template import Template, TemplateManager
+from src.book_editor.core.template_bundle import CACHE_DIR_ENV
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(
+    tmp_path_factory: pytest.TempPathFactory, monkeypatch: pytest.MonkeyPatch
+) -> Path:
+    """Keep cached files such as template bundles out of the home directory."""
+    path = tmp_path_factory.mktemp("cache")
+    monkeypatch.setenv(CACHE_DIR_ENV, str(path))
+    return path
 
 
 @pytest.fixture
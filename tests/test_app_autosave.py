@@ -0,0 +1,168 @@
+"""Tests for the background autosave service."""
+
+import threading
+from pathlib import Path
+
+import pytest
+
+from src.book_editor.app.core.autosave import AutoSaveService, save_snapshot
+from src.book_editor.core.document import Document
+from src.book_editor.core.revision_store import RevisionStore
+
+
+@pytest.fixture
+def autosave():
+    """Create an autosave service with a long interval."""
+    service = AutoSaveService(interval=3600)
+    yield service
+    service.close(timeout=5)
+
+
+def test_invalid_arguments() -> None:
+    """Test negative intervals are rejected."""
+    with pytest.raises(ValueError):
+        AutoSaveService(interval=-1)
+    with pytest.raises(ValueError):
+        AutoSaveService(slowdown=-1)
+    with pytest.raises(ValueError):
+        AutoSaveService(retry_delay=-1)
+
+
+def test_status_of_unknown_document(autosave: AutoSaveService) -> None:
+    """Test status of a document that was never submitted."""
+    assert autosave.status("missing") == {
+        "last_saved": None, "pending": False, "saving": False, "error": None
+    }
+
+
+def test_snapshots_are_coalesced(autosave: AutoSaveService) -> None:
+    """Test only the newest snapshot of a document is written."""
+    written = []
+    for version in range(5):
+        autosave.submit("doc", version, written.append)
+    assert written == []
+    assert autosave.status("doc")["pending"]
+
+    assert autosave.flush(timeout=5)
+    assert written == [4]
+    status = autosave.status("doc")
+    assert not status["pending"]
+    assert status["last_saved"] is not None
+
+
+def test_documents_are_saved_separately(autosave: AutoSaveService) -> None:
+    """Test snapshots of different documents are all written."""
+    written = {}
+    autosave.submit("a", 1, lambda s: written.__setitem__("a", s))
+    autosave.submit("b", 2, lambda s: written.__setitem__("b", s))
+    assert autosave.flush(timeout=5)
+    assert written == {"a": 1, "b": 2}
+
+
+def test_scheduled_save() -> None:
+    """Test due snapshots are written without flushing."""
+    saved = threading.Event()
+    service = AutoSaveService(interval=0.01)
+    try:
+        service.submit("doc", "text", lambda s: saved.set())
+        assert saved.wait(timeout=5)
+    finally:
+        service.close(timeout=5)
+
+
+def test_slow_writes_delay_next_save() -> None:
+    """Test a slow save pushes back the next save of the same document."""
+    service = AutoSaveService(interval=0, slowdown=1000)
+    written = []
+    try:
+        service.submit("doc", 1, written.append)
+        assert service.flush(timeout=5)
+        service._slots["doc"].last_duration = 1.0
+        service.submit("doc", 2, written.append)
+        assert service.status("doc")["pending"]
+        assert written == [1]
+    finally:
+        service.close(timeout=5)
+    assert written == [1, 2]
+
+
+def test_failed_save_is_reported(autosave: AutoSaveService) -> None:
+    """Test writer errors are recorded in the status and fail the flush."""
+    def fail(snapshot):
+        raise OSError("disk full")
+
+    autosave.submit("doc", "text", fail)
+    assert not autosave.flush(timeout=5)
+    status = autosave.status("doc")
+    assert status["error"] == "disk full"
+    assert status["pending"]
+    assert status["last_saved"] is None
+
+
+def test_failed_save_is_retried() -> None:
+    """Test a snapshot whose write failed is written by a later retry."""
+    service = AutoSaveService(interval=3600, retry_delay=0.01)
+    attempts = []
+    written = threading.Event()
+
+    def flaky(snapshot):
+        attempts.append(snapshot)
+        if len(attempts) < 3:
+            raise OSError("disk full")
+        written.set()
+
+    try:
+        service.submit("doc", "text", flaky)
+        assert not service.flush(timeout=5)
+        assert written.wait(timeout=5)
+        assert attempts == ["text"] * 3
+        assert service.flush(timeout=5)
+        assert service.status("doc")["error"] is None
+    finally:
+        service.close(timeout=5)
+
+
+def test_close_reports_failed_saves() -> None:
+    """Test closing returns False when a snapshot could not be written."""
+    service = AutoSaveService(interval=3600, retry_delay=3600)
+    attempts = []
+
+    def fail(snapshot):
+        attempts.append(snapshot)
+        raise OSError("disk full")
+
+    service.submit("doc", "text", fail)
+    assert not service.close(timeout=5)
+    assert attempts == ["text"]
+    assert not service.close(timeout=5)
+
+
+def test_close_flushes_pending_snapshots() -> None:
+    """Test closing the service writes pending snapshots."""
+    service = AutoSaveService(interval=3600)
+    written = []
+    service.submit("doc", "final", written.append)
+    assert service.close(timeout=5)
+    assert written == ["final"]
+    with pytest.raises(RuntimeError):
+        service.submit("doc", "late", written.append)
+
+
+def test_save_snapshot_records_revisions(tmp_path: Path) -> None:
+    """Test snapshots are saved and recorded once per distinct content."""
+    path = tmp_path / "doc.json"
+    store = RevisionStore(tmp_path / "doc.jsonl")
+    doc = Document("Doc", "Author", "first")
+    save_snapshot(path, store, doc.to_dict())
+    save_snapshot(path, store, doc.to_dict())
+    doc.update_content("second")
+    snapshot = doc.to_dict()
+    doc.update_content("third")
+    save_snapshot(path, store, snapshot)
+
+    assert Document.load(path).content == "second"
+    assert len(store) == 2
+    assert store.content(-1) == "second"
+    assert store.get(1)["author"] == "Author"
+    save_snapshot(tmp_path / "other.json", None, snapshot)
+    assert len(store) == 2
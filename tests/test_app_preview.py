@@ -0,0 +1,107 @@
+"""Tests for background preview rendering."""
+
+import time
+
+import pytest
+
+from src.book_editor.app.core.preview import PreviewManager
+from src.book_editor.core.template import Template
+
+
+@pytest.fixture
+def background_preview():
+    """Create a preview manager with a short debounce interval."""
+    manager = PreviewManager(debounce=0.05)
+    yield manager
+    manager.close()
+
+
+def test_latest_preview_is_non_blocking(background_preview: PreviewManager) -> None:
+    """Test latest_preview returns immediately before anything is rendered."""
+    assert background_preview.latest_preview() is None
+    assert background_preview.is_current()
+
+
+def test_background_render(background_preview: PreviewManager) -> None:
+    """Test requested content is rendered with the current template."""
+    background_preview.set_template(Template("Test", "general"))
+    background_preview.request_preview("# Title")
+    assert background_preview.wait(timeout=5)
+    assert "<h1>Title</h1>" in background_preview.latest_preview()
+
+
+def test_debounce_renders_only_latest(background_preview: PreviewManager) -> None:
+    """Test a burst of requests is rendered once, with the newest content."""
+    rendered = []
+    original = PreviewManager._render
+
+    def counting_render(content, template):
+        rendered.append(content)
+        return original(content, template)
+
+    background_preview._render = counting_render  # type: ignore[assignment]
+    for i in range(20):
+        background_preview.request_preview(f"draft {i}")
+    assert background_preview.wait(timeout=5)
+    assert background_preview.latest_preview() == "draft 19"
+    assert rendered == ["draft 19"]
+
+
+def test_stale_render_is_dropped(background_preview: PreviewManager) -> None:
+    """Test a render overtaken by a newer request is not published."""
+    def slow_render(content, template):
+        if content == "old":
+            time.sleep(0.3)
+        return content
+
+    background_preview._render = slow_render  # type: ignore[assignment]
+    background_preview.request_preview("old")
+    time.sleep(0.1)
+    background_preview.request_preview("new")
+    assert background_preview.wait(timeout=5)
+    assert background_preview.latest_preview() == "new"
+
+
+def test_repeated_request_is_not_rendered_again(
+    background_preview: PreviewManager,
+) -> None:
+    """Test requesting unchanged content keeps the current preview."""
+    rendered = []
+
+    def counting_render(content, template):
+        rendered.append(content)
+        return content
+
+    background_preview._render = counting_render  # type: ignore[assignment]
+    generation = background_preview.request_preview("text")
+    assert background_preview.wait(timeout=5)
+    assert background_preview.request_preview("text") == generation
+    assert background_preview.is_current()
+    background_preview.set_template(Template("Test", "general"))
+    assert background_preview.request_preview("text") == generation + 1
+    assert background_preview.wait(timeout=5)
+    assert rendered == ["text", "text"]
+
+
+def test_unstyled_preview() -> None:
+    """Test unstyled previews are the plain HTML conversion."""
+    template = Template("Test", "general")
+    manager = PreviewManager(debounce=0, block_mode=True, styled=False)
+    manager.set_template(template)
+    try:
+        manager.request_preview("# Title\n\nText")
+        assert manager.wait(timeout=5)
+        assert manager.latest_preview() == "\n".join(
+            [template.convert("# Title\n"), template.convert("Text")]
+        )
+        assert "style=" not in manager.latest_preview()
+    finally:
+        manager.close()
+
+
+def test_close_rejects_requests() -> None:
+    """Test requests after close raise an error."""
+    manager = PreviewManager(debounce=0)
+    manager.close()
+    with pytest.raises(RuntimeError):
+        manager.request_preview("text")
@@ -0,0 +1,149 @@
+"""Tests for block-keyed preview diffs."""
+
+import pytest
+
+from src.book_editor.app.core.preview import PreviewManager
+from src.book_editor.app.core.preview_diff import (
+    FrameDiff,
+    Fragment,
+    apply_changes,
+    apply_diff,
+    chunk_fragments,
+    diff_frames,
+    fragment_keys,
+)
+from src.book_editor.app.core.resources import RenderCache
+from src.book_editor.core.template import Template
+
+
+def frame(*sources: str):
+    """Build a frame whose HTML is the block source."""
+    return [Fragment(k, s) for k, s in zip(fragment_keys(sources), sources)]
+
+
+@pytest.fixture
+def block_preview():
+    """Create a block-mode preview manager without debounce."""
+    manager = PreviewManager(debounce=0, render_cache=RenderCache(), block_mode=True)
+    manager.set_template(Template("Test", "general"))
+    yield manager
+    manager.close()
+
+
+def test_fragment_keys_are_stable() -> None:
+    """Test keys depend on content and tell duplicates apart."""
+    keys = fragment_keys(["a", "b", "a"])
+    assert keys == fragment_keys(["a", "b", "a"])
+    assert len(set(keys)) == 3
+    assert keys[0].split("-")[0] == keys[2].split("-")[0]
+
+
+@pytest.mark.parametrize(
+    "old,new",
+    [
+        (("a", "b", "c"), ("a", "B", "c")),
+        (("a", "b", "c"), ("a", "c")),
+        (("a", "c"), ("x", "a", "b", "c", "y")),
+        ((), ("a",)),
+        (("a", "b"), ()),
+    ],
+)
+def test_diff_roundtrip(old, new) -> None:
+    """Test applying a diff rebuilds the new frame."""
+    assert apply_changes(frame(*old), diff_frames(frame(*old), frame(*new))) == frame(*new)
+
+
+def test_diff_only_contains_changed_blocks() -> None:
+    """Test unchanged blocks are not sent."""
+    old = frame(*(f"p{i}" for i in range(100)))
+    new = frame(*(f"p{i}" if i != 50 else "edited" for i in range(100)))
+    changes = diff_frames(old, new)
+    assert len(changes) == 1
+    assert changes[0].op == "replace"
+    assert (changes[0].start, changes[0].end) == (50, 51)
+    assert [f.html for f in changes[0].fragments] == ["edited"]
+
+
+def test_apply_full_refresh() -> None:
+    """Test a full refresh replaces the whole frame."""
+    diff = FrameDiff(0, 3, True, (), tuple(frame("x")))
+    assert apply_diff(frame("a", "b"), diff) == frame("x")
+
+
+def test_render_fragments(block_preview: PreviewManager) -> None:
+    """Test content is converted block by block."""
+    fragments = block_preview.render_fragments(
+        "# Title\n\nText", Template("Test", "general")
+    )
+    assert len(fragments) == 2
+    assert "<h1>Title</h1>" in fragments[0].html
+    assert "<p>Text</p>" in fragments[1].html
+    assert block_preview.render_fragments("# Title") == [
+        Fragment(fragment_keys(["# Title"])[0], "# Title")
+    ]
+
+
+def test_render_fragments_keep_markdown_context(
+    block_preview: PreviewManager,
+) -> None:
+    """Test fragments render like the whole text where context carries over."""
+    template = Template("Test", "general")
+    text = (
+        "See [the docs][docs].\n\n"
+        "3. three\n\n4. four\n\n    more about four\n\n"
+        "> quoted\n\n> still quoted\n\n"
+        "[docs]: https://example.com"
+    )
+    fragments = block_preview.render_fragments(text, template)
+    # The block of definitions renders to nothing
+    html = "\n".join(fragment.html for fragment in fragments if fragment.html)
+    assert html == template.convert(text)
+    assert html.count("<ol") == 1
+    assert html.count("<blockquote>") == 1
+    assert '<a href="https://example.com">the docs</a>' in html
+
+
+def test_styled_frame_is_framed_once(block_preview: PreviewManager) -> None:
+    """Test the page style is applied once around all blocks."""
+    template = Template("Test", "general")
+    block_preview.request_preview("# Title\n\nFirst\n\nSecond")
+    assert block_preview.wait(timeout=5)
+    html = block_preview.latest_preview()
+    assert html == template.render("# Title\n\nFirst\n\nSecond")
+    assert html.count(template._build_content_style()) == 1
+
+
+def test_chunks_are_stable() -> None:
+    """Test an edit only changes the chunks around it."""
+    sources = [f"paragraph {i} " + "x" * 400 for i in range(400)]
+    chunks = chunk_fragments(frame(*sources), min_size=2000, max_size=8000)
+    assert "\n".join(chunks) == "\n".join(sources)
+    assert all(len(chunk) <= 8000 + 500 for chunk in chunks)
+
+    sources.insert(10, "inserted paragraph")
+    edited = chunk_fragments(frame(*sources), min_size=2000, max_size=8000)
+    changed = [chunk for chunk in edited if chunk not in chunks]
+    assert len(changed) <= 2
+    assert len(edited) > 20
+
+
+def test_diff_since(block_preview: PreviewManager) -> None:
+    """Test clients receive only the blocks that changed since their frame."""
+    assert block_preview.diff_since(0).full
+    block_preview.request_preview("# Title\n\nFirst\n\nSecond")
+    assert block_preview.wait(timeout=5)
+    full = block_preview.diff_since(0)
+    assert full.full and len(full.fragments) == 3
+    shown = apply_diff([], full)
+
+    block_preview.request_preview("# Title\n\nFirst edited\n\nSecond")
+    assert block_preview.wait(timeout=5)
+    diff = block_preview.diff_since(full.generation)
+    assert not diff.full
+    assert [(c.op, c.start, c.end) for c in diff.changes] == [("replace", 1, 2)]
+    shown = apply_diff(shown, diff)
+    assert shown == block_preview.latest_frame()[1]
+    assert "First edited" in block_preview.latest_preview()
+
+    # Unknown base frames fall back to a full refresh
+    assert block_preview.diff_since(12345).full
@@ -0,0 +1,143 @@
+"""Tests for shared application resources."""
+
+import sys
+import threading
+from pathlib import Path
+
+import markdown
+import pytest
+
+from src.book_editor.app.core.preview import PreviewManager
+from src.book_editor.app.core.resources import RenderCache, ResourceRegistry
+from src.book_editor.core.document import Document
+from src.book_editor.core.markdown_pool import MarkdownPool
+from src.book_editor.core.template import Template, TemplateManager, create_catalog
+
+
+class Closable:
+    """Resource that records whether it was closed."""
+
+    def __init__(self) -> None:
+        self.closed = False
+
+    def close(self) -> None:
+        self.closed = True
+
+
+def test_registry_shares_and_releases() -> None:
+    """Test resources are created once and closed on last release."""
+    registry = ResourceRegistry()
+    first = registry.acquire("res", Closable)
+    second = registry.acquire("res", Closable)
+    assert first is second
+    assert registry.refcount("res") == 2
+
+    registry.release("res")
+    assert "res" in registry
+    assert not first.closed
+
+    registry.release("res")
+    assert "res" not in registry
+    assert first.closed
+    registry.release("res")  # Releasing an unknown key is a no-op
+    assert registry.acquire("res", Closable) is not first
+
+
+def test_registry_is_thread_safe() -> None:
+    """Test concurrent acquires create a single resource."""
+    registry = ResourceRegistry()
+    created = []
+
+    def factory():
+        created.append(1)
+        return object()
+
+    threads = [
+        threading.Thread(target=registry.acquire, args=("res", factory))
+        for _ in range(16)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(created) == 1
+    assert registry.refcount("res") == 16
+
+
+def test_render_cache_lru() -> None:
+    """Test the render cache evicts least recently used entries."""
+    template = Template("Test", "general")
+    cache = RenderCache(max_entries=2)
+    cache.put(template, "a", "<p>a</p>")
+    cache.put(template, "b", "<p>b</p>")
+    assert cache.get(template, "a") == "<p>a</p>"
+    cache.put(template, "c", "<p>c</p>")
+    assert cache.get(template, "b") is None
+    assert len(cache) == 2
+    assert cache.get(Template("Test", "general"), "a") is None
+
+    with pytest.raises(ValueError):
+        RenderCache(max_entries=0)
+
+
+def test_render_cache_byte_limit() -> None:
+    """Test the render cache evicts entries to stay under its byte limit."""
+    template = Template("Test", "general")
+    page = "x" * 10_000
+    cache = RenderCache(max_bytes=5 * sys.getsizeof(page))
+    for i in range(10):
+        cache.put(template, f"{i}", page)
+    assert len(cache) < 5
+    assert cache.nbytes <= cache.max_bytes
+    assert cache.get(template, "9") == page
+    assert cache.get(template, "0") is None
+
+    # Renders that do not fit at all are not cached
+    cache.put(template, "huge", page * 10)
+    assert cache.get(template, "huge") is None
+    assert cache.get(template, "9") == page
+    cache.close()
+    assert cache.nbytes == 0
+
+    with pytest.raises(ValueError):
+        RenderCache(max_bytes=0)
+
+
+def test_template_managers_share_catalog(tmp_path: Path) -> None:
+    """Test managers sharing a catalog keep their categories apart."""
+    catalog = create_catalog(tmp_path)
+    first = TemplateManager(tmp_path, catalog=catalog)
+    second = TemplateManager(tmp_path, catalog=catalog)
+    assert first.add_category("poetry")
+    assert "poetry" not in second.get_categories()
+
+    template = Template("Shared", "general")
+    assert first.save_template(template)
+    assert second.list_templates() == ["Shared"]
+
+
+def test_preview_managers_share_render_cache() -> None:
+    """Test preview managers reuse renders from a shared cache."""
+    template = Template("Test", "general")
+    cache = RenderCache()
+    first = PreviewManager(render_cache=cache)
+    second = PreviewManager(render_cache=cache)
+    first.set_template(template)
+    second.set_template(template)
+    doc = Document("Test", "Author", "# Shared")
+
+    html = first.get_preview(doc)
+    assert len(cache) == 1
+    assert second.get_preview(doc) == html
+
+
+def test_markdown_pool_matches_markdown() -> None:
+    """Test pooled converters produce the same output as markdown."""
+    pool = MarkdownPool(max_idle=1)
+    texts = ["# Title", "Some *text*\n\n- a\n- b", "[link][1]\n\n[1]: http://a"]
+    for text in texts * 2:
+        assert pool.convert(text) == markdown.markdown(text)
+    assert pool.idle == 1
+
+    with pytest.raises(ValueError):
+        MarkdownPool(max_idle=-1)
@@ -0,0 +1,129 @@
+"""Tests for streamed template uploads."""
+
+import hashlib
+import io
+from pathlib import Path
+
+import pytest
+
+from src.book_editor.app.core.uploads import TemplateUploader, TextSummary
+
+
+class ChunkCountingStream(io.BytesIO):
+    """Stream that records the size of every read."""
+
+    def __init__(self, data: bytes):
+        super().__init__(data)
+        self.reads = []
+
+    def read(self, size=-1):
+        self.reads.append(size)
+        return super().read(size)
+
+
+@pytest.fixture
+def uploader(tmp_path: Path) -> TemplateUploader:
+    """Create an uploader with a small chunk size."""
+    return TemplateUploader(tmp_path, chunk_size=7)
+
+
+def test_invalid_arguments(tmp_path: Path) -> None:
+    """Test chunk and size limits are validated."""
+    with pytest.raises(ValueError):
+        TemplateUploader(tmp_path, chunk_size=0)
+    with pytest.raises(ValueError):
+        TemplateUploader(tmp_path, max_size=0)
+
+
+def test_text_summary_across_chunks() -> None:
+    """Test words, lines and description are counted across chunk borders."""
+    data = "\n# Über Title\n\nsome words here\nand more".encode("utf-8")
+    summary = TextSummary()
+    for i in range(0, len(data), 3):
+        summary.feed(data[i:i + 3])
+    summary.close()
+    assert summary.description == "Über Title"
+    assert summary.word_count == 8
+    assert summary.line_count == 4
+
+
+def test_ingest_streams_in_chunks(uploader: TemplateUploader) -> None:
+    """Test uploads are read in fixed-size chunks and stored whole."""
+    data = b"# Heading\n\nBody text of the template.\n"
+    stream = ChunkCountingStream(data)
+    result = uploader.ingest(stream, "style.md", "general")
+
+    assert set(stream.reads) == {7}
+    assert result.path == uploader.template_dir / "style.md"
+    assert result.path.read_bytes() == data
+    assert result.digest == hashlib.sha256(data).hexdigest()
+    assert result.size == len(data)
+    assert not result.duplicate
+    template = result.template
+    assert template.name == "style"
+    assert template.metadata["format"] == "markdown"
+    assert template.metadata["description"] == "Heading"
+    assert template.metadata["word_count"] == 7
+    assert not [p for p in uploader.template_dir.iterdir() if p.name.startswith(".upload-")]
+
+
+def test_identical_uploads_are_deduplicated(uploader: TemplateUploader) -> None:
+    """Test identical content is stored once, even across uploader instances."""
+    first = uploader.ingest(io.BytesIO(b"same content"), "a.txt")
+    second = TemplateUploader(uploader.template_dir).ingest(io.BytesIO(b"same content"), "b.txt")
+    assert second.duplicate
+    assert second.path == first.path
+    assert not (uploader.template_dir / "b.txt").exists()
+    assert second.template.name == "b"
+    assert second.template.metadata["source"] == "a.txt"
+
+
+def test_taken_names_are_not_replaced(uploader: TemplateUploader) -> None:
+    """Test uploads never overwrite stored files or existing templates."""
+    first = uploader.ingest(io.BytesIO(b"old"), "a.txt")
+    second = uploader.ingest(io.BytesIO(b"new"), "a.txt")
+    assert first.path.read_bytes() == b"old"
+    assert second.path == uploader.template_dir / "a-2.txt"
+    assert second.path.read_bytes() == b"new"
+    assert second.template.name == "a-2"
+    assert uploader.ingest(io.BytesIO(b"old"), "b.txt").duplicate
+
+    (uploader.template_dir / "style.json").write_text("{}", encoding="utf-8")
+    third = uploader.ingest(io.BytesIO(b"styled"), "style.v1.md")
+    assert third.path.name == "style-2.v1.md"
+    assert third.template.name == "style-2"
+
+
+def test_same_upload_again_keeps_its_name(uploader: TemplateUploader) -> None:
+    """Test uploading an identical file again reuses its file and template."""
+    first = uploader.ingest(io.BytesIO(b"content"), "a.md")
+    (uploader.template_dir / "a.json").write_text("{}", encoding="utf-8")
+    again = uploader.ingest(io.BytesIO(b"content"), "a.md")
+    assert again.duplicate
+    assert again.path == first.path
+    assert again.template.name == "a"
+
+
+def test_unknown_file_types_are_rejected(uploader: TemplateUploader) -> None:
+    """Test only template formats are accepted."""
+    for name in ("letter.docx", "script.py", "README"):
+        with pytest.raises(ValueError, match="Unsupported"):
+            uploader.ingest(io.BytesIO(b"x"), name)
+    stored = uploader.template_dir.iterdir()
+    assert not [path for path in stored if not path.name.startswith(".")]
+
+
+def test_oversized_upload_is_rejected(tmp_path: Path) -> None:
+    """Test uploads over the size limit leave nothing behind."""
+    uploader = TemplateUploader(tmp_path, chunk_size=4, max_size=10)
+    with pytest.raises(ValueError, match="maximum size"):
+        uploader.ingest(io.BytesIO(b"x" * 11), "big.txt")
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_invalid_file_name(uploader: TemplateUploader) -> None:
+    """Test hidden and empty file names are rejected."""
+    with pytest.raises(ValueError):
+        uploader.ingest(io.BytesIO(b"x"), ".hidden")
+    with pytest.raises(ValueError):
+        uploader.ingest(io.BytesIO(b"x"), "")
@@ -0,0 +1,130 @@
+"""Tests for virtualized preview paging."""
+
+import pytest
+
+from src.book_editor.app.core.viewport import (
+    ViewportIndex,
+    group_blocks,
+    index_blocks,
+    reference_definitions,
+)
+
+
+def make_book(chapters: int, paragraphs: int) -> str:
+    """Build a long Markdown text."""
+    parts = []
+    for chapter in range(chapters):
+        parts.append(f"# Chapter {chapter}")
+        parts.extend(f"Paragraph {chapter}.{i} text." for i in range(paragraphs))
+    return "\n\n".join(parts)
+
+
+def test_index_blocks() -> None:
+    """Test headings, paragraphs and code fences are split into blocks."""
+    text = "\n\n# Title\n\nFirst line\nsecond line\n\n```\ncode\n\nmore\n```\n\n  ## Sub"
+    blocks = index_blocks(text)
+    assert [text[b.start:b.end] for b in blocks] == [
+        "# Title",
+        "First line\nsecond line",
+        "```\ncode\n\nmore\n```",
+        "  ## Sub",
+    ]
+    assert [b.level for b in blocks] == [1, 0, 0, 2]
+    assert index_blocks("") == []
+
+
+def test_group_blocks() -> None:
+    """Test blocks Markdown reads together are grouped."""
+    text = (
+        "Intro\n\n- a\n\n- b\n\n    more b\n\nOutro\n\n"
+        "> one\n\n> two\n\n1. x\n\n2) y"
+    )
+    assert [text[g.start:g.end] for g in group_blocks(text)] == [
+        "Intro",
+        "- a\n\n- b\n\n    more b",
+        "Outro",
+        "> one\n\n> two",
+        "1. x\n\n2) y",
+    ]
+
+
+def test_pages_include_reference_definitions() -> None:
+    """Test every page can resolve reference links defined elsewhere."""
+    text = make_book(3, 4) + "\n\n[ref]: https://example.com\n   [other]: /x"
+    assert reference_definitions(text) == "[ref]: https://example.com\n   [other]: /x"
+    viewport = ViewportIndex(page_blocks=100, margin=0)
+    viewport.update(text)
+    assert viewport.page_text(0).endswith("[ref]: https://example.com\n   [other]: /x")
+    assert reference_definitions("no [links] here") == ""
+
+
+def test_invalid_arguments() -> None:
+    """Test page size and margin are validated."""
+    with pytest.raises(ValueError):
+        ViewportIndex(page_blocks=0)
+    with pytest.raises(ValueError):
+        ViewportIndex(margin=-1)
+
+
+def test_pages_start_at_headings() -> None:
+    """Test every chapter starts a page."""
+    viewport = ViewportIndex(page_blocks=100, margin=0)
+    viewport.update(make_book(3, 4))
+    assert viewport.page_count == 3
+    assert viewport.page_text(1).startswith("# Chapter 1")
+    assert "Chapter 2" not in viewport.page_text(1)
+    with pytest.raises(IndexError):
+        viewport.page_text(3)
+
+
+def test_page_size_is_bounded() -> None:
+    """Test long sections are split so a page never exceeds its block limit."""
+    viewport = ViewportIndex(page_blocks=5, margin=1)
+    text = make_book(1, 1000)
+    viewport.update(text)
+    assert viewport.page_count == 201
+    longest = max(len(viewport.page_text(p)) for p in range(viewport.page_count))
+    assert longest < 200
+    assert viewport.page_text(0) + "\n\n" in text
+
+
+def test_margin_adds_context() -> None:
+    """Test the margin includes neighbouring blocks."""
+    viewport = ViewportIndex(page_blocks=100, margin=1)
+    viewport.update(make_book(3, 2))
+    page = viewport.page_text(1)
+    assert page.startswith("Paragraph 0.1")
+    assert page.endswith("# Chapter 2")
+
+
+def test_window_follows_edits() -> None:
+    """Test the page of the last edit is tracked."""
+    viewport = ViewportIndex(page_blocks=100, margin=0)
+    text = make_book(3, 2)
+    assert viewport.update(text)
+    assert viewport.edit_offset is None
+    assert not viewport.update(text)
+
+    edited = text.replace("Paragraph 2.0", "Paragraph 2.0 edited")
+    assert viewport.update(edited)
+    assert viewport.page_of(viewport.edit_offset) == 2
+    assert "edited" in viewport.window(viewport.edit_offset)
+    assert ViewportIndex().window(0) == ""
+
+
+def test_select_page() -> None:
+    """Test the selected page follows edits and stays within the text."""
+    viewport = ViewportIndex(page_blocks=100, margin=0)
+    text = make_book(3, 2)
+    assert viewport.select_page(text, 7) == (viewport.page_text(2), 2, 3)
+    edited = text.replace("Paragraph 1.0", "Paragraph 1.0 edited")
+    source, page, pages = viewport.select_page(edited, 2)
+    assert (page, pages) == (1, 3)
+    assert "edited" in source
+
+
+def test_select_page_without_blocks() -> None:
+    """Test a text without blocks is previewed whole instead of failing."""
+    viewport = ViewportIndex()
+    for text in ("\n" * 20000, " \n" * 10000, ""):
+        assert viewport.select_page(text, 3) == (text, 0, 1)
@@ -0,0 +1,151 @@
+"""Tests for batched edits in the editor components."""
+
+from typing import List
+
+import pytest
+
+from src.components.batch import EditBatch
+from src.components.editor import Editor
+from src.components.text_editor import EditorComponent
+from src.models.book import Book
+
+
+@pytest.fixture
+def editor() -> Editor:
+    """Create an editor with a two chapter book."""
+    book = Book("Title", "Author")
+    book.add_chapter("One", "alpha beta gamma")
+    book.add_chapter("Two", "delta epsilon").add_section("Notes", "zeta")
+    editor = Editor()
+    editor.load_book(book)
+    return editor
+
+
+def contents(editor: Editor) -> List[str]:
+    """Get the chapter and section texts of the editor's book."""
+    texts = []
+    for chapter in editor.current_book.chapters:
+        texts.append(chapter.content)
+        texts.extend(section.content for section in chapter.sections)
+    return texts
+
+
+def test_build_sorts_and_validates() -> None:
+    """Test edits are sorted by offset and checked against the text."""
+    batch = EditBatch("text")
+    batch.replace(6, 10, "B")
+    batch.insert(0, "[")
+    batch.insert(0, "(")
+    batch.delete(5, 6)
+    batch.replace(11, 16, "gamma")
+    assert len(batch) == 5
+    (record,) = batch.build(lambda _: "alpha beta gamma", 0.0)
+    assert record.redo("alpha beta gamma") == "[(alphaB gamma"
+    assert len(record.spans) == 4
+
+    overlapping = EditBatch("text")
+    overlapping.replace(0, 5, "x")
+    overlapping.replace(4, 6, "y")
+    with pytest.raises(ValueError):
+        overlapping.build(lambda _: "alpha beta", 0.0)
+    outside = EditBatch("text")
+    outside.delete(3, 20)
+    with pytest.raises(ValueError):
+        outside.build(lambda _: "alpha", 0.0)
+    with pytest.raises(ValueError):
+        outside.replace(5, 4, "")
+
+
+def test_editor_batch_is_one_step(editor: Editor) -> None:
+    """Test a batch across chapters is applied, undone and redone at once."""
+    book = editor.current_book
+    notified: List[list] = []
+    editor.add_listener(notified.append)
+    original = contents(editor)
+
+    with editor.batch() as batch:
+        batch.replace(0, 5, "ALPHA")
+        batch.replace(11, 16, "GAMMA")
+        batch.insert(0, "* ", book.chapters[1].id)
+        batch.insert(4, "!", (book.chapters[1].id, book.chapters[1].sections[0].id))
+        assert contents(editor) == original
+
+    edited = ["ALPHA beta GAMMA", "* delta epsilon", "zeta!"]
+    assert contents(editor) == edited
+    assert len(editor.undo_stack) == 1
+    assert len(notified) == 1
+    assert len(notified[0]) == 3
+
+    editor.undo()
+    assert contents(editor) == original
+    editor.redo()
+    assert contents(editor) == edited
+    assert len(notified) == 3
+
+
+def test_editor_batch_is_atomic(editor: Editor) -> None:
+    """Test a failing batch changes nothing."""
+    original = contents(editor)
+    with pytest.raises(RuntimeError):
+        with editor.batch() as batch:
+            batch.insert(0, "x")
+            raise RuntimeError("stop")
+    with pytest.raises(ValueError):
+        with editor.batch() as batch:
+            batch.insert(0, "x")
+            batch.insert(0, "y", "missing")
+    with pytest.raises(ValueError):
+        with editor.batch() as batch:
+            batch.insert(0, "x")
+            batch.delete(0, 100)
+    assert contents(editor) == original
+    assert not editor.undo_stack
+
+
+def test_no_direct_edits_in_batch(editor: Editor) -> None:
+    """Test the editor rejects direct edits while a batch is open."""
+    with editor.batch():
+        with pytest.raises(ValueError):
+            editor.update_content("x")
+        with pytest.raises(ValueError):
+            editor.undo()
+        with pytest.raises(ValueError):
+            with editor.batch():
+                pass
+    assert not editor.undo_stack
+
+
+def test_component_batch() -> None:
+    """Test a component batch is one undo step and one notification."""
+    component = EditorComponent()
+    component.set_content("one two three")
+    calls: List[None] = []
+    component.add_listener(lambda: calls.append(None))
+
+    with component.batch() as batch:
+        batch.replace(0, 3, "1")
+        batch.replace(8, 13, "3")
+        batch.insert(7, ",")
+    assert component.content == "1 two, 3"
+    assert component.get_line_column(len(component.content)) == (0, 8)
+    assert len(calls) == 1
+
+    component.undo()
+    assert component.content == "one two three"
+    component.redo()
+    assert component.content == "1 two, 3"
+    component.undo()
+    component.undo()
+    assert component.content == ""
+    assert len(calls) == 5
+
+
+def test_component_batch_rejects_direct_edits() -> None:
+    """Test cursor edits are rejected while a batch is open."""
+    component = EditorComponent()
+    with component.batch() as batch:
+        batch.insert(0, "text")
+        with pytest.raises(ValueError):
+            component.insert_at_cursor("x")
+    assert component.content == "text"
+    assert component.cursor_position == 4
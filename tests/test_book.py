@@ -1,7 +1,10 @@
 # pylint: disable=redefined-outer-name
 """Test module for book functionality."""
 
-from src.models.book import Book
+import random
+import sys
+
+from src.models.book import Book, TextCounts
 
 
 def test_book_creation() -> None:
@@ -123,3 +126,125 @@ def test_chapter_operations() -> None:
     # Delete chapter
     book.delete_chapter(0)
     assert len(book.chapters) == 0
+
+
+def test_models_use_slots() -> None:
+    """Test model objects have no instance dict and lazy metadata."""
+    book = Book("Test Book", "John Doe")
+    section = book.add_chapter("Chapter 1").add_section("Section 1")
+    for node in (book, book.chapters[0], section):
+        assert not hasattr(node, "__dict__")
+        assert node._metadata is None  # pylint: disable=protected-access
+    assert section.to_dict()["metadata"] == {}
+    assert section._metadata is None  # pylint: disable=protected-access
+    section.set_metadata("status", "draft")
+    assert section.to_dict()["metadata"] == {"status": "draft"}
+
+
+def test_titles_are_interned() -> None:
+    """Test equal titles share one string object."""
+    chapter = Book("Test Book", "John Doe").add_chapter("Chapter 1")
+    first = chapter.add_section("".join(["No", "tes"]))
+    second = chapter.add_section("".join(["Not", "es"]))
+    assert first.title is second.title
+    first.title = "".join(["Sum", "mary"])
+    assert first.title is sys.intern("Summary")
+
+
+def test_to_dict_output() -> None:
+    """Test serialization keeps its structure."""
+    book = Book("Test Book", "John Doe")
+    book.description = "About"
+    chapter = book.add_chapter("Chapter 1", "Text")
+    chapter.set_metadata("status", "draft")
+    chapter.add_section("Section 1", "More")
+    assert book.to_dict() == {
+        "title": "Test Book",
+        "author": "John Doe",
+        "description": "About",
+        "chapters": [
+            {
+                "title": "Chapter 1",
+                "content": "Text",
+                "sections": [{"title": "Section 1", "content": "More", "metadata": {}}],
+                "metadata": {"status": "draft"},
+            }
+        ],
+        "metadata": {},
+    }
+
+
+def test_dirty_flags() -> None:
+    """Test changes mark chapters and sections dirty."""
+    chapter = Book("Test Book", "John Doe").add_chapter("Chapter 1")
+    section = chapter.add_section("Section 1")
+    chapter.mark_clean()
+    assert not chapter.changed
+
+    section.update_content("Edited")
+    assert section.dirty and chapter.changed and not chapter.dirty
+    chapter.mark_clean()
+    chapter.title = "Renamed"
+    assert chapter.changed
+    chapter.mark_clean()
+    chapter.remove_section(section)
+    assert chapter.changed
+
+
+def test_chapter_ids() -> None:
+    """Test chapters are found and moved by id."""
+    book = Book("Test Book", "John Doe")
+    chapters = [book.add_chapter(f"Chapter {n}") for n in range(3)]
+    assert len({c.id for c in chapters}) == 3
+    assert book.get_chapter(chapters[2].id) is chapters[2]
+    book.move_chapter(2, 0)
+    assert [c.title for c in book.chapters] == ["Chapter 2", "Chapter 0", "Chapter 1"]
+    assert book.chapters.index(chapters[1]) == 2
+    section = chapters[0].add_section("Notes")
+    assert chapters[0].get_section(section.id) is section
+
+
+def test_counts_follow_edits() -> None:
+    """Test cached counts are updated by the difference each edit makes."""
+    book = Book("Test Book", "John Doe")
+    chapter = book.add_chapter("Chapter 1", "one two")
+    section = chapter.add_section("Notes", "three")
+    assert book.counts.words == 3
+    assert chapter.counts.words == 3
+
+    section.append_content(" four five")
+    assert book.counts == (5, 22)
+    section.clear_content()
+    assert book.counts.words == 2
+    book.update_chapter(0, "Renamed", "a b c d")
+    other = book.add_chapter("Chapter 2", "six")
+    assert book.get_statistics() == {"word_count": 5, "char_count": 10, "chapter_count": 2}
+    book.remove_chapter(other)
+    chapter.remove_section(section)
+    assert book.counts == chapter.counts == (4, 7)
+
+
+def test_counts_are_not_recomputed() -> None:
+    """Test book totals do not walk the chapters again after an edit."""
+    book = Book("Test Book", "John Doe")
+    chapters = [book.add_chapter(f"Chapter {n}", "word " * 10) for n in range(100)]
+    assert book.counts.words == 1000
+    book._counts = book.counts._replace(chars=-1)  # pylint: disable=protected-access
+    chapters[50].content += " more"
+    assert book.counts.words == 1001
+    assert book.counts.chars == 4
+
+
+def test_count_change_matches_recount() -> None:
+    """Test counting only the edited span gives the same change as a recount."""
+    rng = random.Random(5)
+    pieces = ["word", " ", "\n", "a", "b c", "  ", "tail "]
+    text = "one two three"
+    for _ in range(2000):
+        start = rng.randint(0, len(text))
+        end = rng.randint(start, min(len(text), start + 6))
+        inserted = "".join(rng.choices(pieces, k=rng.randint(0, 3)))
+        edited = text[:start] + inserted + text[end:]
+        expected = TextCounts.of(edited).minus(TextCounts.of(text))
+        assert TextCounts.change(text, edited) == expected
+        text = edited
@@ -0,0 +1,99 @@
+"""Tests for importing a directory of Markdown files."""
+
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from src.data.book_import import BookImporter, ImportProgress, decode, split_chapters
+
+
+def write(path: Path, text: str, encoding: str = "utf-8") -> None:
+    """Write a file, creating its directory."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(text.encode(encoding))
+
+
+def test_invalid_arguments() -> None:
+    """Test importer options are validated."""
+    with pytest.raises(ValueError):
+        BookImporter(max_workers=0)
+    with pytest.raises(ValueError):
+        BookImporter(chapter_level=2, section_level=2)
+    with pytest.raises(ValueError):
+        BookImporter(section_level=7)
+    with pytest.raises(ValueError):
+        BookImporter(encodings=())
+
+
+def test_split_chapters() -> None:
+    """Test headings split text into chapters and sections."""
+    text = (
+        "Preface text\n\n"
+        "# One\nIntro\n## Scene\nFirst\n### Detail\nKept\n"
+        "# Two #\n```\n# not a heading\n```\n"
+    )
+    assert split_chapters(text, "file") == [
+        ("file", "Preface text", []),
+        ("One", "Intro", [("Scene", "First\n### Detail\nKept")]),
+        ("Two", "```\n# not a heading\n```", []),
+    ]
+
+
+def test_sections_before_first_chapter() -> None:
+    """Test sections before any chapter heading go into the file's chapter."""
+    assert split_chapters("## A\ntext", "file") == [("file", "", [("A", "text")])]
+    assert split_chapters("", "file") == []
+
+
+def test_decode() -> None:
+    """Test decoding falls back and normalizes line endings."""
+    assert decode("﻿a\r\nb\rc".encode("utf-8")) == "a\nb\nc"
+    assert decode("café".encode("cp1252")) == "café"
+    with pytest.raises(ValueError):
+        decode(b"\xff", ("utf-8",))
+
+
+def test_import_order_and_structure(tmp_path: Path) -> None:
+    """Test files are imported in natural path order."""
+    root = tmp_path / "Series"
+    write(root / "part10" / "chapter1.md", "# Ten")
+    write(root / "part2" / "chapter10.md", "# Two-ten\n## Scene\nText")
+    write(root / "part2" / "chapter2.markdown", "Untitled text")
+    write(root / "notes.txt", "# Ignored")
+    write(root / ".hidden" / "chapter.md", "# Hidden")
+
+    result = BookImporter(max_workers=4).import_directory(root, author="Author")
+    book = result.book
+    assert book.title == "Series"
+    assert book.author == "Author"
+    assert [c.title for c in book.chapters] == ["chapter2", "Two-ten", "Ten"]
+    assert book.chapters[0].content == "Untitled text"
+    assert [(s.title, s.content) for s in book.chapters[1].sections] == [("Scene", "Text")]
+    assert result.progress.files_done == result.progress.files_total == 3
+
+
+def test_progress_reports(tmp_path: Path) -> None:
+    """Test progress is reported after every file."""
+    for number in range(20):
+        write(tmp_path / f"{number:02d}.md", f"# Chapter {number}\n" + "word " * number)
+    reports: List[ImportProgress] = []
+    result = BookImporter(max_workers=4, progress=reports.append).import_directory(
+        tmp_path, title="Book"
+    )
+    assert [r.files_done for r in reports] == list(range(1, 21))
+    assert all(r.files_total == 20 for r in reports)
+    assert result.progress.bytes_read == sum(p.stat().st_size for p in tmp_path.iterdir())
+    assert result.progress.files_per_second > 0
+    assert [c.title for c in result.book.chapters] == [f"Chapter {n}" for n in range(20)]
+    assert result.book.counts.words == sum(range(20))
+
+
+def test_import_errors(tmp_path: Path) -> None:
+    """Test missing directories and undecodable files are reported."""
+    importer = BookImporter(encodings=("utf-8",))
+    with pytest.raises(NotADirectoryError):
+        importer.import_directory(tmp_path / "missing")
+    write(tmp_path / "bad.md", "caf\xe9", "latin-1")
+    with pytest.raises(ValueError, match="bad.md"):
+        importer.import_directory(tmp_path)
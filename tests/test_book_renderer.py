@@ -0,0 +1,65 @@
+"""Tests for the book renderer module."""
+
+from pathlib import Path
+
+import pytest
+
+from src.book_editor.core.book_renderer import BookRenderer, chapter_to_markdown
+from src.book_editor.core.template import Template
+from src.models.book import Book
+
+
+@pytest.fixture
+def book() -> Book:
+    """Create a book with several chapters for testing."""
+    book = Book("Test Book", "John Doe")
+    for i in range(20):
+        chapter = book.add_chapter(f"Chapter {i}", f"Content of chapter {i}")
+        chapter.add_section(f"Section {i}", f"Section text {i}")
+    return book
+
+
+def test_chapter_to_markdown(book: Book):
+    """Test chapter conversion to Markdown."""
+    text = chapter_to_markdown(book.chapters[0])
+    assert text == "# Chapter 0\n\nContent of chapter 0\n\n## Section 0\n\nSection text 0"
+
+
+def test_renderer_validation():
+    """Test renderer argument validation."""
+    template = Template("Test", "general")
+    with pytest.raises(ValueError):
+        BookRenderer(template, max_workers=0)
+    with pytest.raises(ValueError):
+        BookRenderer(template, chunk_size=0)
+
+
+def test_render_serial_matches_template(book: Book):
+    """Test serial rendering matches rendering chapter by chapter."""
+    template = Template("Test", "general")
+    renderer = BookRenderer(template, max_workers=1)
+    expected = [template.render(chapter_to_markdown(c)) for c in book.chapters]
+    assert renderer.render(book) == expected
+
+
+def test_render_parallel_keeps_order(book: Book):
+    """Test parallel rendering returns chapters in order."""
+    template = Template("Test", "general")
+    serial = BookRenderer(template, max_workers=1).render(book)
+    parallel = BookRenderer(template, max_workers=2, chunk_size=3).render(book)
+    assert parallel == serial
+
+
+def test_render_empty_book():
+    """Test rendering a book without chapters."""
+    renderer = BookRenderer(Template("Test", "general"))
+    assert renderer.render(Book("Empty", "John Doe")) == []
+
+
+def test_render_to_file(book: Book, tmp_path: Path):
+    """Test streaming a rendered book to a file."""
+    renderer = BookRenderer(Template("Test", "general"), max_workers=2, chunk_size=4)
+    path = tmp_path / "out" / "book.html"
+    assert renderer.render_to_file(book, path) == len(book.chapters)
+    text = path.read_text(encoding="utf-8")
+    assert text.index("Chapter 0") < text.index("Chapter 19")
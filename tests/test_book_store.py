@@ -0,0 +1,161 @@
+"""Tests for chapter-granular book storage."""
+
+import json
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from src.book_editor.core.utils import write_json_atomic
+from src.data import book_store
+from src.data.book_store import BookStore
+from src.models.book import Book
+
+
+@pytest.fixture
+def store(tmp_path: Path) -> BookStore:
+    """Create a book store in a temporary directory."""
+    return BookStore(tmp_path / "book")
+
+
+def make_book() -> Book:
+    """Create a book with three chapters."""
+    book = Book("Serial", "Author")
+    book.description = "A serial"
+    book.set_metadata("genre", "Mystery")
+    for number in range(1, 4):
+        chapter = book.add_chapter(f"Chapter {number}", f"Text {number}")
+        chapter.add_section("Notes", f"Note {number}").set_metadata("draft", True)
+    return book
+
+
+def test_roundtrip(store: BookStore) -> None:
+    """Test a saved book opens with the same content."""
+    book = make_book()
+    assert not store.exists()
+    assert store.save(book) == 3
+    assert store.exists()
+    assert store.open().to_dict() == book.to_dict()
+
+
+def test_chapters_load_lazily(store: BookStore) -> None:
+    """Test opening reads chapter files only when they are used."""
+    store.save(make_book())
+    opened = store.open()
+    assert [c.title for c in opened.chapters] == ["Chapter 1", "Chapter 2", "Chapter 3"]
+    assert not any(c.loaded for c in opened.chapters)
+    assert opened.chapters[1].content == "Text 2"
+    assert [c.loaded for c in opened.chapters] == [False, True, False]
+    assert not opened.chapters[1].changed
+
+
+def test_save_writes_only_changed_chapters(store: BookStore) -> None:
+    """Test only dirty chapters are rewritten."""
+    book = make_book()
+    store.save(book)
+    assert store.save(book) == 0
+
+    book.chapters[1].content = "Edited"
+    assert store.save(book) == 1
+    book.chapters[2].sections[0].append_content(" more")
+    assert store.save(book) == 1
+
+    opened = BookStore(store.root_dir).open()
+    assert opened.chapters[1].content == "Edited"
+    assert opened.chapters[2].sections[0].content == "Note 3 more"
+    assert store.save(opened) == 0
+
+
+def test_manifest_tracks_order_and_removal(store: BookStore) -> None:
+    """Test reordering and removing chapters only rewrites the manifest."""
+    book = make_book()
+    store.save(book)
+    removed = book.chapters[0]
+    book.remove_chapter(removed)
+    book.chapters.reverse()
+    assert store.save(book) == 0
+
+    assert not list(store.chapter_dir.glob(f"{removed.id}.*"))
+    assert len(list(store.chapter_dir.glob("*.json"))) == 2
+    manifest = json.loads(store.manifest_path.read_text(encoding="utf-8"))
+    assert [c["title"] for c in manifest["chapters"]] == ["Chapter 3", "Chapter 2"]
+    assert store.open().to_dict() == book.to_dict()
+
+
+def test_changed_chapters_get_new_files(store: BookStore) -> None:
+    """Test a changed chapter is written beside its old file, which is then removed."""
+    book = make_book()
+    store.save(book)
+    chapter = book.chapters[0]
+    book.chapters[0].content = "Edited"
+    store.save(book)
+    assert [p.name for p in store.chapter_dir.glob(f"{chapter.id}.*")] == [
+        f"{chapter.id}.2.json"
+    ]
+    assert len(list(store.chapter_dir.glob("*.json"))) == 3
+
+
+def test_fresh_store_replaces_stored_files(store: BookStore) -> None:
+    """Test saving through a new store removes files the old manifest named."""
+    book = make_book()
+    store.save(book)
+    book.chapters[0].content = "Edited"
+    assert BookStore(store.root_dir).save(book) == 1
+    assert len(list(store.chapter_dir.glob("*.json"))) == 3
+    assert store.open().chapters[0].content == "Edited"
+
+    other = Book("Other", "Author")
+    other.add_chapter("Only", "Text")
+    BookStore(store.root_dir).save(other)
+    assert len(list(store.chapter_dir.glob("*.json"))) == 1
+    assert store.open().to_dict() == other.to_dict()
+
+
+def test_failed_save_keeps_stored_book(
+    store: BookStore, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test a save that fails before the manifest is replaced changes nothing."""
+    book = make_book()
+    store.save(book)
+    saved = store.open().to_dict()
+
+    def fail(path: Path, data: Any) -> None:
+        if path == store.manifest_path:
+            raise OSError("disk full")
+        write_json_atomic(path, data)
+
+    monkeypatch.setattr(book_store, "write_json_atomic", fail)
+    book.chapters[0].content = "Edited"
+    with pytest.raises(OSError):
+        store.save(book)
+    assert book.chapters[0].changed
+    assert BookStore(store.root_dir).open().to_dict() == saved
+
+    monkeypatch.undo()
+    assert store.save(book) == 1
+    assert BookStore(store.root_dir).open().chapters[0].content == "Edited"
+    assert len(list(store.chapter_dir.glob("*.json"))) == 3
+
+
+def test_invalid_manifest(store: BookStore) -> None:
+    """Test invalid manifests are rejected."""
+    with pytest.raises(FileNotFoundError):
+        store.open()
+    store.root_dir.mkdir(parents=True)
+    store.manifest_path.write_text("{", encoding="utf-8")
+    with pytest.raises(ValueError):
+        store.open()
+    store.manifest_path.write_text('{"format": 99}', encoding="utf-8")
+    with pytest.raises(ValueError):
+        store.open()
+
+
+def test_counts_without_loading(store: BookStore) -> None:
+    """Test book counts of an opened book do not load its chapters."""
+    book = make_book()
+    store.save(book)
+    opened = store.open()
+    assert opened.counts == book.counts
+    assert not any(c.loaded for c in opened.chapters)
+    opened.chapters[0].sections[0].append_content(" extra words")
+    assert opened.counts.words == book.counts.words + 2
@@ -0,0 +1,183 @@
+"""Tests for the undo history."""
+
+import random
+from typing import List
+
+import pytest
+
+from src.components.editor import Editor
+from src.components.undo import RECORD_OVERHEAD, UndoHistory
+from src.models.book import Book
+
+
+class FakeClock:
+    """Manually advanced time source."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    """Create a fake clock."""
+    return FakeClock()
+
+
+@pytest.fixture
+def editor(clock: FakeClock) -> Editor:
+    """Create an editor with a two chapter book."""
+    book = Book("Title", "Author")
+    book.add_chapter("One", "First chapter")
+    book.add_chapter("Two", "Second chapter")
+    editor = Editor(UndoHistory(clock=clock))
+    editor.load_book(book)
+    return editor
+
+
+def type_text(editor: Editor, text: str) -> None:
+    """Append text to the current chapter one character at a time."""
+    for char in text:
+        content = editor.current_book.chapters[editor.current_chapter_index].content
+        editor.update_content(content + char)
+
+
+def test_invalid_arguments() -> None:
+    """Test max_chars and coalesce_window are validated."""
+    with pytest.raises(ValueError):
+        UndoHistory(max_chars=0)
+    with pytest.raises(ValueError):
+        UndoHistory(coalesce_window=-1)
+
+
+def test_typing_is_one_step(editor: Editor) -> None:
+    """Test quick adjacent keystrokes are merged into one undo step."""
+    type_text(editor, " extended")
+    assert len(editor.undo_stack) == 1
+    editor.undo()
+    assert editor.current_book.chapters[0].content == "First chapter"
+    editor.redo()
+    assert editor.current_book.chapters[0].content == "First chapter extended"
+
+
+def test_pause_starts_new_step(editor: Editor, clock: FakeClock) -> None:
+    """Test edits further apart than the window are separate steps."""
+    type_text(editor, " one")
+    clock.now += 5
+    type_text(editor, " two")
+    assert len(editor.undo_stack) == 2
+    editor.undo()
+    assert editor.current_book.chapters[0].content == "First chapter one"
+
+
+def test_distant_edits_are_separate(editor: Editor) -> None:
+    """Test edits that do not touch are not merged."""
+    editor.update_content("First chapter!")
+    editor.update_content("The First chapter!")
+    assert len(editor.undo_stack) == 2
+
+
+def test_backspace_merges(editor: Editor) -> None:
+    """Test deleting what was just typed merges into the same step."""
+    type_text(editor, " typo")
+    for _ in range(3):
+        content = editor.current_book.chapters[0].content
+        editor.update_content(content[:-1])
+    assert len(editor.undo_stack) == 1
+    editor.undo()
+    assert editor.current_book.chapters[0].content == "First chapter"
+
+
+def test_seal_ends_step(editor: Editor) -> None:
+    """Test sealing the history starts a new step."""
+    type_text(editor, " a")
+    editor.history.seal()
+    type_text(editor, " b")
+    assert len(editor.undo_stack) == 2
+
+
+def test_undo_across_chapters(editor: Editor) -> None:
+    """Test undo and redo restore the chapter each edit was made in."""
+    editor.update_content("Changed one")
+    editor.next_chapter()
+    editor.update_content("Changed two")
+    editor.undo()
+    editor.undo()
+    assert [c.content for c in editor.current_book.chapters] == [
+        "First chapter",
+        "Second chapter",
+    ]
+    editor.redo()
+    editor.redo()
+    assert [c.content for c in editor.current_book.chapters] == [
+        "Changed one",
+        "Changed two",
+    ]
+
+
+def test_new_edit_clears_redo(editor: Editor) -> None:
+    """Test a new edit after undo discards the redo steps."""
+    editor.update_content("Changed")
+    editor.undo()
+    editor.update_content("Other")
+    assert not editor.redo_stack
+    editor.redo()
+    assert editor.current_book.chapters[0].content == "Other"
+
+
+def test_memory_follows_edit_size(editor: Editor) -> None:
+    """Test stored text grows with the edits, not with the chapter."""
+    editor.update_content("x" * 100_000)
+    base = editor.history.size
+    editor.history.seal()
+    type_text(editor, "abc")
+    assert editor.history.size - base == 3 + RECORD_OVERHEAD
+
+
+def test_oldest_steps_evicted(clock: FakeClock) -> None:
+    """Test the memory cap drops the oldest steps first."""
+    history = UndoHistory(max_chars=RECORD_OVERHEAD * 3 + 30, clock=clock)
+    text = ""
+    for number in range(10):
+        new = text + f"{number:09d}\n"
+        history.record(0, text, new)
+        history.seal()
+        text = new
+    assert history.size <= history.max_chars
+    assert len(history.undo_stack) == 3
+    assert history.undo_stack[0].new == "000000007\n"
+
+
+def test_random_edits_roundtrip(clock: FakeClock) -> None:
+    """Test undoing and redoing random coalesced edits restores every text."""
+    rng = random.Random(7)
+    history = UndoHistory(clock=clock)
+    texts: List[str] = ["hello world"]
+    for _ in range(300):
+        text = texts[-1]
+        start = rng.randint(0, len(text))
+        end = min(len(text), start + rng.randint(0, 3))
+        new = text[:start] + rng.choice(["", "a", "bc", " "]) + text[end:]
+        clock.now += rng.choice([0.1, 0.1, 2.0])
+        history.record(0, text, new)
+        texts.append(new)
+    text = texts[-1]
+    while history.undo_stack:
+        text = history.pop_undo().undo(text)
+    assert text == texts[0]
+    while history.redo_stack:
+        text = history.pop_redo().redo(text)
+    assert text == texts[-1]
+
+
+def test_undo_follows_moved_chapter(editor: Editor) -> None:
+    """Test undo finds the edited chapter after chapters are reordered."""
+    editor.update_content("Changed one")
+    editor.move_chapter(0, 1)
+    editor.undo()
+    assert [c.content for c in editor.current_book.chapters] == [
+        "Second chapter",
+        "First chapter",
+    ]
@@ -0,0 +1,171 @@
+"""Tests for book-wide find and replace."""
+
+import re
+
+import pytest
+
+from src.components.editor import Editor
+from src.components import find_replace
+from src.components.find_replace import FindReplace
+from src.components.undo import ReplaceRecord, UndoHistory
+from src.models.book import Book
+
+
+@pytest.fixture
+def book() -> Book:
+    """Create a book that mentions a character in several places."""
+    book = Book("Saga", "Author")
+    book.add_chapter("One", "Anna met Bob. Anna left.")
+    book.add_chapter("Two", "Nobody came.").add_section("Later", "anna and Annabel")
+    book.add_chapter("Three", "Bob waited for Anna.")
+    return book
+
+
+def contents(book: Book) -> list:
+    """Get the chapter and section texts of a book in reading order."""
+    texts = []
+    for chapter in book.chapters:
+        texts.append(chapter.content)
+        texts.extend(section.content for section in chapter.sections)
+    return texts
+
+
+def test_invalid_arguments() -> None:
+    """Test patterns and pool options are validated."""
+    with pytest.raises(ValueError):
+        FindReplace("")
+    with pytest.raises(ValueError):
+        FindReplace("(", regex=True)
+    with pytest.raises(ValueError):
+        FindReplace("a", max_workers=0)
+    with pytest.raises(ValueError):
+        FindReplace("a", chunk_size=0)
+    with pytest.raises(ValueError):
+        FindReplace("a", parallel_chars=0)
+
+
+def test_find_locations(book: Book) -> None:
+    """Test matches report where they are without changing the book."""
+    before = book.to_dict()
+    matches = FindReplace("Anna").find(book)
+    assert [(m.chapter_id, m.section_id, m.start, m.end) for m in matches] == [
+        (book.chapters[0].id, None, 0, 4),
+        (book.chapters[0].id, None, 14, 18),
+        (book.chapters[1].id, book.chapters[1].sections[0].id, 9, 13),
+        (book.chapters[2].id, None, 15, 19),
+    ]
+    assert all(m.replacement is None for m in matches)
+    assert book.to_dict() == before
+
+
+def test_search_options(book: Book) -> None:
+    """Test case and whole word options."""
+    assert len(FindReplace("anna", case_sensitive=False).find(book)) == 5
+    assert len(FindReplace("anna", case_sensitive=False, whole_word=True).find(book)) == 4
+    assert len(FindReplace("a.b", regex=False).find(book)) == 0
+
+
+def test_preview_does_not_modify(book: Book) -> None:
+    """Test a preview lists replacements and leaves the book alone."""
+    history = UndoHistory()
+    before = book.to_dict()
+    matches = FindReplace("Bob").replace(book, "Rob", history, preview=True)
+    assert [m.replacement for m in matches] == ["Rob", "Rob"]
+    assert book.to_dict() == before
+    assert not history.undo_stack
+
+
+def test_replace_is_one_undo_step(book: Book) -> None:
+    """Test a replace across chapters is undone and redone at once."""
+    editor = Editor()
+    editor.load_book(book)
+    original = contents(book)
+
+    matches = editor.replace_all(FindReplace("Anna", whole_word=True), "Eva")
+    assert len(matches) == 3
+    replaced = contents(book)
+    assert replaced == [
+        "Eva met Bob. Eva left.",
+        "Nobody came.",
+        "anna and Annabel",
+        "Bob waited for Eva.",
+    ]
+    assert len(editor.undo_stack) == 1
+
+    editor.undo()
+    assert contents(book) == original
+    editor.redo()
+    assert contents(book) == replaced
+
+
+def test_replace_in_sections_undoes(book: Book) -> None:
+    """Test section edits are undone in the right section."""
+    editor = Editor()
+    editor.load_book(book)
+    editor.replace_all(FindReplace("anna", case_sensitive=False), "X")
+    assert book.chapters[1].sections[0].content == "X and Xbel"
+    editor.undo()
+    assert book.chapters[1].sections[0].content == "anna and Annabel"
+
+
+def test_regex_groups(book: Book) -> None:
+    """Test regular expression replacements expand groups."""
+    finder = FindReplace(r"(\w+) met (\w+)", regex=True)
+    finder.replace(book, r"\2 met \1")
+    assert book.chapters[0].content == "Bob met Anna. Anna left."
+    with pytest.raises(ValueError):
+        finder.replace(book, r"\3")
+
+
+def test_literal_replacement_is_not_expanded(book: Book) -> None:
+    """Test plain replacements are inserted as they are."""
+    FindReplace("Bob").replace(book, r"\1 & \g<0>")
+    assert book.chapters[0].content == r"Anna met \1 & \g<0>. Anna left."
+
+
+def test_matches_re_sub() -> None:
+    """Test replacing gives the same text as re.sub, empty matches included."""
+    book = Book("Title", "Author")
+    text = "aaxbxxa ba"
+    book.add_chapter("One", text)
+    for pattern in ["x*", "a|", r"\b", "b?a"]:
+        chapter = book.chapters[0]
+        chapter.content = text
+        FindReplace(pattern, regex=True).replace(book, "-")
+        assert chapter.content == re.sub(pattern, "-", text)
+
+
+def test_counts_follow_replace(book: Book) -> None:
+    """Test cached word counts are updated by a replace."""
+    words = book.counts.words
+    FindReplace("Anna").replace(book, "Anna Maria")
+    assert book.counts.words == words + 4
+
+
+def test_record_roundtrip() -> None:
+    """Test a replace record rebuilds both texts."""
+    record = ReplaceRecord(0, [(0, "ab", ""), (3, "", "xyz"), (5, "f", "F")], 0.0)
+    assert record.redo("abcdef") == "cxyzdeF"
+    assert record.undo("cxyzdeF") == "abcdef"
+
+
+def test_parallel_scan_matches_serial(book: Book) -> None:
+    """Test scanning in a process pool finds the same matches."""
+    for number in range(20):
+        book.add_chapter(f"Extra {number}", f"Anna number {number}")
+    serial = FindReplace("Anna", max_workers=1).find(book)
+    finder = FindReplace("Anna", max_workers=2, chunk_size=2, parallel_chars=1)
+    assert finder.find(book) == serial
+    assert len(serial) == 24
+    pool = find_replace._pools[2]
+    assert finder.replace(book, "Eva", preview=True)[0].replacement == "Eva"
+    assert FindReplace("Bob", max_workers=2, parallel_chars=1).find(book)
+    assert find_replace._pools[2] is pool
+
+
+def test_small_books_are_scanned_in_process(book: Book) -> None:
+    """Test no worker pool is started for books with little text."""
+    for number in range(20):
+        book.add_chapter(f"Extra {number}", f"Anna number {number}")
+    assert len(FindReplace("Anna", max_workers=3, chunk_size=2).find(book)) == 24
+    assert 3 not in find_replace._pools
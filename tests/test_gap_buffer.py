@@ -0,0 +1,75 @@
+"""Tests for the gap buffer."""
+
+import random
+
+from src.components.gap_buffer import MIN_GAP, GapBuffer
+
+
+def test_insert_and_delete() -> None:
+    """Test basic edits at different positions."""
+    buffer = GapBuffer("hello world")
+    buffer.insert(5, ",")
+    buffer.insert(len(buffer), "!")
+    assert buffer.text == "hello, world!"
+    assert buffer.delete(0, 7) == "hello, "
+    assert buffer.replace(0, 5, "there") == "world"
+    assert buffer.text == "there!"
+    assert len(buffer) == 6
+
+
+def test_offsets_are_clamped() -> None:
+    """Test offsets outside the text are limited to it."""
+    buffer = GapBuffer("abc")
+    buffer.insert(100, "d")
+    buffer.insert(-5, "_")
+    assert buffer.text == "_abcd"
+    assert buffer.delete(3, 1) == ""
+    assert buffer.slice(-1, 100) == "_abcd"
+
+
+def test_slice_across_gap() -> None:
+    """Test slices before, after and across the gap."""
+    buffer = GapBuffer("abcdefgh")
+    buffer.insert(4, "XY")
+    assert buffer.gap_position == 6
+    assert buffer.slice(0, 3) == "abc"
+    assert buffer.slice(3, 8) == "dXYef"
+    assert buffer.slice(6, 10) == "efgh"
+
+
+def test_grows_for_large_inserts() -> None:
+    """Test inserting more than the gap holds."""
+    buffer = GapBuffer()
+    text = "x" * (MIN_GAP * 5)
+    buffer.insert(0, text)
+    buffer.insert(10, "y")
+    assert buffer.text == text[:10] + "y" + text[10:]
+
+
+def test_random_edits_match_string() -> None:
+    """Test random edits give the same result as string operations."""
+    rng = random.Random(3)
+    buffer = GapBuffer("The quick brown fox")
+    expected = buffer.text
+    for _ in range(2000):
+        start = rng.randint(0, len(expected))
+        end = rng.randint(start, min(len(expected), start + 5))
+        text = rng.choice(["", "a", "xyz", "\n", "long insertion " * 3])
+        assert buffer.replace(start, end, text) == expected[start:end]
+        expected = expected[:start] + text + expected[end:]
+        if rng.random() < 0.1:
+            assert buffer.text == expected
+        low = rng.randint(0, len(expected))
+        high = rng.randint(low, len(expected))
+        assert buffer.slice(low, high) == expected[low:high]
+    assert buffer.text == expected
+    assert len(buffer) == len(expected)
+
+
+def test_wide_characters() -> None:
+    """Test characters outside ASCII keep their offsets."""
+    buffer = GapBuffer("章節 one 😀")
+    buffer.insert(2, "二")
+    assert buffer.text == "章節二 one 😀"
+    assert buffer.delete(len(buffer) - 1, len(buffer)) == "😀"
+    assert buffer.slice(0, 3) == "章節二"
@@ -0,0 +1,39 @@
+"""Tests for the line index."""
+
+import random
+
+import pytest
+
+from src.components.line_index import LineIndex
+
+
+def test_positions() -> None:
+    """Test mapping offsets to lines and columns."""
+    index = LineIndex("ab\n\ncd")
+    assert index.line_count == 3
+    assert [index.position(o) for o in range(7)] == [
+        (0, 0), (0, 1), (0, 2), (1, 0), (2, 0), (2, 1), (2, 2)
+    ]
+    assert index.offset(2, 1) == 5
+    assert index.line_end(0) == 2
+    with pytest.raises(IndexError):
+        index.line_start(3)
+
+
+def test_random_edits_match_rescan() -> None:
+    """Test the index after random edits matches a fresh index."""
+    rng = random.Random(5)
+    text = "one\ntwo\n\nthree"
+    index = LineIndex(text)
+    for _ in range(1000):
+        start = rng.randint(0, len(text))
+        end = rng.randint(start, min(len(text), start + 6))
+        new = rng.choice(["", "\n", "a", "x\ny", "\n\n", "word"])
+        index.replace(start, end, new)
+        text = text[:start] + new + text[end:]
+        fresh = LineIndex(text)
+        assert index.line_count == fresh.line_count
+        offset = rng.randint(0, len(text))
+        assert index.position(offset) == fresh.position(offset)
+        line = rng.randrange(fresh.line_count)
+        assert index.line_start(line) == fresh.line_start(line)
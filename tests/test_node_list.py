@@ -0,0 +1,96 @@
+"""Tests for the node list."""
+
+import pickle
+import random
+import time
+from typing import List
+
+import pytest
+
+from src.models.book import Section
+from src.models.node_list import NodeList
+
+
+def make_sections(count: int) -> List[Section]:
+    """Create sections titled by number."""
+    return [Section(str(number)) for number in range(count)]
+
+
+def test_list_operations() -> None:
+    """Test the list interface."""
+    first, second, third = make_sections(3)
+    nodes = NodeList([first, second])
+    nodes.insert(1, third)
+    assert nodes == [first, third, second]
+    assert nodes[-1] is second
+    assert nodes[1:] == [third, second]
+    assert nodes.index(second) == 2
+    assert third in nodes and Section("x") not in nodes
+    nodes.remove(third)
+    assert nodes.pop(0) is first
+    assert list(nodes) == [second]
+    with pytest.raises(ValueError):
+        nodes.remove(first)
+    with pytest.raises(IndexError):
+        nodes.pop(5)
+
+
+def test_lookup_by_id() -> None:
+    """Test items are found by id and ids are unique."""
+    sections = make_sections(3)
+    nodes = NodeList(sections)
+    assert nodes.get(sections[1].id) is sections[1]
+    assert nodes.get("missing") is None
+    with pytest.raises(ValueError):
+        nodes.append(sections[0])
+    nodes[0] = replacement = Section("replacement")
+    assert nodes.get(sections[0].id) is None
+    assert nodes.get(replacement.id) is replacement
+
+
+def test_pickle() -> None:
+    """Test a node list pickles as its items."""
+    nodes = NodeList(make_sections(5))
+    copy = pickle.loads(pickle.dumps(nodes))
+    assert [s.title for s in copy] == ["0", "1", "2", "3", "4"]
+
+
+def test_random_operations_match_list() -> None:
+    """Test random edits give the same order as a list."""
+    rng = random.Random(11)
+    spare = make_sections(400)
+    nodes = NodeList(spare[:100])
+    expected = list(spare[:100])
+    del spare[:100]
+    for _ in range(3000):
+        op = rng.random()
+        if op < 0.3 and spare:
+            index = rng.randint(-len(expected) - 1, len(expected) + 1)
+            item = spare.pop()
+            nodes.insert(index, item)
+            expected.insert(index, item)
+        elif op < 0.5 and expected:
+            index = rng.randrange(-len(expected), len(expected))
+            spare.append(nodes.pop(index))
+            assert spare[-1] is expected.pop(index)
+        elif op < 0.8 and expected:
+            source, target = rng.randrange(len(expected)), rng.randrange(len(expected))
+            nodes.move(source, target)
+            expected.insert(target, expected.pop(source))
+        elif expected:
+            item = rng.choice(expected)
+            assert nodes.index(item) == expected.index(item)
+        assert len(nodes) == len(expected)
+    assert nodes == expected
+
+
+def test_reorganize_large_serial() -> None:
+    """Test moving chapters around a long serial is fast."""
+    nodes = NodeList(make_sections(2000))
+    rng = random.Random(1)
+    start = time.perf_counter()
+    for _ in range(2000):
+        nodes.move(rng.randrange(2000), rng.randrange(2000))
+        nodes.index(nodes[rng.randrange(2000)])
+    assert time.perf_counter() - start < 2.0
+    assert len(nodes) == 2000
@@ -0,0 +1,120 @@
+"""Tests for the heading outline index."""
+
+import random
+
+import pytest
+
+from src.book_editor.core.document import Document
+from src.book_editor.core.outline import Heading, Outline
+
+TEXT = """Intro text
+
+# Part One
+
+## Chapter 1 ##
+Text with # not a heading
+#hashtag
+
+```
+# code, not a heading
+```
+
+## Chapter 2
+
+# Part Two
+"""
+
+
+def test_headings() -> None:
+    """Test headings are found with offsets and levels outside code blocks."""
+    outline = Outline(TEXT)
+    assert [(h.level, h.title) for h in outline.headings] == [
+        (1, "Part One"),
+        (2, "Chapter 1"),
+        (2, "Chapter 2"),
+        (1, "Part Two"),
+    ]
+    for heading in outline.headings:
+        assert TEXT[heading.offset:].lstrip().startswith("#")
+
+
+def test_navigation() -> None:
+    """Test lookups by offset."""
+    outline = Outline(TEXT)
+    chapter_1 = outline[1]
+    assert outline.heading_at(0) is None
+    assert outline.heading_at(chapter_1.offset + 5) == chapter_1
+    assert outline.index_at(chapter_1.offset) == 1
+    assert outline.next_heading(chapter_1.offset) == outline[2]
+    assert outline.previous_heading(chapter_1.offset) == outline[0]
+    assert outline.next_heading(len(TEXT)) is None
+    assert outline.previous_heading(0) is None
+
+
+def test_section_range() -> None:
+    """Test sections include their subsections."""
+    outline = Outline(TEXT)
+    assert outline.section_range(0) == (outline[0].offset, outline[3].offset)
+    assert outline.section_range(1) == (outline[1].offset, outline[2].offset)
+    assert outline.section_range(3) == (outline[3].offset, len(TEXT))
+
+
+def test_split() -> None:
+    """Test splitting into chapters at a heading level."""
+    parts = Outline(TEXT).split(1)
+    assert [title for title, _ in parts] == ["", "Part One", "Part Two"]
+    assert parts[1][1].startswith("# Part One")
+    assert [title for title, _ in Outline(TEXT).split(2)][2:] == ["Chapter 1", "Chapter 2", "Part Two"]
+    with pytest.raises(ValueError):
+        Outline(TEXT).split(7)
+
+
+def test_update_scans_only_edited_lines() -> None:
+    """Test an edit only rescans the lines it touches."""
+    text = "\n\n".join(f"# Heading {i}\n\nBody {i}" for i in range(1000))
+    outline = Outline(text)
+    edited = text.replace("Body 500", "Body 500\n\n## Inserted")
+    outline.update(edited)
+    assert outline.scanned < 100
+    assert len(outline) == 1001
+    assert outline.headings == Outline(edited).headings
+
+
+def test_update_leaves_later_offsets_alone() -> None:
+    """Test offsets after an edit follow the end of the text unchanged."""
+    text = "\n\n".join(f"# Heading {i}\n\nBody {i}" for i in range(1000))
+    outline = Outline(text)
+    for number in range(500, 510):
+        text = text.replace(f"Body {number}", f"Body {number} edited")
+        outline.update(text)
+    stored = list(outline._offsets._values[600:])
+    text = text.replace("Body 510", "Body 510 edited")
+    outline.update(text)
+    assert outline._offsets._values[600:] == stored
+    assert outline[-1] == Outline(text)[-1]
+    assert outline.headings == Outline(text).headings
+
+
+def test_update_matches_full_scan() -> None:
+    """Test random edits keep the index identical to a fresh scan."""
+    rng = random.Random(7)
+    pieces = ["# A\n", "## B\n", "text\n", "\n", "```\n", "#no\n", "x", "#", " "]
+    text = "".join(rng.choice(pieces) for _ in range(80))
+    outline = Outline(text)
+    for _ in range(500):
+        start = rng.randrange(len(text) + 1)
+        end = min(len(text), start + rng.randrange(8))
+        text = text[:start] + "".join(rng.choice(pieces) for _ in range(rng.randrange(3))) + text[end:]
+        outline.update(text)
+        assert outline.headings == Outline(text).headings
+
+
+def test_document_outline() -> None:
+    """Test documents keep their outline in sync with the content."""
+    doc = Document("Test Document", "Test Author", "# One\n\nText")
+    assert doc.get_outline() == [Heading(0, 1, "One")]
+    doc.set_content("# One\n\nText\n\n# Two")
+    assert [h.title for h in doc.get_outline()] == ["One", "Two"]
+    doc.undo()
+    assert [h.title for h in doc.get_outline()] == ["One"]
+    assert doc.split_chapters() == [("One", "# One\n\nText")]
@@ -0,0 +1,171 @@
+"""Tests for the revision store."""
+
+import threading
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+from src.book_editor.core.document import Document
+from src.book_editor.core.editor import Editor
+from src.book_editor.core.revision_store import RevisionStore
+
+
+@pytest.fixture
+def store(tmp_path: Path) -> RevisionStore:
+    """Create a revision store with frequent snapshots."""
+    return RevisionStore(tmp_path / "doc.jsonl", snapshot_interval=4)
+
+
+def test_invalid_snapshot_interval(tmp_path: Path) -> None:
+    """Test snapshot_interval must be positive."""
+    with pytest.raises(ValueError):
+        RevisionStore(tmp_path / "doc.jsonl", snapshot_interval=0)
+
+
+def test_append_and_replay(store: RevisionStore) -> None:
+    """Test every revision can be rebuilt from the nearest snapshot."""
+    contents = [f"Chapter 1\n\n{'word ' * i}end" for i in range(10)]
+    for version, content in enumerate(contents, 1):
+        assert store.append(content, version, "Author") == version - 1
+    assert len(store) == 10
+    reopened = RevisionStore(store.path, snapshot_interval=4)
+    for revision, content in enumerate(contents):
+        assert reopened.content(revision) == content
+    assert reopened.content(-1) == contents[-1]
+
+
+def test_metadata_and_pages(store: RevisionStore) -> None:
+    """Test revision metadata and pagination."""
+    timestamp = datetime(2024, 1, 1, 12, 0)
+    for version in range(1, 6):
+        store.append(f"v{version}", version, "Author", timestamp)
+    assert store.get(0) == {
+        "revision": 0,
+        "version": 1,
+        "timestamp": timestamp.isoformat(),
+        "author": "Author",
+    }
+    assert [r["version"] for r in store.page(0, 2)] == [5, 4]
+    assert [r["version"] for r in store.page(4, 2)] == [1]
+    assert [r["version"] for r in store.page(1, 2, newest_first=False)] == [2, 3]
+    with pytest.raises(IndexError):
+        store.get(5)
+    with pytest.raises(ValueError):
+        store.page(-1)
+
+
+def test_deltas_are_compact(store: RevisionStore) -> None:
+    """Test records between snapshots do not repeat the content."""
+    base = "x" * 10000
+    store.append(base, 1)
+    size = store.path.stat().st_size
+    store.append(base + "!", 2)
+    assert store.path.stat().st_size - size < 200
+
+
+def test_interrupted_append_is_dropped(store: RevisionStore) -> None:
+    """Test a record written without its index entry is discarded."""
+    store.append("one", 1)
+    store.append("two", 2)
+    with store.path.open("ab") as log:
+        log.write(b'{"version": 3, "partial')
+    reopened = RevisionStore(store.path, snapshot_interval=4)
+    assert len(reopened) == 2
+    assert reopened.append("three", 3) == 2
+    assert RevisionStore(store.path, snapshot_interval=4).content(2) == "three"
+
+
+def test_missing_index_is_rebuilt(store: RevisionStore) -> None:
+    """Test the index is rebuilt from the log."""
+    store.append("one", 1)
+    store.append("two", 2)
+    store.index_path.unlink()
+    reopened = RevisionStore(store.path, snapshot_interval=4)
+    assert len(reopened) == 2
+    assert reopened.content(1) == "two"
+
+
+def test_concurrent_appends(store: RevisionStore) -> None:
+    """Test appends from several threads each get their own revision."""
+    def append_many(worker: int) -> None:
+        for i in range(25):
+            store.append(f"worker {worker} edit {i}", i)
+
+    threads = [threading.Thread(target=append_many, args=(n,)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(store) == 100
+    reopened = RevisionStore(store.path, snapshot_interval=4)
+    assert [reopened.content(i) for i in range(100)] == [
+        store.content(i) for i in range(100)
+    ]
+    assert sorted(reopened.content(i) for i in range(100)) == sorted(
+        f"worker {n} edit {i}" for n in range(4) for i in range(25)
+    )
+
+
+def test_stores_sharing_a_log(store: RevisionStore) -> None:
+    """Test a store picks up revisions appended through another store."""
+    other = RevisionStore(store.path, snapshot_interval=4)
+    store.append("one", 1)
+    assert other.append("two", 2) == 1
+    assert store.append("three", 3) == 2
+    assert store.content(1) == "two"
+    assert RevisionStore(store.path).content(2) == "three"
+
+
+def test_page_opens_files_once(
+    store: RevisionStore, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test reading a page does not reopen the log for every revision."""
+    for version in range(1, 11):
+        store.append(f"v{version}", version)
+    opened = []
+    original = Path.open
+
+    def counting_open(path: Path, *args, **kwargs):
+        opened.append(path.name)
+        return original(path, *args, **kwargs)
+
+    monkeypatch.setattr(Path, "open", counting_open)
+    assert [r["version"] for r in store.page(0, 10)] == list(range(10, 0, -1))
+    assert sorted(opened) == ["doc.jsonl", "doc.jsonl.idx"]
+
+
+def test_document_revision_history(tmp_path: Path) -> None:
+    """Test documents record revisions when attached to a store."""
+    doc = Document("Test Document", "Test Author", "First")
+    assert doc.get_revision_history() == []
+    assert doc.record_revision() is None
+    with pytest.raises(ValueError):
+        doc.get_revision(0)
+
+    doc.attach_revisions(RevisionStore(tmp_path / "doc.jsonl"))
+    assert doc.record_revision() == 0
+    assert doc.record_revision() is None
+    doc.set_content("Second")
+    assert doc.record_revision(author="Editor") == 1
+
+    history = doc.get_revision_history()
+    assert [r["version"] for r in history] == [2, 1]
+    assert history[0]["author"] == "Editor"
+    assert doc.get_revision_history(1, 1)[0]["author"] == "Test Author"
+    assert doc.revision_count() == 2
+    assert doc.get_revision(0) == "First"
+
+
+def test_editor_records_revisions_on_save(tmp_path: Path) -> None:
+    """Test saving through the editor records a revision."""
+    editor = Editor(tmp_path / "docs", tmp_path / "templates")
+    doc = editor.create_document("My Book", "Author", "Draft")
+    editor.save_document()
+    doc.update_content("Final")
+    editor.save_document()
+
+    reopened = editor.open_document("my-book")
+    assert reopened.revision_count() == 2
+    assert reopened.get_revision(0) == "Draft"
@@ -0,0 +1,68 @@
+# pylint: disable=redefined-outer-name
+"""Cold-start budget tests for the application entry points."""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Seconds a cold import of the main entry point may take
+STARTUP_BUDGET = 3.0
+
+# Modules that must not be loaded before their feature is first used
+DEFERRED_MODULES = [
+    "markdown",
+    "book_editor.core.editor",
+    "book_editor.core.template",
+    "book_editor.app.core.preview",
+]
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"elapsed": elapsed, "modules": sorted(sys.modules)}}))
+"""
+
+
+def cold_import(module: str) -> dict:
+    """Import a module in a fresh interpreter and report what was loaded."""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join([str(ROOT), str(ROOT / "src")])
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE.format(module=module)],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+@pytest.fixture(scope="module")
+def main_report() -> dict:
+    """Cold-import the main entry point once for all tests."""
+    return cold_import("book_editor.app.main")
+
+
+def test_main_cold_start_within_budget(main_report: dict) -> None:
+    """Test the main entry point imports within the startup budget."""
+    assert main_report["elapsed"] < STARTUP_BUDGET
+
+
+@pytest.mark.parametrize("module", DEFERRED_MODULES)
+def test_main_defers_heavy_imports(main_report: dict, module: str) -> None:
+    """Test heavy modules are not imported by the main entry point."""
+    assert module not in main_report["modules"]
+
+
+def test_template_defers_markdown() -> None:
+    """Test importing templates does not import markdown."""
+    assert "markdown" not in cold_import("src.book_editor.core.template")["modules"]
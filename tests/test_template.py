@@ -402,6 +402,84 @@ def test_template_copy():
     assert template.metadata["description"] == "Test template"
 
 
+def test_template_copy_on_write():
+    """Test copies do not see each other's changes."""
+    template = Template("Test", "test")
+    template.add_style("fonts", "body", {"font-family": "Arial"})
+
+    variant = template.copy()
+    variant.add_style("fonts", "body", {"font-size": "10pt"})
+    variant.add_layout({"margin": "1cm"})
+    assert template.styles["fonts"]["body"] == {"font-family": "Arial"}
+    assert variant.styles["fonts"]["body"] == {
+        "font-family": "Arial",
+        "font-size": "10pt",
+    }
+    assert {"margin": "1cm"} not in template.layouts
+
+    # The original copies on its next write as well
+    template.add_style("fonts", "body", {"color": "red"})
+    assert "color" not in variant.styles["fonts"]["body"]
+
+
+def test_template_copy_shares_until_exposed():
+    """Test copies share data internally but never through the public API."""
+    template = Template("Test", "test")
+    variant = template.copy()
+    assert variant._styles is template._styles
+    assert variant._layouts is template._layouts
+
+    # Changing the returned containers in place does not leak
+    variant.styles["borders"]["classic"]["border"] = "none"
+    variant.layouts[0]["margin"] = "0"
+    variant.layouts.append({"padding": "1cm"})
+    assert template.styles["borders"]["classic"]["border"] == "2px solid #8B4513"
+    assert template.layouts == [Template("Other", "test").layouts[0]]
+    template.styles["fonts"]["default"]["font-size"] = "20pt"
+    assert variant.styles["fonts"]["default"]["font-size"] == "12pt"
+
+
+def test_template_merge_copy_on_write():
+    """Test merging does not let later writes leak between templates."""
+    base = Template("Base", "test")
+    source = Template("Source", "test")
+    source.add_style("colors", "primary", {"color": "blue"})
+    source.add_style("fonts", "heading", {"font-weight": "bold"})
+
+    base.merge(source)
+    base.add_style("colors", "primary", {"color": "red"})
+    source.add_style("colors", "accent", {"color": "green"})
+    source.styles["fonts"]["heading"]["font-weight"] = "normal"
+
+    assert source.styles["colors"]["primary"] == {"color": "blue"}
+    assert base.styles["colors"]["primary"] == {"color": "red"}
+    assert "accent" not in base.styles["colors"]
+    assert base.styles["fonts"]["heading"] == {"font-weight": "bold"}
+
+
+def test_template_dict_round_trip_is_independent():
+    """Test dictionaries passed in or returned are not shared."""
+    data = Template("Test", "test").to_dict()
+    template = Template.from_dict(data)
+    template.add_style("fonts", "default", {"font-size": "20pt"})
+    template.add_layout({"padding": "1cm"})
+    assert data["styles"]["fonts"]["default"]["font-size"] == "12pt"
+    assert {"padding": "1cm"} not in data["layouts"]
+
+    data["styles"]["borders"]["classic"]["border"] = "none"
+    data["layouts"].clear()
+    assert template.styles["borders"]["classic"]["border"] == "2px solid #8B4513"
+    assert template.layouts
+
+    exported = template.to_dict()
+    exported["styles"]["fonts"]["default"]["font-size"] = "8pt"
+    exported["layouts"].append({"margin": "0"})
+    assert template.styles["fonts"]["default"]["font-size"] == "20pt"
+    assert {"margin": "0"} not in template.layouts
+    assert type(exported["styles"]) is dict
+    assert type(exported["layouts"]) is list
+
+
 def test_template_manager_initialization(tmp_path: Path):
     """Test template manager initialization."""
     manager = TemplateManager(tmp_path)
@@ -475,3 +553,15 @@ def test_template_manager_list_search(tmp_path: Path):
 
     results = manager.search_templates("test")
     assert len(results) == 2
+
+
+def test_frame_blocks_once() -> None:
+    """Test blocks converted separately can be framed together."""
+    template = Template("Test", "general")
+    assert template.convert("*a*") == "<p><em>a</em></p>"
+    html = "\n".join(template.convert(block) for block in ("# A", "*b*"))
+    framed = template.frame(html)
+    assert framed == template.render("# A\n\n*b*")
+    assert framed.count(template._build_content_style()) == 1
+    with pytest.raises(ValueError):
+        template.render("")
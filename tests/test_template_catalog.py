@@ -0,0 +1,243 @@
+"""Tests for the template catalog module."""
+
+import json
+import os
+from pathlib import Path
+
+from src.book_editor.core.template import Template
+from src.book_editor.core.template import TemplateManager as LegacyTemplateManager
+from src.book_editor.core.template_bundle import (
+    BUNDLE_NAME,
+    TemplateBundle,
+    default_bundle_path,
+)
+from src.book_editor.core.template_catalog import TemplateCatalog
+from src.book_editor.core.template_manager import TemplateManager
+
+
+def _write(path: Path, name: str, category: str, tags=None) -> None:
+    """Write a template file."""
+    data = Template(name, category).to_dict()
+    data["metadata"]["tags"] = tags or []
+    path.write_text(json.dumps(data), encoding="utf-8")
+
+
+def test_catalog_indexes(tmp_path: Path):
+    """Test catalog name, category and tag indexes."""
+    _write(tmp_path / "a.json", "A", "fiction", ["dark", "long"])
+    _write(tmp_path / "b.json", "B", "fiction", ["dark"])
+    _write(tmp_path / "c.json", "C", "poetry")
+    catalog = TemplateCatalog(tmp_path, Template.from_dict)
+
+    assert [t.name for t in catalog.items()] == ["A", "B", "C"]
+    assert catalog.get("B").category == "fiction"
+    assert catalog.get("missing") is None
+    assert [t.name for t in catalog.by_category("fiction")] == ["A", "B"]
+    assert [t.name for t in catalog.by_tag("dark")] == ["A", "B"]
+    assert [t.name for t in catalog.by_tag("long")] == ["A"]
+    assert catalog.categories() == ["fiction", "poetry"]
+    assert catalog.tags() == ["dark", "long"]
+
+
+def test_catalog_parses_unchanged_files_once(tmp_path: Path):
+    """Test unchanged files are not parsed again."""
+    _write(tmp_path / "a.json", "A", "fiction")
+    calls = []
+
+    def loader(data):
+        calls.append(data["name"])
+        return Template.from_dict(data)
+
+    catalog = TemplateCatalog(tmp_path, loader)
+    catalog.items()
+    catalog.items()
+    catalog.by_category("fiction")
+    assert calls == ["A"]
+
+
+def test_catalog_detects_changes(tmp_path: Path):
+    """Test catalog picks up modified, added and removed files."""
+    path = tmp_path / "a.json"
+    _write(path, "A", "fiction")
+    catalog = TemplateCatalog(tmp_path, Template.from_dict, refresh_interval=0)
+    assert catalog.categories() == ["fiction"]
+
+    _write(path, "A", "poetry", ["new"])
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert catalog.categories() == ["poetry"]
+    assert catalog.by_category("fiction") == []
+    assert [t.name for t in catalog.by_tag("new")] == ["A"]
+
+    _write(tmp_path / "b.json", "B", "essays")
+    assert len(catalog) == 2
+
+    path.unlink()
+    assert catalog.categories() == ["essays"]
+    assert catalog.tags() == []
+
+
+def test_catalog_lookups_do_not_scan(tmp_path: Path, monkeypatch):
+    """Test lookups scan again only after a directory change or the interval."""
+    path = tmp_path / "a.json"
+    _write(path, "A", "fiction")
+    now = [0.0]
+    catalog = TemplateCatalog(
+        tmp_path, Template.from_dict, refresh_interval=5, clock=lambda: now[0]
+    )
+    assert len(catalog) == 1
+
+    scans = []
+    original = catalog.refresh
+    monkeypatch.setattr(catalog, "refresh", lambda: scans.append(1) or original())
+    for _ in range(10):
+        catalog.get("A")
+        catalog.by_category("fiction")
+        assert len(catalog) == 1
+    assert scans == []
+
+    # Edited in place: seen once the interval has passed
+    _write(path, "A", "poetry")
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert catalog.categories() == ["fiction"]
+    now[0] = 5.0
+    assert catalog.categories() == ["poetry"]
+
+    # Added file: seen at once through the directory stamp
+    _write(tmp_path / "b.json", "B", "essays")
+    dir_stat = tmp_path.stat()
+    os.utime(tmp_path, ns=(dir_stat.st_atime_ns, dir_stat.st_mtime_ns + 1_000_000))
+    assert len(catalog) == 2
+    assert len(scans) == 2
+
+
+def test_catalog_skips_invalid_files(tmp_path: Path):
+    """Test invalid files are skipped."""
+    _write(tmp_path / "a.json", "A", "fiction")
+    (tmp_path / "bad.json").write_text("invalid json")
+    (tmp_path / "list.json").write_text("[]")
+    catalog = TemplateCatalog(tmp_path, Template.from_dict)
+    assert [t.name for t in catalog.items()] == ["A"]
+
+
+def test_manager_uses_catalog(tmp_path: Path):
+    """Test template manager save and delete update the catalog."""
+    manager = TemplateManager(tmp_path)
+    template = Template("Tagged", "fiction")
+    template.metadata["tags"] = ["dark"]
+    manager.save_template(template)
+
+    assert [t.name for t in manager.list_templates(tag="dark")] == ["Tagged"]
+    assert manager.list_templates(category="poetry", tag="dark") == []
+    assert manager.list_categories() == ["fiction"]
+
+    listed = manager.list_templates()[0]
+    listed.metadata["tags"].append("changed")
+    assert manager.list_templates(tag="changed") == []
+
+    assert manager.delete_template("Tagged")
+    assert manager.list_templates() == []
+    assert manager.list_categories() == []
+
+
+def test_catalog_starts_from_bundle(tmp_path: Path):
+    """Test a fresh catalog reads unchanged templates from the bundle."""
+    _write(tmp_path / "a.json", "A", "fiction")
+    _write(tmp_path / "b.json", "B", "poetry")
+    bundle_path = tmp_path / "cache" / BUNDLE_NAME
+    TemplateCatalog(tmp_path, Template.from_dict, bundle_path=bundle_path).items()
+    assert bundle_path.exists()
+
+    # Overwrite a source without changing its stamp; the bundled copy wins
+    path = tmp_path / "b.json"
+    stat = path.stat()
+    path.write_text("x" * stat.st_size)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    catalog = TemplateCatalog(tmp_path, Template.from_dict, bundle_path=bundle_path)
+    assert [t.name for t in catalog.items()] == ["A", "B"]
+
+
+def test_catalog_rebuilds_stale_bundle(tmp_path: Path):
+    """Test the bundle is rebuilt when a source template changes."""
+    path = tmp_path / "a.json"
+    _write(path, "A", "fiction")
+    bundle_path = tmp_path / "cache" / BUNDLE_NAME
+    TemplateCatalog(tmp_path, Template.from_dict, bundle_path=bundle_path).items()
+
+    _write(path, "A", "poetry")
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    _write(tmp_path / "b.json", "B", "essays")
+    catalog = TemplateCatalog(tmp_path, Template.from_dict, bundle_path=bundle_path)
+    assert catalog.categories() == ["essays", "poetry"]
+
+    sources = TemplateBundle(bundle_path).load()
+    assert sorted(sources) == ["a.json", "b.json"]
+    assert sources["a.json"][1]["category"] == "poetry"
+
+    (tmp_path / "b.json").unlink()
+    catalog = TemplateCatalog(tmp_path, Template.from_dict, bundle_path=bundle_path)
+    assert catalog.categories() == ["poetry"]
+    assert sorted(TemplateBundle(bundle_path).load()) == ["a.json"]
+
+
+def test_bundle_version_mismatch(tmp_path: Path):
+    """Test bundles with another version are ignored."""
+    bundle_path = tmp_path / BUNDLE_NAME
+    bundle_path.write_text(json.dumps({"format": "x", "version": 0, "sources": {}}))
+    assert TemplateBundle(bundle_path).load() == {}
+    bundle_path.write_text("invalid json")
+    assert TemplateBundle(bundle_path).load() == {}
+
+
+def test_manager_loads_categories_file(tmp_path: Path):
+    """Test category metadata is read from the category list file."""
+    (tmp_path / "categories.json").write_text(
+        json.dumps({"categories": [{"name": "poetry", "description": "Poems"}]})
+    )
+    manager = LegacyTemplateManager(tmp_path)
+    assert manager.get_categories() == {"general", "poetry"}
+    assert manager.list_templates() == []
+
+
+def test_cold_start_trusts_unchanged_bundle(tmp_path: Path, monkeypatch):
+    """Test a fresh catalog uses the bundle without scanning an unchanged directory."""
+    template_dir = tmp_path / "templates"
+    template_dir.mkdir()
+    _write(template_dir / "a.json", "A", "fiction")
+    bundle_path = tmp_path / "cache" / BUNDLE_NAME
+    TemplateCatalog(template_dir, Template.from_dict, bundle_path=bundle_path).items()
+
+    catalog = TemplateCatalog(template_dir, Template.from_dict, bundle_path=bundle_path)
+    monkeypatch.setattr(catalog, "refresh", lambda: pytest.fail("directory scanned"))
+    assert [t.name for t in catalog.items()] == ["A"]
+
+    # A new file changes the directory stamp, so the bundle is not trusted
+    _write(template_dir / "b.json", "B", "poetry")
+    stat = template_dir.stat()
+    os.utime(template_dir, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    catalog = TemplateCatalog(template_dir, Template.from_dict, bundle_path=bundle_path)
+    assert [t.name for t in catalog.items()] == ["A", "B"]
+
+
+def test_data_files_are_not_loaded_as_templates(tmp_path: Path, caplog):
+    """Test the category list is decoded without a template load error."""
+    (tmp_path / "categories.json").write_text(json.dumps({"categories": []}))
+    _write(tmp_path / "a.json", "A", "fiction")
+    catalog = TemplateCatalog(
+        tmp_path, Template.from_dict, data_files=("categories.json",)
+    )
+    assert [t.name for t in catalog.items()] == ["A"]
+    assert catalog.data("categories.json") == {"categories": []}
+    assert "Failed to load template" not in caplog.text
+
+
+def test_managers_write_bundle_to_cache(tmp_path: Path, cache_dir: Path):
+    """Test managers keep their bundle in the cache directory."""
+    manager = TemplateManager(tmp_path)
+    manager.save_template(Template("A", "fiction"))
+    assert manager.list_templates()
+    assert not list(tmp_path.glob("*.bundle"))
+    assert default_bundle_path(tmp_path).parent == cache_dir
+    assert default_bundle_path(tmp_path).exists()
@@ -359,4 +359,21 @@ def test_template_manager_save_template_with_reserved_names(template_manager):
         template = Template(name, "test")
         path = template_manager.save_template(template)
         assert path.exists()
-        assert path.name == f"{name}_.json" 
\ No newline at end of file
+        assert path.name == f"{name}_.json" 
+
+def test_managers_of_a_directory_agree(template_dir):
+    """Test both template managers read a directory's templates the same way."""
+    # pylint: disable=import-outside-toplevel
+    from src.book_editor.core.template import TemplateManager as CoreTemplateManager
+
+    data = {"name": "odd", "category": "general", "metadata": {"format": "bogus"}}
+    (template_dir / "odd.json").write_text(json.dumps(data), encoding="utf-8")
+    core_manager = CoreTemplateManager(template_dir)
+    expected = [t.name for t in core_manager.catalog.items()]
+    assert expected == ["odd"]
+    # A later manager of either kind starts from the bundle the other wrote
+    for manager in (TemplateManager, CoreTemplateManager, TemplateManager):
+        assert [t.name for t in manager(template_dir).catalog.items()] == expected
+
+    shared = TemplateManager(template_dir, core_manager.catalog)
+    assert shared.catalog is core_manager.catalog
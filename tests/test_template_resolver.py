@@ -0,0 +1,100 @@
+"""Tests for the template resolver module."""
+
+import os
+from pathlib import Path
+
+import pytest
+
+from src.book_editor.core.template import Template
+from src.book_editor.core.template_manager import TemplateManager
+
+
+@pytest.fixture
+def manager(tmp_path: Path) -> TemplateManager:
+    """Create a template manager with a small template family."""
+    manager = TemplateManager(tmp_path)
+    house = Template("house", "general")
+    house.add_style("fonts", "body", {"font-family": "Georgia", "font-size": "11pt"})
+    manager.save_template(house)
+
+    imprint = Template("imprint", "general", parent="house")
+    imprint.add_style("fonts", "body", {"font-size": "12pt"})
+    imprint.add_layout({"margin": "3cm"})
+    manager.save_template(imprint)
+
+    series = Template("series", "general", parent="imprint")
+    series.add_style("colors", "accent", {"color": "navy"})
+    manager.save_template(series)
+    return manager
+
+
+def test_child_template_stores_only_overrides():
+    """Test templates with a parent start empty and save their parent."""
+    template = Template("child", "general", parent="house")
+    assert template.styles == {}
+    assert template.layouts == []
+    assert template.to_dict()["parent"] == "house"
+    assert "parent" not in Template("root", "general").to_dict()
+    assert Template.from_dict(template.to_dict()).parent == "house"
+
+
+def test_template_cannot_inherit_from_itself():
+    """Test self-inheritance is rejected."""
+    with pytest.raises(ValueError):
+        Template("loop", "general", parent="loop").validate()
+
+
+def test_resolve_flattens_chain(manager: TemplateManager):
+    """Test resolving applies overrides along the whole chain."""
+    series = manager.resolve_template("series")
+    assert series.name == "series"
+    assert series.parent is None
+    assert series.styles["fonts"]["body"] == {
+        "font-family": "Georgia",
+        "font-size": "12pt",
+    }
+    assert series.styles["colors"]["accent"] == {"color": "navy"}
+    assert {"margin": "3cm"} in series.layouts
+    assert "<div" in series.render("# Title")
+
+    assert manager.resolve_template("missing") is None
+    assert manager.resolve_template("house").styles["fonts"]["body"]["font-size"] == "11pt"
+
+
+def test_resolve_is_memoized(manager: TemplateManager):
+    """Test unchanged chains are not flattened again."""
+    manager.resolve_template("series")
+    memo = manager.resolver._memo["series"]
+    manager.resolve_template("series")
+    assert manager.resolver._memo["series"] is memo
+
+    # Resolved copies do not leak changes into the memo
+    resolved = manager.resolve_template("series")
+    resolved.add_style("fonts", "body", {"font-size": "30pt"})
+    assert manager.resolve_template("series").styles["fonts"]["body"]["font-size"] == "12pt"
+
+
+def test_resolve_recomputes_when_ancestor_changes(manager: TemplateManager):
+    """Test changing an ancestor rebuilds its descendants."""
+    manager.resolve_template("series")
+    house = manager.get_template("house")
+    house.add_style("fonts", "body", {"font-family": "Garamond"})
+    path = manager.save_template(house)
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    series = manager.resolve_template("series")
+    assert series.styles["fonts"]["body"]["font-family"] == "Garamond"
+    assert series.styles["fonts"]["body"]["font-size"] == "12pt"
+
+
+def test_resolve_broken_chains(manager: TemplateManager):
+    """Test missing parents and cycles are reported."""
+    manager.save_template(Template("orphan", "general", parent="nobody"))
+    with pytest.raises(ValueError, match="Parent template not found"):
+        manager.resolve_template("orphan")
+
+    manager.save_template(Template("a", "general", parent="b"))
+    manager.save_template(Template("b", "general", parent="a"))
+    with pytest.raises(ValueError, match="cycle"):
+        manager.resolve_template("a")
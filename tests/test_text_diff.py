@@ -0,0 +1,26 @@
+"""Tests for text deltas."""
+
+import pytest
+
+from src.book_editor.core.text_diff import apply_delta, make_delta
+
+
+@pytest.mark.parametrize(
+    "old,new",
+    [
+        ("", "abc"),
+        ("abc", ""),
+        ("hello world", "hello brave world"),
+        ("aaaa", "aa"),
+        ("same", "same"),
+        ("start", "restart"),
+    ],
+)
+def test_delta_roundtrip(old: str, new: str) -> None:
+    """Test applying a delta rebuilds the new text."""
+    assert apply_delta(old, make_delta(old, new)) == new
+
+
+def test_delta_is_minimal() -> None:
+    """Test the delta only holds the changed span."""
+    assert make_delta("hello world", "hello brave world") == (6, 6, "brave ")
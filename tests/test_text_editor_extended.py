@@ -169,3 +169,142 @@ def test_selection_edge_cases(editor):
     # Selection beyond content
     editor.select_text(-10, 100)
     assert editor.get_selected_text() == editor.content
+
+
+def test_insert_at_cursor(editor):
+    """Test typing at the cursor."""
+    editor.set_content("Hello world")
+    editor.move_cursor(5)
+    editor.insert_at_cursor(",")
+    editor.insert_at_cursor(" there")
+    assert editor.content == "Hello, there world"
+    assert editor.cursor_position == 12
+
+
+def test_typing_replaces_selection(editor):
+    """Test typing over a selection replaces it."""
+    editor.set_content("Hello world")
+    editor.select_text(6, 11)
+    editor.insert_at_cursor("there")
+    assert editor.content == "Hello there"
+    assert editor.cursor_position == 11
+    assert editor.selection_start is None
+
+
+def test_delete_backward(editor):
+    """Test deleting before the cursor."""
+    editor.set_content("Hello world")
+    assert editor.delete_backward() == "d"
+    assert editor.delete_backward(3) == "orl"
+    assert editor.content == "Hello w"
+    assert editor.cursor_position == 7
+    editor.move_cursor(0)
+    assert editor.delete_backward() == ""
+    assert editor.content == "Hello w"
+
+
+def test_delete_and_replace_selection(editor):
+    """Test deleting and replacing a reversed selection."""
+    editor.set_content("one two three")
+    editor.select_text(7, 4)
+    assert editor.delete_selection() == "two"
+    assert editor.content == "one  three"
+    assert editor.cursor_position == 4
+    assert editor.delete_selection() == ""
+    editor.select_text(0, 3)
+    assert editor.replace_selection("1") == "one"
+    assert editor.content == "1  three"
+
+
+def test_undo_cursor_edits(editor):
+    """Test typing is undone as one step and restores the cursor."""
+    editor.set_content("Hello")
+    for char in " world":
+        editor.insert_at_cursor(char)
+    editor.delete_backward()
+    assert editor.content == "Hello worl"
+    assert len(editor._undo_stack) == 2  # pylint: disable=protected-access
+
+    editor.undo()
+    assert editor.content == "Hello"
+    assert editor.cursor_position == 5
+    editor.redo()
+    assert editor.content == "Hello worl"
+    assert editor.cursor_position == 10
+    editor.undo()
+    editor.undo()
+    assert editor.content == ""
+
+
+def test_undo_stores_only_edit(editor):
+    """Test undo records hold the edited span, not the whole content."""
+    editor.set_content("x" * 10000)
+    editor.move_cursor(5000)
+    editor.insert_at_cursor("abc")
+    record = editor._undo_stack[-1]  # pylint: disable=protected-access
+    assert (record.start, record.old, record.new) == (5000, "", "abc")
+
+
+def test_line_column_mapping(editor):
+    """Test offsets map to lines and columns and back."""
+    editor.set_content("first\nsecond\n\nlast")
+    assert editor.line_count == 4
+    assert editor.get_line_column() == (3, 4)
+    assert editor.get_line_column(8) == (1, 2)
+    assert editor.get_offset(1, 2) == 8
+    assert editor.get_offset(1, 100) == 12
+    assert editor.get_offset(10, 0) == 14
+    assert editor.get_line_range(1) == (6, 12)
+    assert editor.get_line_range(2) == (13, 13)
+
+
+def test_move_to_line(editor):
+    """Test moving the cursor by line and column."""
+    editor.set_content("one\ntwo\nthree")
+    editor.select_text(0, 3)
+    editor.move_to_line(2, 3)
+    assert editor.cursor_position == 11
+    assert editor.selection_start is None
+
+
+def test_line_index_follows_edits(editor):
+    """Test the line index stays current through edits and undo."""
+    editor.set_content("one\ntwo")
+    editor.move_to_line(0, 3)
+    editor.insert_at_cursor("\nnew")
+    assert editor.line_count == 3
+    assert editor.get_line_column() == (1, 3)
+    editor.select_text(4, 8)
+    editor.delete_selection()
+    assert editor.content == "one\ntwo"
+    assert editor.get_line_range(1) == (4, 7)
+    editor.undo()
+    assert editor.content == "one\ntwo"
+    assert editor.line_count == 2
+    editor.undo()
+    assert editor.content == ""
+    assert editor.line_count == 1
+    editor.redo()
+    assert editor.get_line_column(5) == (1, 1)
+
+
+def test_unchanged_set_content_is_a_step(editor):
+    """Test setting the same content still records an undo step."""
+    editor.set_content("same")
+    editor.set_content("same")
+    assert len(editor._undo_stack) == 2  # pylint: disable=protected-access
+    editor.undo()
+    assert editor.content == "same"
+    editor.undo()
+    assert editor.content == ""
+
+
+def test_noop_edit_keeps_redo(editor):
+    """Test an edit that changes nothing does not discard redo steps."""
+    editor.set_content("text")
+    editor.undo()
+    editor.move_cursor(0)
+    assert editor.delete_backward() == ""
+    assert len(editor._redo_stack) == 1  # pylint: disable=protected-access
+    editor.redo()
+    assert editor.content == "text"
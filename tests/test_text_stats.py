@@ -0,0 +1,89 @@
+"""Tests for the text statistics module."""
+
+import pytest
+
+from src.book_editor.core.text_stats import (
+    TextStatistics,
+    analyze_chunks,
+    analyze_text,
+    count_paragraph,
+)
+
+SAMPLE = (
+    "# Title\n"
+    "\n"
+    "It was cold. The clocks struck thirteen!\n"
+    "Was it April?\n"
+    "\n"
+    "   \n"
+    "He said \"go.\" Then he left"
+)
+
+
+def test_count_paragraph():
+    """Test word and sentence counting within a paragraph."""
+    counts = count_paragraph('He said "go." Then he left')
+    assert counts.words == 6
+    assert counts.sentences == 2
+    assert counts.word_chars == len("Hesaidgothenheleft")
+    assert count_paragraph("").words == 0
+
+
+def test_analyze_text():
+    """Test statistics for a whole text."""
+    stats = analyze_text(SAMPLE)
+    assert stats["word_count"] == 18
+    assert stats["char_count"] == len(SAMPLE)
+    assert stats["line_count"] == 7
+    assert stats["paragraph_count"] == 3
+    assert stats["sentence_count"] == 6
+    assert stats["avg_word_length"] == pytest.approx(
+        sum(len(w.strip('#!?."')) for w in SAMPLE.split()) / 18
+    )
+
+
+def test_analyze_empty_text():
+    """Test statistics for empty text."""
+    stats = analyze_text("")
+    assert stats["word_count"] == 0
+    assert stats["line_count"] == 0
+    assert stats["avg_word_length"] == 0.0
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 50])
+def test_analyze_chunks_matches_whole_text(size: int):
+    """Test chunk boundaries do not change the result."""
+    chunks = [SAMPLE[i:i + size] for i in range(0, len(SAMPLE), size)]
+    assert analyze_chunks(chunks) == analyze_text(SAMPLE)
+
+
+def test_incremental_update_recounts_changed_paragraphs():
+    """Test only edited paragraphs are recounted."""
+    paragraphs = [f"Paragraph {i} has words. Two sentences." for i in range(100)]
+    stats = TextStatistics()
+    text = "\n\n".join(paragraphs)
+    assert stats.update(text) == analyze_text(text)
+    assert stats.recounted == 100
+
+    paragraphs[50] = "Edited paragraph without an ending"
+    text = "\n\n".join(paragraphs)
+    assert stats.update(text) == analyze_text(text)
+    assert stats.recounted == 1
+
+    del paragraphs[10:20]
+    text = "\n\n".join(paragraphs)
+    assert stats.update(text) == analyze_text(text)
+    assert stats.recounted == 0
+
+    text = text + "\n\n\n\nNew ending."
+    assert stats.update(text) == analyze_text(text)
+
+    assert stats.update("") == analyze_text("")
+    stats.reset()
+    assert stats.stats["word_count"] == 0
+
+
+def test_editor_analyze_text(editor):
+    """Test the editor exposes incremental text statistics."""
+    assert editor.analyze_text(SAMPLE) == analyze_text(SAMPLE)
+    assert editor.analyze_text(SAMPLE + " again.")["word_count"] == 19
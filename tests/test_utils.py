@@ -2,10 +2,15 @@
 
 import json
 from datetime import datetime
+from pathlib import Path
 
 import pytest
 
-from src.book_editor.core.utils import DateTimeEncoder
+from src.book_editor.core.utils import (
+    DateTimeEncoder,
+    process_context,
+    write_json_atomic,
+)
 
 
 def test_datetime_encoder():
@@ -67,4 +72,18 @@ def test_datetime_encoder_unsupported():
 
     # Test encoding with DateTimeEncoder
     with pytest.raises(TypeError):
-        json.dumps(data, cls=DateTimeEncoder) 
\ No newline at end of file
+        json.dumps(data, cls=DateTimeEncoder)
+
+
+def test_write_json_atomic(tmp_path: Path) -> None:
+    """Test JSON is written without leaving temporary files."""
+    path = tmp_path / "docs" / "doc.json"
+    write_json_atomic(path, {"content": "text"})
+    write_json_atomic(path, {"content": "newer"})
+    assert json.loads(path.read_text(encoding="utf-8")) == {"content": "newer"}
+    assert [p.name for p in path.parent.iterdir()] == ["doc.json"]
+
+
+def test_process_context_does_not_fork():
+    """Test worker processes are not forked from the calling process."""
+    assert process_context().get_start_method() in ("forkserver", "spawn")